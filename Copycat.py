@@ -18,6 +18,8 @@
 
 import argparse
 import sys
+from copycat.errors import CopycatError
+from copycat.problem import Problem
 from copycat.run import Run
 sys.path.insert(0, "lib")
 
@@ -31,16 +33,49 @@ def main():
     parser.add_argument("-q", "--quiet",
                         action="store_true", dest="quiet", default=False,
                         help="run in headless mode")
+    parser.add_argument("-l", "--long-strings",
+                        action="store_true", dest="long_strings", default=None,
+                        help="use long-string mode regardless of string length")
+    parser.add_argument("-c", "--cache", dest="cache", default=None,
+                        metavar="DIRECTORY",
+                        help="keep compiled problems in DIRECTORY")
+    parser.add_argument("-n", "--slipnet", dest="slipnet", default=None,
+                        metavar="FILE",
+                        help="build the slipnet from the definition in FILE")
+    parser.add_argument("-t", "--telemetry", dest="telemetry", default=None,
+                        metavar="FILE",
+                        help="write coderack telemetry to FILE as CSV")
+    parser.add_argument("--snag-limit", dest="snag_limit", default=None,
+                        type=int, help="give up after this many snags with "
+                        "the same signature")
     args = parser.parse_args()
 
     if args.quiet:
-        run = Run(args.initial, args.modified, args.target, args.seed)
-        while not run.workspace.answer_string:
-            run.step()
-        print(run.workspace.rule.to_string())
-        print("Answer: " + run.workspace.answer_string.name)
+        try:
+            if args.cache:
+                problem = Problem.cached(args.initial, args.modified,
+                                         args.target, args.long_strings,
+                                         args.cache, args.slipnet)
+                run = Run.from_problem(problem, args.seed,
+                                       snag_limit=args.snag_limit)
+            else:
+                run = Run(args.initial, args.modified, args.target, args.seed,
+                          args.long_strings, definition=args.slipnet,
+                          snag_limit=args.snag_limit)
+            run.run()
+        except CopycatError as e:
+            sys.exit(str(e))
+        if run.snag_loop:
+            print("Gave up after %d snags." % run.workspace.snag_count)
+        else:
+            print(run.workspace.rule.to_string())
+            print("Answer: " + run.workspace.answer_string.name)
         print("Temperature: " + str(run.workspace.temperature))
         print("Steps: " + str(run.coderack.time))
+        if args.telemetry:
+            print("Purged codelets: " + str(run.coderack.purged))
+            with open(args.telemetry, "w") as output:
+                run.coderack.telemetry.write_csv(output)
     else:
         from clients import OpenglClient
         OpenglClient(args.initial, args.modified, args.target, args.seed)
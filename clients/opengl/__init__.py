@@ -27,6 +27,7 @@ pyglet.resource.path.append("clients/opengl/data")
 pyglet.resource.reindex()
 pyglet.resource.add_font("erasdust.ttf")
 
+from copycat.errors import CopycatError
 from copycat.run import Run
 
 from .coderack import Coderack
@@ -173,7 +174,11 @@ class Window(pyglet.window.Window):
         # Update the simulation at the given speed.
         self.time += dt
         if self.time >= 1.0 / self.speed:
-            self.run.step()
+            try:
+                self.run.step()
+            except CopycatError as e:
+                self.rule.text = str(e)
+                self.done = True
             self.time = 0
 
     def on_draw(self):
@@ -17,7 +17,6 @@
 # IDEAS:
 # Intensity of the codelet count should be how probable that type is to be chosen
 
-from collections import defaultdict as dd
 import pyglet
 
 class Coderack(object):
@@ -74,9 +73,7 @@ class Coderack(object):
             z += 1
 
     def update(self, dt):
-        counts = dd(int)
-        for codelet in self.coderack.codelets():
-            counts[codelet.__class__.__name__] += 1
+        counts = self.coderack.telemetry.on_rack
 
         for name, number in zip(self.codelets, self.counts):
             if self.coderack.last_chosen.__class__.__name__ == name.name:
@@ -87,7 +84,7 @@ class Coderack(object):
                     name.color = (200, 255, 180, alpha)
 
             # Change this to urgency instead of number.
-            num = counts[name.name]
+            num = counts.get(name.name, 0)
             name = str(num)
             if number.text != name:
                 number.text = name
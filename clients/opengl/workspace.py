@@ -19,6 +19,8 @@
 
 import pyglet
 
+from copycat.workspace import events
+
 class Letter(object):
     def __init__(self, letter, x, y, batch):
         self.letter = letter
@@ -62,15 +64,21 @@ class Workspace(object):
 
         self.answer_x = right_x
         self.answer_y = bot_y
+        self.answer = None
+        workspace.subscribe(self.on_answer, [events.ANSWER])
 
         self.strings = [String(workspace.initial_string, left_x, top_y, self.batch),
                         String(workspace.modified_string, right_x, top_y, self.batch),
                         String(workspace.target_string, left_x, bot_y, self.batch)]
 
+    def on_answer(self, kind, answer_string):
+        self.answer = answer_string
+
     def update(self, dt):
-        if self.workspace.answer_string:
-            self.strings.append(String(self.workspace.answer_string,
-                                       self.answer_x, self.answer_y, self.batch))
+        if self.answer:
+            self.strings.append(String(self.answer, self.answer_x,
+                                       self.answer_y, self.batch))
+            self.answer = None
 
         for string in self.strings:
             string.update(dt)
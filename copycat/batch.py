@@ -0,0 +1,261 @@
+# Copyright (c) 2007-2017 Joseph Hager.
+#
+# Copycat is free software; you can redistribute it and/or modify
+# it under the terms of version 2 of the GNU General Public License,
+# as published by the Free Software Foundation.
+#
+# Copycat is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Copycat; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.
+
+
+"""Batches of headless copycat runs.
+
+Run with, for example:
+
+    python -m copycat.batch "abc abd xyz" --seeds 20
+    python -m copycat.batch "abc abd ijk" "abc abd kji" --seeds 50 \\
+        --processes 4 --output results.csv
+    python -m copycat.batch "abc abd xyz" --seeds 100 --store results.db
+
+Each run ends with one of the statuses below, written to the batch output
+beside the run's answer. Errors are caught run by run, so one run failing
+never takes the rest of a batch, or the process running it, down with it.
+
+Given a result store, a batch only runs the seeds that are not already in
+it, and keeps the results of the ones it runs."""
+
+import argparse
+import collections
+import csv
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+
+from copycat.errors import BudgetExceeded, UnsupportedProblem
+from copycat.problem import Problem
+from copycat.run import Run
+from copycat.store import Store, VALUES, config_key
+
+# The statuses a run in a batch can end with.
+ANSWERED = 'answered'
+SNAG_LOOP = 'snag_loop'
+BUDGET_EXCEEDED = 'budget_exceeded'
+UNSUPPORTED = 'unsupported'
+INTERNAL_ERROR = 'internal_error'
+
+# The number of snags with the same signature after which a run is given up.
+# Runs that recover from repeated snags usually do so well within this many.
+SNAG_LIMIT = 50
+
+# The number of codelets after which a run is given up.
+STEPS = 20000
+
+FIELDS = ['initial', 'modified', 'target', 'seed', 'status', 'answer',
+          'temperature', 'steps', 'snags', 'error']
+
+# The problems compiled so far in this process, by their strings and cache
+# directory.
+_problems = {}
+
+class Result(object):
+    """Result
+
+    Attributes:
+        initial:
+        modified:
+        target:
+        seed:
+        status: One of ANSWERED, SNAG_LOOP, BUDGET_EXCEEDED, UNSUPPORTED or
+            INTERNAL_ERROR.
+        answer: The answer string, or None if the run found no answer.
+        temperature: The temperature at the end of the run.
+        steps: The number of codelets run.
+        snags: The number of snags hit in building answers.
+        error: The message of the error the run ended with, or the traceback
+            of an internal error, or None."""
+
+    def __init__(self, initial, modified, target, seed, status, answer=None,
+                 temperature=None, steps=0, snags=0, error=None):
+        """Initialize Result."""
+        self.initial = initial
+        self.modified = modified
+        self.target = target
+        self.seed = seed
+        self.status = status
+        self.answer = answer
+        self.temperature = temperature
+        self.steps = steps
+        self.snags = snags
+        self.error = error
+
+    @classmethod
+    def from_run(cls, initial, modified, target, seed, status, run=None,
+                 error=None):
+        """Return the result of a run ending with the given status, which
+        may have failed before the run could be started."""
+        if run is None:
+            return cls(initial, modified, target, seed, status, error=error)
+        workspace = run.workspace
+        answer = workspace.answer_string
+        return cls(initial, modified, target, seed, status,
+                   answer.name if answer else None, workspace.temperature,
+                   run.coderack.time, workspace.snag_count, error)
+
+    def to_row(self):
+        """Return the result as a list of values in the order of FIELDS."""
+        return [getattr(self, field) for field in FIELDS]
+
+def get_problem(initial, modified, target, directory=None):
+    """Return the compiled problem, compiling it only once in each process."""
+    global _problems
+    key = (initial, modified, target, directory)
+    if key not in _problems:
+        _problems[key] = Problem.cached(initial, modified, target,
+                                        directory=directory)
+    return _problems[key]
+
+def run(initial, modified, target, seed, steps=STEPS, seconds=None,
+        snag_limit=SNAG_LIMIT, directory=None):
+    """Run a problem with the given seed until it finds an answer, is caught
+    in a loop of snags or runs out of codelets or seconds, and return its
+    Result.
+
+    Any error in the run is caught and recorded in the result."""
+    copycat = None
+    error = None
+    try:
+        problem = get_problem(initial, modified, target, directory)
+        copycat = Run.from_problem(problem, seed, snag_limit=snag_limit)
+        copycat.run(steps, seconds)
+        status = SNAG_LOOP if copycat.snag_loop else ANSWERED
+    except UnsupportedProblem as e:
+        status, error = UNSUPPORTED, str(e)
+    except BudgetExceeded as e:
+        status, error = BUDGET_EXCEEDED, str(e)
+    except (Exception, SystemExit):
+        status, error = INTERNAL_ERROR, traceback.format_exc()
+    return Result.from_run(initial, modified, target, seed, status, copycat,
+                           error)
+
+def run_task(task):
+    """Run a task of the arguments to run and return its Result."""
+    return run(*task)
+
+def is_reproducible(result, seconds):
+    """Return True if running the same problem and seed again with the same
+    parameters is sure to give the same result.
+
+    Internal errors are not kept in case they are fixed, nor are runs cut
+    short by a time budget, which depends on the machine."""
+    if result.status == INTERNAL_ERROR:
+        return False
+    return seconds is None or result.status != BUDGET_EXCEEDED
+
+def run_batch(problems, seeds, steps=STEPS, seconds=None,
+              snag_limit=SNAG_LIMIT, directory=None, executor=None,
+              chunksize=1, store=None):
+    """Run each of a list of (initial, modified, target) problems once with
+    each of the given seeds, and return a list of their Results in order.
+
+    The runs are spread over the processes of the executor, in chunks of
+    the given size, if one is given. Its workers keep the problems they have
+    compiled, so reusing the same executor for several batches saves
+    compiling them again.
+
+    If a store is given, the results of runs already in it are taken from
+    it, and the reproducible results of the others are kept in it."""
+    tasks = [(initial, modified, target, seed, steps, seconds, snag_limit,
+              directory)
+             for initial, modified, target in problems for seed in seeds]
+    results = [None] * len(tasks)
+    config = config_key(steps=steps, snag_limit=snag_limit)
+    if store:
+        for i, task in enumerate(tasks):
+            values = store.get(*(task[:4] + (config,)))
+            if values:
+                results[i] = Result(*task[:4], **values)
+
+    missing = [i for i, result in enumerate(results) if result is None]
+    if executor is None:
+        new_results = [run_task(tasks[i]) for i in missing]
+    else:
+        new_results = executor.map(run_task, [tasks[i] for i in missing],
+                                   chunksize=chunksize)
+    for i, result in zip(missing, new_results):
+        results[i] = result
+
+    if store:
+        store.put_many([(result.initial, result.modified, result.target,
+                         result.seed, config,
+                         dict((name, getattr(result, name))
+                              for name in VALUES))
+                        for result in (results[i] for i in missing)
+                        if is_reproducible(result, seconds)])
+    return results
+
+def write_csv(results, output):
+    """Write a list of results to a file object as CSV."""
+    writer = csv.writer(output)
+    writer.writerow(FIELDS)
+    for result in results:
+        writer.writerow(result.to_row())
+
+def print_summary(results):
+    """Print the number of runs ending with each status and answer."""
+    counts = collections.Counter((result.status, result.answer)
+                                 for result in results)
+    print('%-16s %-20s %6s' % ('status', 'answer', 'runs'))
+    for (status, answer), count in sorted(counts.items(), key=str):
+        print('%-16s %-20s %6d' % (status, answer or '-', count))
+
+def main():
+    """Run the batch described on the command line."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument('problems', metavar='PROBLEM', nargs='+',
+                        help='problems as "initial modified target"')
+    parser.add_argument('--seeds', type=int, default=10,
+                        help='run with each seed from 0 up to SEEDS')
+    parser.add_argument('--steps', type=int, default=STEPS,
+                        help='give up runs after this many codelets')
+    parser.add_argument('--seconds', type=float, default=None,
+                        help='give up runs after this many seconds')
+    parser.add_argument('--snag-limit', type=int, default=SNAG_LIMIT,
+                        help='give up runs after this many snags with the '
+                        'same signature')
+    parser.add_argument('--cache', default=None, metavar='DIRECTORY',
+                        help='keep compiled problems in DIRECTORY')
+    parser.add_argument('--processes', type=int, default=0,
+                        help='spread the runs over this many processes')
+    parser.add_argument('--store', default=None, metavar='FILE',
+                        help='take results from and keep them in the SQLite '
+                        'database FILE')
+    parser.add_argument('--output', default=None, metavar='FILE',
+                        help='write every result to FILE as CSV')
+    args = parser.parse_args()
+
+    problems = [problem.split() for problem in args.problems]
+    executor = None
+    if args.processes > 0:
+        executor = ProcessPoolExecutor(args.processes)
+    store = None
+    if args.store:
+        store = Store(args.store)
+    results = run_batch(problems, range(args.seeds), args.steps, args.seconds,
+                        args.snag_limit, args.cache, executor, store=store)
+    if executor:
+        executor.shutdown()
+    if store:
+        store.close()
+    if args.output:
+        with open(args.output, 'w') as output:
+            write_csv(results, output)
+    print_summary(results)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,272 @@
+# Copyright (c) 2007-2017 Joseph Hager.
+#
+# Copycat is free software; you can redistribute it and/or modify
+# it under the terms of version 2 of the GNU General Public License,
+# as published by the Free Software Foundation.
+#
+# Copycat is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Copycat; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.
+
+"""Benchmarks for the copycat engine.
+
+Run with, for example:
+
+    python -m copycat.benchmark scaling --steps 300
+    python -m copycat.benchmark memory
+    python -m copycat.benchmark setup
+    python -m copycat.benchmark purging --seeds 10
+    python -m copycat.benchmark policies --seeds 20"""
+
+import argparse
+import collections
+import string
+import time
+import tracemalloc
+
+from copycat.coderack.scheduler import SCHEDULERS
+from copycat.problem import Problem
+from copycat.run import Run
+
+SCALING_LENGTHS = [3, 10, 25, 50, 100, 250, 500]
+PROBLEMS = ['abc abd ijk', 'abc abd iijjkk', 'abc abd kji', 'abc abd mrrjjj',
+            'abc abd xyz', 'aabc aabd ijkk']
+MEMORY_PROBLEMS = ['abc abd ijk', 'abc abd iijjkk', 'abc abd mrrjjj',
+                   'abc abd abcdefghijklmnopqrstuvwxyzabcdefghijklmnopqrstuvwx']
+
+def letter_sequence(length):
+    """Return a string of the given length running through the alphabet."""
+    alphabet = string.ascii_lowercase
+    return ''.join(alphabet[i % len(alphabet)] for i in range(length))
+
+def scaling(lengths=None, steps=300, seed=0, long_strings=None):
+    """Time runs of abc -> abd on target strings of increasing length.
+
+    Each run is stopped after the given number of codelets or when it finds
+    an answer. Return a list of (length, long_string_mode, setup_seconds,
+    steps, seconds_per_step) tuples."""
+    results = []
+    for length in lengths or SCALING_LENGTHS:
+        start = time.time()
+        run = Run('abc', 'abd', letter_sequence(length), seed, long_strings)
+        setup = time.time() - start
+        start = time.time()
+        while run.coderack.time < steps and not run.workspace.answer_string:
+            run.step()
+        elapsed = time.time() - start
+        results.append((length, run.workspace.long_string_mode, setup,
+                        run.coderack.time,
+                        elapsed / max(1, run.coderack.time)))
+    return results
+
+def print_scaling(results):
+    """Print the results of the scaling benchmark as a table."""
+    print('%8s %6s %10s %8s %12s' % ('length', 'long', 'setup ms',
+                                     'steps', 'ms per step'))
+    for length, long_mode, setup, steps, per_step in results:
+        print('%8d %6s %10.1f %8d %12.3f' % (length, long_mode, setup * 1000,
+                                             steps, per_step * 1000))
+
+def memory(problems=None, steps=1000, seed=0):
+    """Measure the memory allocated by runs of the given problems.
+
+    Each problem is a string of the initial, modified and target strings
+    separated by spaces. Each run is stopped after the given number of
+    codelets or when it finds an answer. Return a list of (problem, steps,
+    current_bytes, peak_bytes) tuples, where current_bytes is the memory
+    still held when the run stops."""
+    results = []
+    for problem in problems or MEMORY_PROBLEMS:
+        initial, modified, target = problem.split()
+        tracemalloc.start()
+        run = Run(initial, modified, target, seed)
+        while run.coderack.time < steps and not run.workspace.answer_string:
+            run.step()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results.append((problem, run.coderack.time, current, peak))
+    return results
+
+def print_memory(results):
+    """Print the results of the memory benchmark as a table."""
+    print('%-30s %8s %12s %12s' % ('problem', 'steps', 'current kB', 'peak kB'))
+    for problem, steps, current, peak in results:
+        if len(problem) > 30:
+            problem = problem[:27] + '...'
+        print('%-30s %8d %12.1f %12.1f' % (problem, steps, current / 1024.0,
+                                           peak / 1024.0))
+
+def setup(lengths=None, repeats=50):
+    """Time starting runs of abc -> abd on target strings of increasing
+    length, from the strings and from a compiled problem.
+
+    Return a list of (length, compile_seconds, seconds_per_run,
+    seconds_per_run_from_problem) tuples."""
+    results = []
+    for length in lengths or SCALING_LENGTHS:
+        target = letter_sequence(length)
+        start = time.time()
+        problem = Problem('abc', 'abd', target)
+        compiled = time.time() - start
+        start = time.time()
+        for seed in range(repeats):
+            Run('abc', 'abd', target, seed)
+        plain = (time.time() - start) / repeats
+        start = time.time()
+        for seed in range(repeats):
+            Run.from_problem(problem, seed)
+        results.append((length, compiled, plain,
+                        (time.time() - start) / repeats))
+    return results
+
+def print_setup(results):
+    """Print the results of the setup benchmark as a table."""
+    print('%8s %12s %12s %14s' % ('length', 'compile ms', 'run ms',
+                                  'problem ms'))
+    for length, compiled, plain, from_problem in results:
+        print('%8d %12.3f %12.3f %14.3f' % (length, compiled * 1000,
+                                            plain * 1000, from_problem * 1000))
+
+def purging(problems=None, seeds=10, steps=3000):
+    """Count the codelets purged from the coderack in runs of the given
+    problems, each of which would otherwise have taken a step to fizzle.
+
+    Return a list of (problem, mean_steps, mean_purged) tuples."""
+    results = []
+    for problem in problems or PROBLEMS:
+        initial, modified, target = problem.split()
+        total_steps = 0
+        total_purged = 0
+        for seed in range(seeds):
+            run = Run(initial, modified, target, seed)
+            while run.coderack.time < steps and not run.workspace.answer_string:
+                run.step()
+            total_steps += run.coderack.time
+            total_purged += run.coderack.purged
+        results.append((problem, total_steps / float(seeds),
+                        total_purged / float(seeds)))
+    return results
+
+def print_purging(results):
+    """Print the results of the purging benchmark as a table."""
+    print('%-30s %10s %10s %8s' % ('problem', 'steps', 'purged', 'saved'))
+    for problem, steps, purged in results:
+        print('%-30s %10.1f %10.1f %7.1f%%' % (problem, steps, purged,
+                                               100 * purged / (steps + purged)))
+
+POLICIES = ['bins', 'urgency', 'heap']
+
+def policies(names=None, problems=None, seeds=20, steps=3000):
+    """Compare scheduling policies on the given problems.
+
+    A policy is the name of a scheduler. The first policy is the reference
+    that the answers of the others are compared against. Return a list of
+    (policy, problem, answered, mean_steps, seconds, fidelity) tuples, where
+    fidelity is one minus the total variation distance between the policy's
+    distribution of answers and the reference's."""
+    names = names or POLICIES
+    answers = {}
+    results = []
+    for name in names:
+        for problem in problems or PROBLEMS:
+            initial, modified, target = problem.split()
+            counts = collections.Counter()
+            total_steps = 0
+            start = time.time()
+            for seed in range(seeds):
+                run = Run(initial, modified, target, seed,
+                          scheduler=SCHEDULERS[name]())
+                while run.coderack.time < steps and \
+                        not run.workspace.answer_string:
+                    run.step()
+                answer = run.workspace.answer_string
+                counts[answer.name if answer else None] += 1
+                total_steps += run.coderack.time
+            elapsed = time.time() - start
+            answers[(name, problem)] = counts
+            reference = answers[(names[0], problem)]
+            distance = sum(abs(counts[a] - reference[a])
+                           for a in set(counts) | set(reference)) / 2.0
+            results.append((name, problem, seeds - counts[None],
+                            total_steps / float(seeds), elapsed,
+                            1 - distance / seeds))
+    return results
+
+def print_policies(results):
+    """Print the results of the policies benchmark as a table."""
+    print('%-10s %-20s %8s %10s %10s %9s' % ('policy', 'problem', 'answered',
+                                            'steps', 'seconds', 'fidelity'))
+    for name, problem, answered, steps, seconds, fidelity in results:
+        print('%-10s %-20s %8d %10.1f %10.2f %9.2f' % (name, problem[:20],
+                                                      answered, steps, seconds,
+                                                      fidelity))
+
+def main():
+    """Run the benchmark named on the command line."""
+    parser = argparse.ArgumentParser()
+    subparsers = parser.add_subparsers(dest='benchmark')
+    subparsers.required = True
+
+    scaling_parser = subparsers.add_parser('scaling',
+                                           help='time runs on longer strings')
+    scaling_parser.add_argument('--lengths', type=int, nargs='+',
+                                default=SCALING_LENGTHS)
+    scaling_parser.add_argument('--steps', type=int, default=300)
+    scaling_parser.add_argument('--seed', type=int, default=0)
+    mode = scaling_parser.add_mutually_exclusive_group()
+    mode.add_argument('--long', action='store_true', dest='long_strings',
+                      default=None, help='always use long-string mode')
+    mode.add_argument('--short', action='store_false', dest='long_strings',
+                      help='never use long-string mode')
+
+    memory_parser = subparsers.add_parser('memory',
+                                          help='measure memory used by runs')
+    memory_parser.add_argument('--problems', nargs='+', default=MEMORY_PROBLEMS,
+                               help='problems as "initial modified target"')
+    memory_parser.add_argument('--steps', type=int, default=1000)
+    memory_parser.add_argument('--seed', type=int, default=0)
+
+    setup_parser = subparsers.add_parser('setup',
+                                         help='time starting runs')
+    setup_parser.add_argument('--lengths', type=int, nargs='+',
+                              default=SCALING_LENGTHS)
+    setup_parser.add_argument('--repeats', type=int, default=50)
+
+    purging_parser = subparsers.add_parser(
+        'purging', help='count codelets purged for withdrawn structures')
+    purging_parser.add_argument('--problems', nargs='+', default=PROBLEMS,
+                                help='problems as "initial modified target"')
+    purging_parser.add_argument('--seeds', type=int, default=10)
+    purging_parser.add_argument('--steps', type=int, default=3000)
+
+    policies_parser = subparsers.add_parser(
+        'policies', help='compare coderack scheduling policies')
+    policies_parser.add_argument('--policies', nargs='+', default=POLICIES,
+                                 help='scheduler names')
+    policies_parser.add_argument('--problems', nargs='+', default=PROBLEMS,
+                                 help='problems as "initial modified target"')
+    policies_parser.add_argument('--seeds', type=int, default=20)
+    policies_parser.add_argument('--steps', type=int, default=3000)
+    args = parser.parse_args()
+
+    if args.benchmark == 'scaling':
+        print_scaling(scaling(args.lengths, args.steps, args.seed,
+                              args.long_strings))
+    elif args.benchmark == 'memory':
+        print_memory(memory(args.problems, args.steps, args.seed))
+    elif args.benchmark == 'setup':
+        print_setup(setup(args.lengths, args.repeats))
+    elif args.benchmark == 'purging':
+        print_purging(purging(args.problems, args.seeds, args.steps))
+    elif args.benchmark == 'policies':
+        print_policies(policies(args.policies, args.problems, args.seeds,
+                                args.steps))
+
+if __name__ == '__main__':
+    main()
@@ -16,9 +16,11 @@
 
 """Coderack"""
 
-import random
 import copycat.toolbox as toolbox
-from copycat.coderack.codelet import Codelet
+from copycat.coderack.codelet import Codelet, FIZZLE
+from copycat.coderack.scheduler import BinScheduler
+from copycat.coderack.telemetry import Telemetry
+from copycat.workspace.structure import Structure
 
 class Bin(object):
     """Bin is a bucket for holding codelets of a certain urgency.
@@ -40,20 +42,17 @@ class Bin(object):
         self.codelets.append(codelet)
         codelet.bin = self
 
-    def choose(self):
-        """Choose and remove a random codelet from the bin."""
-        codelet = random.choice(self.codelets)
-        self.remove(codelet)
-        return codelet
-
     def clear(self):
         """Clear the bin of all its codelets."""
+        for codelet in self.codelets:
+            codelet.bin = None
         self.codelets = []
 
     def remove(self, codelet):
         """Remove a codelet from the bin."""
         if codelet in self.codelets:
             self.codelets.remove(codelet)
+            codelet.bin = None
 
     def urgency(self, temperature):
         """Return this bin's urgency.
@@ -78,11 +77,20 @@ class Coderack(object):
         max_codelets: The maximum size of the coderack.
         temperature: The value indicating how random a codelet choice is.
         time: The number of codelets that have been chosen so far.
-        bins: A list of urgency bins in the coderack."""
-
-    def __init__(self):
-        """Initialize Coderack."""
-        self.max_codelets = 100
+        bins: A list of urgency bins in the coderack.
+        scheduler: The scheduler choosing the codelet to run next.
+        references: A dictionary of the id of each argument of the codelets
+            in the coderack to the codelets holding it.
+        purged: The number of codelets purged because an argument they hold
+            was withdrawn.
+        telemetry: The counters and samples of what happens on the
+            coderack."""
+
+    def __init__(self, max_codelets=100, scheduler=None):
+        """Initialize Coderack, choosing codelets by bin unless another
+        scheduler is given."""
+        self.max_codelets = max_codelets
+        self.scheduler = scheduler or BinScheduler()
         self.temperature = 0
         self.time = 0
 
@@ -98,21 +106,61 @@ class Coderack(object):
                      self.very_high_bin, self.extremely_high_bin]
 
         self.last_chosen = None
+        self.references = {}
+        self.purged = 0
+        self.telemetry = Telemetry(len(self.bins))
 
     def choose(self):
         """Choose a codelet from the coderack."""
         if self.is_empty():
             return None
-        urgencies = [bin.urgency_sum(self.temperature) for bin in self.bins]
-        pbin = toolbox.weighted_select(urgencies, self.bins)
+        codelet = self.scheduler.choose(self)
+        codelet.bin.remove(codelet)
+        self.unindex(codelet)
+        self.telemetry.note_chosen(codelet)
         self.time += 1
-        self.last_chosen = pbin.choose()
+        self.last_chosen = codelet
         return self.last_chosen
 
     def clear(self):
         """Empty the coderack of all codelets."""
         for pbin in self.bins:
             pbin.clear()
+        self.references = {}
+        self.scheduler.clear()
+        self.telemetry.note_cleared()
+
+    def index(self, codelet):
+        """Record the codelet under each of its arguments that is a workspace
+        structure, the only arguments that can be purged."""
+        for argument in codelet.arguments:
+            if isinstance(argument, Structure):
+                self.references.setdefault(id(argument), []).append(codelet)
+
+    def unindex(self, codelet):
+        """Forget the codelet under each of its arguments."""
+        for argument in codelet.arguments:
+            if not isinstance(argument, Structure):
+                continue
+            codelets = self.references.get(id(argument))
+            if codelets is None:
+                continue
+            codelets = [c for c in codelets if c is not codelet]
+            if codelets:
+                self.references[id(argument)] = codelets
+            else:
+                del self.references[id(argument)]
+
+    def purge(self, argument):
+        """Remove the codelets holding the given argument, which they could
+        now only fizzle on. Return the removed codelets."""
+        codelets = self.references.pop(id(argument), [])
+        for codelet in codelets:
+            codelet.bin.remove(codelet)
+            self.unindex(codelet)
+            self.telemetry.note_purged(codelet)
+        self.purged += len(codelets)
+        return codelets
 
     def codelets(self):
         """Return a list of codelets in the coderack."""
@@ -123,30 +171,64 @@ class Coderack(object):
 
     def is_empty(self):
         """Return True if the coderack is empty."""
-        return len(self.codelets()) == 0
+        for pbin in self.bins:
+            if pbin.codelets:
+                return False
+        return True
+
+    def get_bin(self, urgency):
+        """Return the bin for codelets of the given urgency.
+
+        The bin is a function of the number of bins and the urgency."""
+        if urgency >= 100:
+            return self.extremely_high_bin
+        return self.bins[int((len(self.bins) * urgency) / 100.0)]
 
     def post(self, codelet, urgency):
         """Post a codelet to the coderack.
 
         If the coderack is already at its maximum size, remove a codelet to make
-        room for the new one. The bin to post to is a function of the numver of
-        bins and the urgency of the codelet passed in."""
-        removed_codelet = None
-        codelets = self.codelets()
-        if len(codelets) == self.max_codelets:
-            probabilities = [self.remove_probability(c) for c in codelets]
-            removed_codelet = toolbox.weighted_select(probabilities, codelets)
-            removed_codelet.bin.remove(removed_codelet)
-
-        if urgency >= 100:
-            pbin = self.extremely_high_bin
-        else:
-            index = int((len(self.bins) * urgency) / 100.0)
-            pbin = self.bins[index]
-        pbin.add(codelet)
-        codelet.timestamp = self.time
-
-        return removed_codelet
+        room for the new one. Return the removed codelet, if any."""
+        removed_codelets = self.post_many([(codelet, urgency)])
+        if removed_codelets:
+            return removed_codelets[0]
+
+    def post_many(self, codelets):
+        """Post a list of (codelet, urgency) pairs to the coderack.
+
+        This is the same as posting each codelet in turn, but the removal
+        probabilities of the codelets on the coderack are only worked out once
+        for the whole list. Return a list of the codelets removed to make
+        room for the new ones."""
+        removed_codelets = []
+        current = self.codelets()
+        probabilities = None
+        for codelet, urgency in codelets:
+            if len(current) == self.max_codelets:
+                if probabilities is None:
+                    probabilities = [self.remove_probability(c)
+                                     for c in current]
+                index = toolbox.weighted_index(probabilities)
+                removed_codelet = current[index]
+                current[index] = current[-1]
+                current.pop()
+                probabilities[index] = probabilities[-1]
+                probabilities.pop()
+                removed_codelet.bin.remove(removed_codelet)
+                self.unindex(removed_codelet)
+                self.telemetry.note_evicted(removed_codelet)
+                removed_codelets.append(removed_codelet)
+
+            self.get_bin(urgency).add(codelet)
+            codelet.timestamp = self.time
+            codelet.urgency = urgency
+            self.index(codelet)
+            self.scheduler.add(codelet)
+            self.telemetry.note_posted(codelet)
+            current.append(codelet)
+            if probabilities is not None:
+                probabilities.append(self.remove_probability(codelet))
+        return removed_codelets
 
     def remove_probability(self, codelet):
         """Return the probability of removing the given codelet.
@@ -160,8 +242,10 @@ class Coderack(object):
         return codelet_age * (1 + codelet_bin_urgency - highest_bin_urgency)
 
     def update(self, temperature):
-        """Store the current temperature for urgency calculations."""
+        """Store the current temperature for urgency calculations and take a
+        telemetry sample."""
         self.temperature = temperature
+        self.telemetry.sample(self)
 
     def urgency_sum(self):
         """Return the sum of urgency of all bins in the coderack."""
@@ -16,22 +16,42 @@
 
 """Codelet"""
 
+class Fizzle(object):
+    """Fizzle is what a codelet's run returns when it gives up without doing
+    anything. It is false, so it can be treated as no codelets to post."""
+
+    __slots__ = ()
+
+    def __bool__(self):
+        return False
+
+    def __repr__(self):
+        return 'FIZZLE'
+
+FIZZLE = Fizzle()
+
 class Codelet(object):
     """Codelet is a small amount of code that has a chance to be run.
 
     Attributes:
         arguments: A tuple of arguments that the codelet can affect.
         timestamp: The time when the codelet was created.
-        bin: The coderack bin the codelet is stored in."""
+        urgency: The urgency the codelet was posted with.
+        bin: The coderack bin the codelet is stored in, or None once it has
+            left the coderack."""
+
+    __slots__ = ('arguments', 'timestamp', 'urgency', 'bin')
 
     def __init__(self, arguments=()):
         """Initialize Codelet."""
         self.arguments = arguments
         self.timestamp = None
+        self.urgency = None
         self.bin = None
 
     def run(self, coderack, slipnet, workspace):
-        """Run the codelet.
+        """Run the codelet, returning a list of (codelet, urgency) pairs to
+        post, or FIZZLE if it gave up.
 
         Each specific codelet must implement this for itself."""
         pass
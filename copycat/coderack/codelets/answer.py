@@ -17,14 +17,26 @@
 """Answer Codelet"""
 
 from copycat.coderack import Codelet
+from copycat.workspace import events
 from copycat.workspace import String
 
 class AnswerBuilder(Codelet):
+    """Build the answer string from the translated rule, or deal with the
+    snag if the rule cannot be applied to the target string.
+
+    If the answer snagged the last time it was built from the same translated
+    rule, and nothing it depends on has changed since, the snag is dealt with
+    at once."""
+
+    __slots__ = ()
+
     def run(self, coderack, slipnet, workspace):
         workspace.answer_string = String(workspace, "")
 
         workspace.changed_length_group = None
-        workspace.snag_object = None
+        workspace.snag_object = workspace.get_snag(workspace.translated_rule)
+        if workspace.snag_object:
+            return self.deal_with_snag(coderack, workspace)
 
         if workspace.translated_rule.has_no_change():
             objects_to_change = []
@@ -40,29 +52,8 @@ class AnswerBuilder(Codelet):
                 answer_string_letters.extend(letters)
 
         if workspace.snag_object:
-            workspace.snag_count += 1
-            workspace.last_snag_time = coderack.time
-            workspace.snag_structures = workspace.structures()
-
-            for bond in workspace.proposed_bonds():
-                bond.string.remove_proposed_bond(bond)
-            for group in workspace.proposed_groups():
-                group.string.remove_proposed_group(group)
-            for correspondence in workspace.get_proposed_correspondences():
-                workspace.remove_proposed_correspondence(correspondence)
-
-            workspace.translated_rule = None
-            workspace.answer_string = None
-            workspace.snag_condition = True
-            workspace.temperature = 100
-            workspace.clamp_temperature = True
-            for description in workspace.snag_object.descriptions:
-                description.descriptor.clamp = True
-            workspace.snag_object.clamp_salience = True
-
-            coderack.clear()
-
-            return workspace.initial_codelets()
+            workspace.set_snag(workspace.translated_rule, workspace.snag_object)
+            return self.deal_with_snag(coderack, workspace)
 
         letters = workspace.get_unmodified_letters_for_answer(objects_to_change)
         answer_string_letters.extend(letters)
@@ -80,3 +71,36 @@ class AnswerBuilder(Codelet):
             workspace.answer_string.add_letter(letter)
         for letter in workspace.answer_string.get_letters():
             workspace.answer_string.name += letter.name
+        workspace.notify(events.ANSWER, workspace.answer_string)
+
+    def deal_with_snag(self, coderack, workspace):
+        """Delete all proposed structures, empty the coderack, raise and clamp
+        the temperature, and activate and clamp activation of all the
+        descriptions of the object causing the snag. Return the initial
+        codelets to start over with."""
+        workspace.snag_count += 1
+        workspace.note_snag(workspace.translated_rule)
+        workspace.last_snag_time = coderack.time
+        workspace.snag_structures = workspace.structures()
+
+        for bond in workspace.proposed_bonds():
+            bond.string.remove_proposed_bond(bond)
+        for group in workspace.proposed_groups():
+            group.string.remove_proposed_group(group)
+        for correspondence in workspace.get_proposed_correspondences():
+            workspace.remove_proposed_correspondence(correspondence)
+
+        workspace.translated_rule = None
+        workspace.answer_string = None
+        workspace.snag_condition = True
+        workspace.temperature = 100
+        workspace.clamp_temperature = True
+        workspace.invalidate_samplers()
+        for description in workspace.snag_object.descriptions:
+            description.descriptor.set_clamp(True)
+        workspace.snag_object.clamp_salience = True
+        workspace.notify(events.SNAG, workspace.snag_object)
+
+        coderack.clear()
+
+        return workspace.initial_codelets()
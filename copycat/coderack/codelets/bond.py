@@ -17,7 +17,7 @@
 """Bond Codelets"""
 
 import copycat.toolbox as toolbox
-from copycat.coderack import Codelet
+from copycat.coderack import Codelet, FIZZLE
 
 class BondBottomUpScout(Codelet):
     """Choose an object and a neighbor of that object probabilistically by
@@ -27,26 +27,28 @@ class BondBottomUpScout(Codelet):
     urgency a function of the degree of association of bonds of the bond
     category."""
 
+    __slots__ = ()
+
     structure_category = 'bond'
 
     def run(self, coderack, slipnet, workspace):
         from_object = workspace.choose_object('intra_string_salience')
         to_object = from_object.choose_neighbor()
         if not to_object:
-            return # Fizzle
+            return FIZZLE
 
         bond_facet = workspace.choose_bond_facet(from_object, to_object)
         if not bond_facet:
-            return # Fizzle
+            return FIZZLE
 
         from_descriptor = from_object.get_descriptor(bond_facet)
         to_descriptor = to_object.get_descriptor(bond_facet)
         if not from_descriptor or not to_descriptor:
-            return # Fizzle
+            return FIZZLE
 
         bond_category = slipnet.get_bond_category(from_descriptor, to_descriptor)
         if not bond_category:
-            return # Fizzle
+            return FIZZLE
 
         return workspace.propose_bond(from_object, to_object, bond_category,
                                       bond_facet, from_descriptor, to_descriptor)
@@ -55,6 +57,8 @@ class BondBottomUpScout(Codelet):
 class BondBuilder(Codelet):
     """Attempt to build the proposed bond, fighting with any competitiors."""
 
+    __slots__ = ()
+
     structure_category = 'bond'
 
     def run(self, coderack, slipnet, workspace):
@@ -65,35 +69,35 @@ class BondBuilder(Codelet):
 
         objects = workspace.objects()
         if (from_object not in objects) or (to_object not in objects):
-            return # Fizzle
+            return FIZZLE
 
         existing_bond = string.get_existing_bond(bond)
         if existing_bond:
-            existing_bond.bond_category.activation_buffer += workspace.activation
+            existing_bond.bond_category.buffer_activation(workspace.activation)
             direction_category = existing_bond.direction_category
             if direction_category:
-                direction_category.activation_buffer += workspace.activation
+                direction_category.buffer_activation(workspace.activation)
             string.remove_proposed_bond(bond)
-            return # Fizzle
+            return FIZZLE
 
         string.remove_proposed_bond(bond)
 
         incompatible_bonds = bond.incompatible_bonds()
         if not workspace.fight_it_out(bond, 1, incompatible_bonds, 1):
-            return # Fizzle
+            return FIZZLE
 
         incompatible_groups = workspace.get_common_groups(from_object, to_object)
         spans = [group.letter_span() for group in incompatible_groups]
         strength = 0 if len(spans) == 0 else max(spans)
         if not workspace.fight_it_out(bond, 1, incompatible_groups, strength):
-            return # Fizzle
+            return FIZZLE
 
         incompatible_corrs = []
         at_edge = bond.is_leftmost_in_string() or bond.is_rightmost_in_string()
         if bond.direction_category and at_edge:
             incompatible_corrs = bond.incompatible_correspondences()
             if not workspace.fight_it_out(bond, 2, incompatible_corrs, 3):
-                return # Fizzle
+                return FIZZLE
 
         for ibond in incompatible_bonds:
             workspace.break_bond(ibond)
@@ -111,6 +115,8 @@ class BondStrengthTester(Codelet):
     whether to post a bond builder codelet with urgency a function of the
     strength."""
 
+    __slots__ = ()
+
     structure_category = 'bond'
 
     def run(self, coderack, slipnet, workspace):
@@ -123,13 +129,13 @@ class BondStrengthTester(Codelet):
         probability = workspace.temperature_adjusted_probability(probability)
         if not toolbox.flip_coin(probability):
             bond.string.remove_proposed_bond(bond)
-            return # Fizzle
+            return FIZZLE
 
         bond.proposal_level = 2
 
-        bond.from_object_descriptor.activation_buffer += workspace.activation
-        bond.to_object_descriptor.activation_buffer += workspace.activation
-        bond.bond_facet.activation_buffer += workspace.activation
+        bond.from_object_descriptor.buffer_activation(workspace.activation)
+        bond.to_object_descriptor.buffer_activation(workspace.activation)
+        bond.bond_facet.buffer_activation(workspace.activation)
 
         return [(BondBuilder([bond]), strength)]
 
@@ -142,6 +148,8 @@ class BondTopDownCategoryScout(Codelet):
     the facet, posting a bond strength tester codelet with urgency a function
     of the degree of association of bonds of the category."""
 
+    __slots__ = ()
+
     structure_category = 'bond'
 
     def run(self, coderack, slipnet, workspace):
@@ -160,16 +168,16 @@ class BondTopDownCategoryScout(Codelet):
         obj = string.get_random_object('intra_string_salience')
         neighbor = obj.choose_neighbor()
         if neighbor is None:
-            return # Fizzle
+            return FIZZLE
 
         facet = workspace.choose_bond_facet(obj, neighbor)
         if facet is None:
-            return # Fizzle
+            return FIZZLE
 
         object_descriptor = obj.get_descriptor(facet)
         neighbor_descriptor = neighbor.get_descriptor(facet)
         if object_descriptor is None or neighbor_descriptor is None:
-            return # Fizzle
+            return FIZZLE
 
         if slipnet.get_bond_category(object_descriptor,
                                      neighbor_descriptor) == category:
@@ -184,7 +192,7 @@ class BondTopDownCategoryScout(Codelet):
             from_descriptor = neighbor_descriptor
             to_descriptor = object_descriptor
         else:
-            return # Fizzle
+            return FIZZLE
 
         return workspace.propose_bond(from_object, to_object, category, facet,
                                       from_descriptor, to_descriptor)
@@ -199,6 +207,8 @@ class BondTopDownDirectionScout(Codelet):
     posting a bond strength tester codelet with urgency a function of the
     degree of association of bonds of the bond category."""
 
+    __slots__ = ()
+
     structure_category = 'bond'
 
     def run(self, coderack, slipnet, workspace):
@@ -220,21 +230,21 @@ class BondTopDownDirectionScout(Codelet):
         elif category == slipnet.plato_right:
             neighbor = obj.choose_right_neighbor()
         if neighbor is None:
-            return # Fizzle
+            return FIZZLE
 
         facet = workspace.choose_bond_facet(obj, neighbor)
         if facet is None:
-            return # Fizzle
+            return FIZZLE
 
         object_descriptor = obj.get_descriptor(facet)
         neighbor_descriptor = neighbor.get_descriptor(facet)
         if object_descriptor is None or neighbor_descriptor is None:
-            return # Fizzle
+            return FIZZLE
 
         bond_category = slipnet.get_bond_category(object_descriptor,
                                                   neighbor_descriptor)
         if bond_category is None or not bond_category.directed:
-            return # Fizzle
+            return FIZZLE
 
         return workspace.propose_bond(obj, neighbor,
                                       bond_category, facet,
@@ -18,24 +18,26 @@
 
 import random
 import copycat.toolbox as toolbox
-from copycat.coderack import Codelet
+from copycat.coderack import Codelet, FIZZLE
 from copycat.workspace import Bond, Group, Correspondence
 
 class Breaker(Codelet):
     """Choose a structure at random and decide whether to break it as a
     function of its total weakness."""
 
+    __slots__ = ()
+
     def run(self, coderack, slipnet, workspace):
         if toolbox.flip_coin((100.0 - workspace.temperature) / 100.0):
-            return # Fizzle
+            return FIZZLE
 
         structures = workspace.structures()
         if not structures:
-            return # Fizzle
+            return FIZZLE
 
         structure = random.choice(structures)
         if not structure:
-            return # Fizzle
+            return FIZZLE
 
         if isinstance(structure, Bond) and structure.group:
             structures = [structure, structure.group]
@@ -46,7 +48,7 @@ class Breaker(Codelet):
             probability = structure.total_weakness() / 100.0
             probability = workspace.temperature_adjusted_probability(probability)
             if not toolbox.flip_coin(probability):
-                return # Fizzle
+                return FIZZLE
 
         for structure in structures:
             if isinstance(structure, Bond):
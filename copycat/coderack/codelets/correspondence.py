@@ -17,7 +17,7 @@
 """Correspondence Codelets"""
 
 import copycat.toolbox as toolbox
-from copycat.coderack import Codelet
+from copycat.coderack import Codelet, FIZZLE
 
 class CorrespondenceBottomUpScout(Codelet):
     """Choose two objects, one from the initial string and one from the
@@ -29,6 +29,8 @@ class CorrespondenceBottomUpScout(Codelet):
     a funcion of the average strength of the distinguishing concept
     mappings."""
 
+    __slots__ = ()
+
     def run(self, coderack, slipnet, workspace):
         flip_obj2 = False
 
@@ -36,7 +38,7 @@ class CorrespondenceBottomUpScout(Codelet):
         object2 = workspace.target_string.get_random_object('inter_string_salience')
 
         if object1.spans_whole_string() != object2.spans_whole_string():
-            return # Fizzle
+            return FIZZLE
 
         mappings = workspace.get_concept_mappings(object1, object2,
                                                   object1.relevant_descriptions(),
@@ -50,11 +52,11 @@ class CorrespondenceBottomUpScout(Codelet):
                 possible = True
 
         if not possible:
-            return # Fizzle
+            return FIZZLE
 
         distinguished_mappings = [m for m in mappings if m.is_distinguishing()]
         if not distinguished_mappings:
-            return # Fizzle
+            return FIZZLE
 
         opposite_mappings = []
         for mapping in distinguished_mappings:
@@ -83,6 +85,8 @@ class CorrespondenceBuilder(Codelet):
     """Attempt to build the proposed correspondence, fighting it out with
     competitors if necessary."""
 
+    __slots__ = ()
+
     def run(self, coderack, slipnet, workspace):
         correspondence = self.arguments[0]
         flip_obj2 = self.arguments[1]
@@ -101,7 +105,7 @@ class CorrespondenceBuilder(Codelet):
         if any([not obj1_present,
                 not obj2_present,
                 (flip_obj2 and not existing_obj2_group)]):
-            return # Fizzle
+            return FIZZLE
 
         existing_correspondence = workspace.is_correspondence_present(correspondence)
         if existing_correspondence:
@@ -109,18 +113,18 @@ class CorrespondenceBuilder(Codelet):
             labels = [m.label for m in correspondence.get_concept_mappings()]
             for label in labels:
                 if label:
-                    label.activation_buffer += workspace.activation
+                    label.buffer_activation(workspace.activation)
             mappings_to_add = []
             for mapping in correspondence.get_concept_mappings():
                 if not existing_correspondence.is_concept_mapping_present(mapping):
                     mappings_to_add.append(mapping)
             existing_correspondence.add_concept_mappings(mappings_to_add)
-            return # Fizzle
+            return FIZZLE
 
         for mapping in correspondence.get_concept_mappings():
             if not mapping.is_relevant():
                 workspace.remove_proposed_correspondence(correspondence)
-                return # Fizzle
+                return FIZZLE
 
         workspace.remove_proposed_correspondence(correspondence)
 
@@ -130,7 +134,7 @@ class CorrespondenceBuilder(Codelet):
                                           correspondence.letter_span(),
                                           [incompatible_correspondence],
                                           incompatible_correspondence.letter_span()):
-                return # Fizzle
+                return FIZZLE
 
         incompatible_bond = None
         incompatible_group = None
@@ -140,22 +144,22 @@ class CorrespondenceBuilder(Codelet):
             if incompatible_bond:
                 if not workspace.fight_it_out(correspondence, 3,
                                               [incompatible_bond], 2):
-                    return # Fizzle
+                    return FIZZLE
                 incompatible_group = incompatible_bond.group
                 if incompatible_group:
                     if not workspace.fight_it_out(correspondence, 1,
                                                   [incompatible_group], 1):
-                        return # Fizzle
+                        return FIZZLE
 
         if flip_obj2:
             if not workspace.fight_it_out(correspondence, 1,
                                           [existing_obj2_group], 1):
-                return # Fizzle
+                return FIZZLE
 
         incompatible_rule = correspondence.is_incompatible_rule()
         if incompatible_rule:
             if not workspace.fight_it_out(correspondence, 1, [workspace.rule], 1):
-                return # Fizzle
+                return FIZZLE
 
         if incompatible_correspondences:
             for incompatible_correspondence in incompatible_correspondences:
@@ -191,6 +195,8 @@ class CorrespondenceImportantObjectScout(Codelet):
     strength tester codelet with urgency a function of the average
     strength of the distinguishing concept mappings."""
 
+    __slots__ = ()
+
     def run(self, coderack, slipnet, workspace):
         flip_obj2 = False
 
@@ -198,14 +204,12 @@ class CorrespondenceImportantObjectScout(Codelet):
 
         object1_description = object1.choose_relevant_distinguishing_description_by_conceptual_depth()
         if not object1_description:
-            return # Fizzle
+            return FIZZLE
         object1_descriptor = object1_description.descriptor
 
-        object2_descriptor = object1_descriptor
-        for slippage in workspace.slippages():
-            if slippage.descriptor1 == object1_descriptor:
-                object2_descriptor = slippage.descriptor2
-                break
+        slippage_map = workspace.slippage_map()
+        object2_descriptor = slippage_map.get(object1_descriptor,
+                                              object1_descriptor)
 
         object2_candidates = []
         for obj in workspace.target_string.get_objects():
@@ -213,19 +217,19 @@ class CorrespondenceImportantObjectScout(Codelet):
                 if description.descriptor == object2_descriptor:
                     object2_candidates.append(obj)
         if not object2_candidates:
-            return # Fizzle
+            return FIZZLE
 
         weights = [obj.inter_string_salience for obj in object2_candidates]
         object2 = toolbox.weighted_select(weights, object2_candidates)
 
         if object1.spans_whole_string() != object2.spans_whole_string():
-            return # Fizzle
+            return FIZZLE
 
         mappings = workspace.get_concept_mappings(object1, object2,
                                                   object1.relevant_descriptions(),
                                                   object2.relevant_descriptions())
         if not mappings:
-            return
+            return FIZZLE
 
         possible = False
         for mapping in mappings:
@@ -235,11 +239,11 @@ class CorrespondenceImportantObjectScout(Codelet):
                 possible = True
                 break
         if not possible:
-            return # Fizzle
+            return FIZZLE
 
         distinguished_mappings = [m for m in mappings if m.is_distinguishing()]
         if not distinguished_mappings:
-            return # Fizzle
+            return FIZZLE
 
         possible_opposite_mappings = []
         for mapping in distinguished_mappings:
@@ -269,6 +273,8 @@ class CorrespondenceStrengthTester(Codelet):
     decides whether or not to post a correspondence builder codelt with
     urgency a function of the strength."""
 
+    __slots__ = ()
+
     def run(self, coderack, slipnet, workspace):
         correspondence = self.arguments[0]
         flip_object2 = self.arguments[1]
@@ -282,7 +288,7 @@ class CorrespondenceStrengthTester(Codelet):
             ((object2 not in objects) and \
             (not (flip_object2 and
                   workspace.target_string.get_existing_group(flipped)))):
-            return # Fizzle
+            return FIZZLE
 
         correspondence.update_strengths()
         strength = correspondence.total_strength
@@ -291,13 +297,13 @@ class CorrespondenceStrengthTester(Codelet):
         probability = workspace.temperature_adjusted_probability(probability)
         if not toolbox.flip_coin(probability):
             workspace.remove_proposed_correspondence(correspondence)
-            return # Fizzle
+            return FIZZLE
 
         for mapping in correspondence.get_concept_mappings():
-            mapping.description_type1.activation_buffer += workspace.activation
-            mapping.descriptor1.activation_buffer += workspace.activation
-            mapping.description_type2.activation_buffer += workspace.activation
-            mapping.descriptor2.activation_buffer += workspace.activation
+            mapping.description_type1.buffer_activation(workspace.activation)
+            mapping.descriptor1.buffer_activation(workspace.activation)
+            mapping.description_type2.buffer_activation(workspace.activation)
+            mapping.descriptor2.buffer_activation(workspace.activation)
 
         correspondence.proposal_level = 2
 
@@ -16,7 +16,7 @@
 
 """Description Codelets"""
 
-from copycat.coderack import Codelet
+from copycat.coderack import Codelet, FIZZLE
 import copycat.toolbox as toolbox
 
 class DescriptionBottomUpScout(Codelet):
@@ -28,6 +28,8 @@ class DescriptionBottomUpScout(Codelet):
     property and posts a description strength tester codelet with urgency
     a function of the activation of the property."""
 
+    __slots__ = ()
+
     structure_category = 'description'
 
     def run(self, coderack, slipnet, workspace):
@@ -35,12 +37,12 @@ class DescriptionBottomUpScout(Codelet):
 
         description = obj.choose_relevant_description_by_activation()
         if description is None:
-            return # Fizzle
+            return FIZZLE
         descriptor = description.descriptor
 
         links = descriptor.similar_has_property_links()
         if links == []:
-            return # Fizzle
+            return FIZZLE
 
         associations = [link.degree_of_association() for link in links]
         activations = [link.to_node.activation for link in links]
@@ -53,18 +55,20 @@ class DescriptionBuilder(Codelet):
     """Attempt to build the proposed description. If it already exists, its
     activations are boosted."""
 
+    __slots__ = ()
+
     structure_category = 'description'
 
     def run(self, coderack, slipnet, workspace):
         description = self.arguments[0]
 
         if description.object not in workspace.objects():
-            return # Fizzle
+            return FIZZLE
 
         if description in description.object.descriptions:
-            description.description_type.activation_buffer += workspace.activation
-            description.descriptor.activation_buffer += workspace.activation
-            return # Fizzle
+            description.description_type.buffer_activation(workspace.activation)
+            description.descriptor.buffer_activation(workspace.activation)
+            return FIZZLE
 
         workspace.build_description(description)
 
@@ -73,12 +77,14 @@ class DescriptionStrengthTester(Codelet):
     decides whether or not to post a description builder codelet with urgency
     as a function of the strength."""
 
+    __slots__ = ()
+
     structure_category = 'description'
 
     def run(self, coderack, slipnet, workspace):
         description = self.arguments[0]
 
-        description.descriptor.activation_buffer += workspace.activation
+        description.descriptor.buffer_activation(workspace.activation)
 
         description.update_strengths()
         strength = description.total_strength
@@ -86,7 +92,7 @@ class DescriptionStrengthTester(Codelet):
         probability = strength / 100.0
         probability = workspace.temperature_adjusted_probability(probability)
         if not toolbox.flip_coin(probability):
-            return # Fizzle
+            return FIZZLE
 
         return [(DescriptionBuilder([description]), strength)]
 
@@ -97,6 +103,8 @@ class DescriptionTopDownScout(Codelet):
     description strength tester codelet with urgency a funtion of the
     activation of the proposed descriptor."""
 
+    __slots__ = ()
+
     structure_category = 'description'
 
     def run(self, coderack, slipnet, workspace):
@@ -104,9 +112,9 @@ class DescriptionTopDownScout(Codelet):
 
         obj = workspace.choose_object('total_salience')
 
-        descriptors = description_type.get_possible_descriptors(obj)
+        descriptors = obj.get_possible_descriptors(description_type)
         if descriptors == []:
-            return # Fizzle
+            return FIZZLE
 
         activations = [descriptor.activation for descriptor in descriptors]
         descriptor = toolbox.weighted_select(activations, descriptors)
@@ -18,12 +18,14 @@
 
 import random
 import copycat.toolbox as toolbox
-from copycat.coderack import Codelet
+from copycat.coderack import Codelet, FIZZLE
 from copycat.workspace import Group, Description
 
 class GroupBuilder(Codelet):
     """Attempt to build the proposed group, fighting with competitors."""
 
+    __slots__ = ()
+
     structure_category = 'group'
 
     def run(self, coderack, slipnet, workspace):
@@ -33,7 +35,7 @@ class GroupBuilder(Codelet):
         existing_group = string.get_existing_group(group)
         if existing_group:
             for description in existing_group.descriptions:
-                description.descriptor.activation_buffer += workspace.activation
+                description.descriptor.buffer_activation(workspace.activation)
             for description in group.descriptions:
                 if not existing_group.is_description_present(description):
                     new_description = Description(workspace,
@@ -42,7 +44,7 @@ class GroupBuilder(Codelet):
                                                   description.descriptor)
                     workspace.build_description(new_description)
             string.remove_proposed_group(group)
-            return # Fizzle
+            return FIZZLE
 
         all_bonds_exist = True
         for bond in group.bonds:
@@ -53,7 +55,7 @@ class GroupBuilder(Codelet):
                 break
         if not all_bonds_exist:
             string.remove_proposed_group(group)
-            return # Fizzle
+            return FIZZLE
 
         string.remove_proposed_group(group)
 
@@ -61,7 +63,7 @@ class GroupBuilder(Codelet):
         if bonds_to_flip:
             if not workspace.fight_it_out(group, group.letter_span(),
                                           bonds_to_flip, 1):
-                return # Fizzle
+                return FIZZLE
 
         incompatible_groups = group.get_incompatible_groups()
         for incompatible_group in incompatible_groups:
@@ -75,13 +77,13 @@ class GroupBuilder(Codelet):
             if not workspace.fight_it_out(group, group_weight,
                                           [incompatible_group],
                                           incompatible_weight):
-                return # Fizzle
+                return FIZZLE
 
         incompatible_correspondences = group.get_incompatible_correspondences()
         if group.direction_category and incompatible_correspondences:
             if not workspace.fight_it_out(group, 1,
                                           incompatible_correspondences, 1):
-                return # Fizzle
+                return FIZZLE
 
         for incompatible_group in incompatible_groups:
             workspace.break_group(incompatible_group)
@@ -115,6 +117,8 @@ class GroupStrengthTester(Codelet):
     whether to post a group builder codelet with urgency a function of the
     strength."""
 
+    __slots__ = ()
+
     structure_category = 'group'
 
     def run(self, coderack, slipnet, workspace):
@@ -127,13 +131,13 @@ class GroupStrengthTester(Codelet):
         probability = workspace.temperature_adjusted_probability(probability)
         if not toolbox.flip_coin(probability):
             group.string.remove_proposed_group(group)
-            return # Fizzle
+            return FIZZLE
 
         group.proposal_level = 2
 
-        group.bond_category.activation_buffer += workspace.activation
+        group.bond_category.buffer_activation(workspace.activation)
         if group.direction_category:
-            group.direction_category.activation_buffer += workspace.activation
+            group.direction_category.buffer_activation(workspace.activation)
 
         return [(GroupBuilder([group]), strength)]
 
@@ -149,6 +153,8 @@ class GroupTopDownCategoryScout(Codelet):
     a function of the degree of association of bonds of the given bond
     category."""
 
+    __slots__ = ()
+
     structure_category = 'group'
 
     def run(self, coderack, slipnet, workspace):
@@ -169,7 +175,7 @@ class GroupTopDownCategoryScout(Codelet):
 
         obj = string.get_random_object('intra_string_salience')
         if obj.spans_whole_string():
-            return # Fizzle
+            return FIZZLE
 
         if obj.is_leftmost_in_string():
             direction = slipnet.plato_right
@@ -189,7 +195,7 @@ class GroupTopDownCategoryScout(Codelet):
 
         if bond is None or bond.bond_category != bond_category:
             if obj.type_name == 'group':
-                return # Fizzle
+                return FIZZLE
             objects = [obj]
             bonds = []
             if category == slipnet.plato_sameness_group:
@@ -208,52 +214,18 @@ class GroupTopDownCategoryScout(Codelet):
                 if toolbox.flip_coin(probability):
                     return workspace.propose_group(objects, bonds, category,
                                                    single_letter_group_direction)
-            return # Fizzle
+            return FIZZLE
 
         direction_category = bond.direction_category
-        facet = bond.bond_facet
-        opposite_bond_category = slipnet.get_related_node(bond_category,
-                                                          slipnet.plato_opposite)
-        if direction_category:
-            opposite_direction_category = slipnet.get_related_node(direction_category,
-                                                                   slipnet.plato_opposite)
-        else:
-            opposite_direction_category = None
 
         objects = [bond.left_object, bond.right_object]
         bonds = [bond]
-        next_bond = bond
-        for _ in range(2, number):
-            bond_to_add = None
+        for next_bond in string.get_bond_run(bond, direction, number - 2):
             if direction == slipnet.plato_left:
-                next_bond = next_bond.choose_left_neighbor()
-                if next_bond is None:
-                    break
-                else:
-                    next_object = next_bond.left_object
+                objects.append(next_bond.left_object)
             else:
-                next_bond = next_bond.choose_right_neighbor()
-                if next_bond is None:
-                    break
-                else:
-                    next_object = next_bond.right_object
-
-            if next_bond is None:
-                bond_to_add = None
-            elif all([next_bond.bond_category == bond_category,
-                      next_bond.direction_category == direction_category,
-                      next_bond.bond_facet == facet]):
-                bond_to_add = next_bond
-            elif all([next_bond.bond_category == opposite_bond_category,
-                      next_bond.direction_category == opposite_direction_category,
-                      next_bond.bond_facet == facet]):
-                bond_to_add = next_bond.flipped_version()
-
-            if bond_to_add:
-                objects.append(next_object)
-                bonds.append(bond_to_add)
-            else:
-                break
+                objects.append(next_bond.right_object)
+            bonds.append(next_bond)
 
         return workspace.propose_group(objects, bonds, category, direction_category)
 
@@ -266,6 +238,8 @@ class GroupTopDownDirectionScout(Codelet):
     posts a group strength tester codelet with urgency a function of the
     degree of association of bonds of the given bond category."""
 
+    __slots__ = ()
+
     structure_category = 'group'
 
     def run(self, coderack, slipnet, workspace):
@@ -285,7 +259,7 @@ class GroupTopDownDirectionScout(Codelet):
 
         obj = string.get_random_object('intra_string_salience')
         if obj.spans_whole_string():
-            return # Fizzle
+            return FIZZLE
 
         if obj.is_leftmost_in_string():
             direction = slipnet.plato_right
@@ -305,50 +279,18 @@ class GroupTopDownDirectionScout(Codelet):
             bond = obj.right_bond
 
         if not bond or bond.direction_category != category:
-            return # Fizzle
+            return FIZZLE
 
         bond_category = bond.bond_category
-        facet = bond.bond_facet
-
-        opposite_bond_category = slipnet.get_related_node(bond_category,
-                                                          slipnet.plato_opposite)
-        opposite_category = slipnet.get_related_node(category,
-                                                     slipnet.plato_opposite)
 
         objects = [bond.left_object, bond.right_object]
         bonds = [bond]
-        next_bond = bond
-        for _ in range(2, number):
-            bond_to_add = None
+        for next_bond in string.get_bond_run(bond, direction, number - 2):
             if direction == slipnet.plato_left:
-                next_bond = next_bond.choose_left_neighbor()
-                if not next_bond:
-                    break
-                else:
-                    next_object = next_bond.left_object
-            else:
-                next_bond = next_bond.choose_right_neighbor()
-                if not next_bond:
-                    break
-                else:
-                    next_object = next_bond.right_object
-
-            if not next_bond:
-                bond_to_add = None
-            elif (next_bond.bond_category == bond_category) and \
-                 (next_bond.direction_category == category) and \
-                 (next_bond.bond_facet == facet):
-                bond_to_add = next_bond
-            elif (next_bond.bond_category == opposite_bond_category) and \
-                 (next_bond.direction_category == opposite_category) and \
-                 (next_bond.bond_facet == facet):
-                bond_to_add = next_bond.flipped_version()
-
-            if bond_to_add:
-                objects.append(next_object)
-                bonds.append(bond_to_add)
+                objects.append(next_bond.left_object)
             else:
-                break
+                objects.append(next_bond.right_object)
+            bonds.append(next_bond)
 
         group_category = slipnet.get_related_node(bond_category,
                                                   slipnet.plato_group_category)
@@ -361,12 +303,14 @@ class GroupWholeStringScout(Codelet):
     with urgency a function of the degree of association of bonds of the given
     category."""
 
+    __slots__ = ()
+
     structure_category = 'group'
 
     def run(self, coderack, slipnet, workspace):
         string = workspace.random_string()
         if not string.get_bonds():
-            return # Fizzle
+            return FIZZLE
 
         left_object = string.get_random_leftmost_object()
         next_bond = left_object.right_bond
@@ -380,7 +324,7 @@ class GroupWholeStringScout(Codelet):
             next_bond = next_object.right_bond
         right_object = next_object
         if not bonds or not right_object.is_rightmost_in_string():
-            return # Fizzle
+            return FIZZLE
 
         # Choose a random bond and try making a group based on it.
         bond = random.choice(bonds)
@@ -390,7 +334,7 @@ class GroupWholeStringScout(Codelet):
         bonds = workspace.possible_group_bonds(bond_category, direction_category,
                                                bond_facet, bonds)
         if not bonds:
-            return # Fizzle
+            return FIZZLE
 
         group_category = slipnet.get_related_node(bond_category,
                                                   slipnet.plato_group_category)
@@ -16,7 +16,7 @@
 
 """Rune Codelets"""
 
-from copycat.coderack import Codelet
+from copycat.coderack import Codelet, FIZZLE
 from copycat.workspace import Replacement
 from copycat.workspace import ExtrinsicDescription
 
@@ -28,10 +28,12 @@ class ReplacementFinder(Codelet):
     Can only deal with letters changing into letters, not letters changing into
     groups or vice versa."""
 
+    __slots__ = ()
+
     def run(self, coderack, slipnet, workspace):
         i_letter = workspace.initial_string.get_random_letter()
         if i_letter.replacement:
-            return # Fizzle
+            return FIZZLE
 
         index = i_letter.left_string_position
         m_letter = workspace.modified_string.get_letter(index)
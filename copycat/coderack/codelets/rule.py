@@ -16,23 +16,25 @@
 
 """Rule Codelets"""
 
-import sys
 import copycat.toolbox as toolbox
-from copycat.coderack import Codelet
+from copycat.coderack import Codelet, FIZZLE
+from copycat.errors import UnsupportedProblem
 from copycat.workspace import Rule, ExtrinsicDescription
 
 class RuleBuilder(Codelet):
     """Try to build the proposed rule, fighting with competitors as needed."""
 
+    __slots__ = ()
+
     def run(self, coderack, slipnet, workspace):
         rule = self.arguments[0]
 
         if workspace.rule:
             if workspace.rule == rule:
                 workspace.activate_from_workspace_rule_descriptions(rule)
-                return # Fizzle
+                return FIZZLE
             if not workspace.fight_it_out(rule, 1, [workspace.rule], 1):
-                return # Fizzle
+                return FIZZLE
             workspace.break_rule(workspace.rule)
         return workspace.build_rule(rule)
 
@@ -45,9 +47,11 @@ class RuleScout(Codelet):
     with urgency a function of the degree of conceptual depth of the chosen
     descriptions."""
 
+    __slots__ = ()
+
     def run(self, coderack, slipnet, workspace):
         if workspace.has_null_replacement():
-            return # Fizzle
+            return FIZZLE
 
         changed_objects = []
         for obj in workspace.initial_string.get_objects():
@@ -55,9 +59,8 @@ class RuleScout(Codelet):
                 changed_objects.append(obj)
 
         if len(changed_objects) > 1:
-            print("Can't solve problems with more than one letter changed.")
-            # FIXME: Too harsh, especially for graphical clients.
-            sys.exit()
+            raise UnsupportedProblem("Can't solve problems with more than "
+                                     "one letter changed.")
 
         if not changed_objects:
             return workspace.propose_rule(None, None, None, None)
@@ -77,7 +80,7 @@ class RuleScout(Codelet):
                 if applied in relevant:
                     i_descriptions.append(description)
         if not i_descriptions:
-            return # Fizzle
+            return FIZZLE
 
         depths = [d.conceptual_depth() for d in i_descriptions]
         i_probabilities = workspace.temperature_adjusted_values(depths)
@@ -86,7 +89,7 @@ class RuleScout(Codelet):
         m_descriptions = m_object.extrinsic_descriptions + \
                          m_object.rule_modified_string_descriptions()
         if not m_descriptions:
-            return # Fizzle
+            return FIZZLE
 
         depths = [d.conceptual_depth() for d in m_descriptions]
         m_probabilities = workspace.temperature_adjusted_values(depths)
@@ -109,6 +112,8 @@ class RuleStrengthTester(Codelet):
     whether or not to post a rule builder codelet with urgency a fucntion
     for its strength."""
 
+    __slots__ = ()
+
     def run(self, coderack, slipnet, workspace):
         rule = self.arguments[0]
 
@@ -118,25 +123,27 @@ class RuleStrengthTester(Codelet):
         probability = strength / 100.0
         probability = workspace.temperature_adjusted_probability(probability)
         if not toolbox.flip_coin(probability):
-            return # fizzle
+            return FIZZLE
         return [(RuleBuilder([rule]), strength)]
 
 class RuleTranslator(Codelet):
     """Translate the rule according to the translation rules given in the
     slippages on the workspace."""
 
+    __slots__ = ()
+
     def run(self, coderack, slipnet, workspace):
         workspace_rule = workspace.rule
         if not workspace_rule:
-            return # Fizzle
+            return FIZZLE
         if workspace_rule.has_no_change():
             workspace.translated_rule = Rule(workspace, None, None, None,
                                              None, None, None)
-            return # Fizzle
+            return FIZZLE
 
         threshold = workspace.answer_temperature_threshold_distribution().choose()
         if workspace.temperature > threshold:
-            return # Fizzle
+            return FIZZLE
 
         changed_object = None
         for obj in workspace.initial_string.get_objects():
@@ -144,16 +151,23 @@ class RuleTranslator(Codelet):
                 changed_object = obj
                 break
         if not changed_object:
-            return # Fizzle
+            return FIZZLE
 
         changed_object_correspondence = changed_object.correspondence
 
         slippages = workspace.slippages()
         if changed_object_correspondence:
-            for slippage in workspace.slippages():
-                for mapping in changed_object_correspondence.get_concept_mappings():
-                    if mapping.are_contradictory_concept_mappings(slippage):
-                        slippages.remove(slippage)
+            mappings = changed_object_correspondence.get_concept_mappings()
+            slippages = [slippage for slippage in slippages
+                         if not any(mapping.are_contradictory_concept_mappings(slippage)
+                                    for mapping in mappings)]
+
+        key = (workspace_rule.key(),
+               tuple((slippage.descriptor1, slippage.descriptor2)
+                     for slippage in slippages))
+        translated_rule = workspace.get_translation(key)
+        if translated_rule:
+            return workspace.build_translated_rule(translated_rule)
 
         rule = workspace_rule
         if rule.expresses_relation():
@@ -173,4 +187,5 @@ class RuleTranslator(Codelet):
                 args.append(arg.apply_slippages(slippages))
             translated_rule = Rule(workspace, *args)
 
+        workspace.set_translation(key, translated_rule)
         return workspace.build_translated_rule(translated_rule)
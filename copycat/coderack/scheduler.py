@@ -0,0 +1,106 @@
+# Copyright (c) 2007-2017 Joseph Hager.
+#
+# Copycat is free software; you can redistribute it and/or modify
+# it under the terms of version 2 of the GNU General Public License,
+# as published by the Free Software Foundation.
+#
+# Copycat is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Copycat; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.
+
+"""Schedulers decide which codelet on the coderack runs next.
+
+Codelets are always kept in the coderack's urgency bins, which are also
+used to choose codelets to remove when the coderack is full; a scheduler
+only picks the next codelet to run."""
+
+import heapq
+import itertools
+import random
+
+import copycat.toolbox as toolbox
+
+class BinScheduler(object):
+    """BinScheduler chooses a bin by the total urgency of its codelets and
+    then a codelet in the bin at random, as Copycat always has.
+
+    It is also the base of the other schedulers, which override choose and,
+    if they keep track of the codelets posted, add and clear."""
+
+    def add(self, codelet):
+        """Note a codelet posted to the coderack."""
+        pass
+
+    def clear(self):
+        """Note that the coderack was emptied."""
+        pass
+
+    def choose(self, coderack):
+        """Return the codelet on the coderack to run next, leaving it on the
+        coderack. The coderack is never empty when this is called."""
+        urgencies = [pbin.urgency_sum(coderack.temperature)
+                     for pbin in coderack.bins]
+        pbin = toolbox.weighted_select(urgencies, coderack.bins)
+        return random.choice(pbin.codelets)
+
+class UrgencyScheduler(BinScheduler):
+    """UrgencyScheduler chooses a codelet by its own urgency, using the bin
+    urgency formula without rounding the codelet's urgency to a bin."""
+
+    def urgency(self, codelet, temperature, bins):
+        """Return the temperature adjusted urgency of a codelet.
+
+        The codelet's urgency is put on the scale of the bin urgency codes,
+        0 to bins - 1, as Coderack.get_bin does but without rounding it
+        down, so the most urgent codelets weigh the same as in the top
+        bin."""
+        code = min(codelet.urgency * bins / 100.0, bins - 1)
+        return round((code + 1) ** ((110 - temperature) / 15))
+
+    def choose(self, coderack):
+        codelets = coderack.codelets()
+        bins = len(coderack.bins)
+        urgencies = [self.urgency(codelet, coderack.temperature, bins)
+                     for codelet in codelets]
+        return toolbox.WeightedSampler(urgencies, codelets).choose()
+
+class HeapScheduler(BinScheduler):
+    """HeapScheduler always chooses the most urgent codelet, the oldest
+    first among equals, regardless of temperature.
+
+    Attributes:
+        heap: A heap of (negated urgency, order posted, codelet) entries,
+            which may include codelets that have since left the coderack.
+        counter: The order in which codelets were posted."""
+
+    def __init__(self):
+        """Initialize HeapScheduler."""
+        self.heap = []
+        self.counter = itertools.count()
+
+    def add(self, codelet):
+        heapq.heappush(self.heap, (-codelet.urgency, next(self.counter),
+                                   codelet))
+
+    def clear(self):
+        self.heap = []
+
+    def choose(self, coderack):
+        if len(self.heap) > 2 * coderack.max_codelets:
+            self.heap = [entry for entry in self.heap
+                         if entry[2].bin is not None]
+            heapq.heapify(self.heap)
+        while True:
+            codelet = heapq.heappop(self.heap)[2]
+            if codelet.bin is not None:
+                return codelet
+
+SCHEDULERS = {'bins': BinScheduler,
+              'urgency': UrgencyScheduler,
+              'heap': HeapScheduler}
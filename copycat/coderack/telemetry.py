@@ -0,0 +1,175 @@
+# Copyright (c) 2007-2017 Joseph Hager.
+#
+# Copycat is free software; you can redistribute it and/or modify
+# it under the terms of version 2 of the GNU General Public License,
+# as published by the Free Software Foundation.
+#
+# Copycat is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Copycat; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.
+
+"""Counters and time series describing what happens on the coderack.
+
+For example, to write the samples of a run as CSV:
+
+    run = Run('abc', 'abd', 'ijk', 0)
+    while not run.workspace.answer_string:
+        run.step()
+    run.coderack.telemetry.write_csv(open('telemetry.csv', 'w'))"""
+
+import csv
+from array import array
+
+SAMPLES = 1000
+
+class RingBuffer(object):
+    """RingBuffer keeps the last values appended to it in an array of fixed
+    size.
+
+    Attributes:
+        values: The array the values are kept in.
+        size: The number of values kept.
+        count: The number of values appended so far."""
+
+    def __init__(self, size, typecode='l'):
+        """Initialize RingBuffer."""
+        self.values = array(typecode, [0] * size)
+        self.size = size
+        self.count = 0
+
+    def append(self, value):
+        """Append a value, replacing the oldest if the buffer is full."""
+        self.values[self.count % self.size] = value
+        self.count += 1
+
+    def to_list(self):
+        """Return the values kept, oldest first."""
+        if self.count <= self.size:
+            return self.values[:self.count].tolist()
+        start = self.count % self.size
+        return (self.values[start:] + self.values[:start]).tolist()
+
+class Telemetry(object):
+    """Telemetry counts what happens to each type of codelet on a coderack
+    and samples the coderack once per update.
+
+    Attributes:
+        posted: A dictionary of codelet type name to the number posted.
+        chosen: A dictionary of codelet type name to the number chosen to run.
+        fizzled: A dictionary of codelet type name to the number that gave
+            up without doing anything.
+        evicted: A dictionary of codelet type name to the number removed to
+            make room for others.
+        purged: A dictionary of codelet type name to the number purged
+            because a structure they held was withdrawn.
+        on_rack: A dictionary of codelet type name to the number on the
+            coderack now.
+        samples: The number of samples kept in each series.
+        series: A dictionary of series name to the RingBuffer of its samples.
+            'time', 'temperature' and 'size' are always present, as is
+            'bin0' to 'bin6' for the bin occupancy. The number of each type
+            of codelet on the coderack is kept under the type's name from
+            the sample after it was first posted."""
+
+    def __init__(self, bins=7, samples=SAMPLES):
+        """Initialize Telemetry."""
+        self.posted = {}
+        self.chosen = {}
+        self.fizzled = {}
+        self.evicted = {}
+        self.purged = {}
+        self.on_rack = {}
+        self.samples = samples
+        self.bins = bins
+        self.series = {}
+        for name in ['time', 'temperature', 'size'] + \
+                ['bin%d' % i for i in range(bins)]:
+            self.series[name] = RingBuffer(samples)
+
+    def count(self, counter, codelet, amount=1):
+        """Add an amount to a counter for the codelet's type."""
+        name = type(codelet).__name__
+        counter[name] = counter.get(name, 0) + amount
+
+    def note_posted(self, codelet):
+        """Count a codelet posted to the coderack."""
+        self.count(self.posted, codelet)
+        self.count(self.on_rack, codelet)
+
+    def note_chosen(self, codelet):
+        """Count a codelet chosen to run."""
+        self.count(self.chosen, codelet)
+        self.count(self.on_rack, codelet, -1)
+
+    def note_evicted(self, codelet):
+        """Count a codelet removed to make room."""
+        self.count(self.evicted, codelet)
+        self.count(self.on_rack, codelet, -1)
+
+    def note_purged(self, codelet):
+        """Count a codelet purged for holding a withdrawn structure."""
+        self.count(self.purged, codelet)
+        self.count(self.on_rack, codelet, -1)
+
+    def note_fizzled(self, codelet):
+        """Count a codelet that ran without effect."""
+        self.count(self.fizzled, codelet)
+
+    def note_cleared(self):
+        """Note that every codelet was taken off the coderack."""
+        self.on_rack = {}
+
+    def sample(self, coderack):
+        """Sample the coderack's time, temperature, size, bin occupancy and
+        the number of each type of codelet on it."""
+        series = self.series
+        series['time'].append(coderack.time)
+        series['temperature'].append(int(coderack.temperature))
+        occupancy = [len(pbin.codelets) for pbin in coderack.bins]
+        series['size'].append(sum(occupancy))
+        for i, number in enumerate(occupancy):
+            series['bin%d' % i].append(number)
+        for name in self.on_rack:
+            if name not in series:
+                buffer = RingBuffer(self.samples)
+                buffer.count = series['time'].count - 1
+                series[name] = buffer
+        for name, buffer in series.items():
+            if name in self.on_rack:
+                buffer.append(self.on_rack[name])
+            elif buffer.count < series['time'].count:
+                buffer.append(0)
+
+    def totals(self):
+        """Return a dictionary of codelet type name to a dictionary of its
+        posted, chosen, fizzled, evicted and purged counts."""
+        names = set(self.posted) | set(self.chosen)
+        counters = [('posted', self.posted), ('chosen', self.chosen),
+                    ('fizzled', self.fizzled), ('evicted', self.evicted),
+                    ('purged', self.purged)]
+        return dict((name, dict((label, counter.get(name, 0))
+                                for label, counter in counters))
+                    for name in names)
+
+    def export(self):
+        """Return a dictionary of series name to the list of its samples,
+        oldest first."""
+        return dict((name, buffer.to_list())
+                    for name, buffer in self.series.items())
+
+    def write_csv(self, output):
+        """Write the samples to a file as CSV, one row per sample."""
+        data = self.export()
+        fixed = ['time', 'temperature', 'size'] + \
+            ['bin%d' % i for i in range(self.bins)]
+        names = fixed + sorted(name for name in data if name not in fixed)
+        writer = csv.writer(output)
+        writer.writerow(names)
+        for row in zip(*[data[name] for name in names]):
+            writer.writerow(row)
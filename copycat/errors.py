@@ -0,0 +1,41 @@
+# Copyright (c) 2007-2017 Joseph Hager.
+#
+# Copycat is free software; you can redistribute it and/or modify
+# it under the terms of version 2 of the GNU General Public License,
+# as published by the Free Software Foundation.
+#
+# Copycat is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Copycat; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.
+
+
+"""Errors raised by the copycat engine.
+
+Every error the engine raises on purpose is a CopycatError, so that a caller
+running many problems can tell them apart from bugs."""
+
+class CopycatError(Exception):
+    """The base class of the engine's errors."""
+
+class UnsupportedProblem(CopycatError):
+    """The problem is one copycat cannot solve, such as one with more than
+    one letter changed or with characters other than lowercase letters."""
+
+class BudgetExceeded(CopycatError):
+    """A run has used up its codelets or time without finishing.
+
+    Attributes:
+        steps: The number of codelets run.
+        seconds: The number of seconds the run took."""
+
+    def __init__(self, message, steps, seconds):
+        """Initialize BudgetExceeded."""
+        super(BudgetExceeded, self).__init__(message)
+        self.steps = steps
+        self.seconds = seconds
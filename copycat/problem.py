@@ -0,0 +1,157 @@
+# Copyright (c) 2007-2017 Joseph Hager.
+#
+# Copycat is free software; you can redistribute it and/or modify
+# it under the terms of version 2 of the GNU General Public License,
+# as published by the Free Software Foundation.
+#
+# Copycat is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Copycat; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.
+
+"""Problems compiled once and started many times.
+
+A Problem works out the initial workspace of a problem once, recording the
+slipnode of every letter and initial description. Each run started from it
+builds its workspace from that template instead of parsing the strings and
+choosing the descriptions again. A compiled problem is plain data, so it can
+be cached on disk and sent to other processes.
+
+Compiled problems are stored with pickle, which can run any code named in the
+data it loads. A cache directory must therefore be one that only trusted users
+can write to. Each cached problem is stored after a digest of its key and its
+data, and is only unpickled if the digest matches, so a file that is stale,
+truncated or saved under another key is compiled again instead of loaded."""
+
+import hashlib
+import os
+import pickle
+
+from copycat.slipnet import Slipnet
+from copycat.slipnet.definition import Definition
+from copycat.workspace import Workspace
+
+FORMAT_VERSION = 2
+
+DIGEST_SIZE = 32
+
+_engine_hash = None
+
+def engine_hash():
+    """Return a hash of the source and data files of the copycat package.
+
+    Anything cached from a run is only valid for the engine that made it, so
+    this is part of the key of every cache."""
+    global _engine_hash
+    if _engine_hash is None:
+        digest = hashlib.sha256()
+        package = os.path.dirname(os.path.abspath(__file__))
+        for directory, directories, files in sorted(os.walk(package)):
+            directories.sort()
+            for name in sorted(files):
+                if name.endswith('.py') or name.endswith('.json'):
+                    path = os.path.join(directory, name)
+                    digest.update(os.path.relpath(path, package).encode())
+                    with open(path, 'rb') as source:
+                        digest.update(source.read())
+        _engine_hash = digest.hexdigest()
+    return _engine_hash
+
+class Problem(object):
+    """Problem
+
+    Attributes:
+        initial: The initial string.
+        modified: The modified string.
+        target: The target string.
+        long_strings: True if runs of the problem use long-string mode.
+        definition: The path of the slipnet definition, or None for the
+            standard slipnet.
+        letters: For each of the initial, modified and target strings, a
+            tuple with a (name, category, descriptions) tuple for each
+            letter, where category is the index of the letter's slipnode and
+            descriptions is a tuple of (description type, descriptor) slipnode
+            index pairs."""
+
+    def __init__(self, initial, modified, target, long_strings=None,
+                 definition=None, cache=None):
+        """Compile the problem by building its initial workspace once, with
+        the slipnet of the given definition."""
+        self.initial = initial
+        self.modified = modified
+        self.target = target
+        self.definition = definition
+
+        slipnet = Slipnet(definition, cache)
+        workspace = Workspace(initial, modified, target, slipnet, long_strings)
+        index = dict((id(node), i) for i, node in enumerate(slipnet.slipnodes))
+        self.long_strings = workspace.long_string_mode
+        self.letters = tuple(
+            tuple((letter.name, index[id(letter.category)],
+                   tuple((index[id(d.description_type)], index[id(d.descriptor)])
+                         for d in letter.descriptions))
+                  for letter in string.get_letters())
+            for string in [workspace.initial_string,
+                           workspace.modified_string,
+                           workspace.target_string])
+
+    def to_bytes(self):
+        """Return the compiled problem as bytes."""
+        return pickle.dumps(self, pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def from_bytes(data):
+        """Return the compiled problem stored in the given bytes.
+
+        The bytes are unpickled, so they must come from a trusted source."""
+        return pickle.loads(data)
+
+    @classmethod
+    def cached(cls, initial, modified, target, long_strings=None,
+               directory=None, definition=None):
+        """Return the compiled problem, loading it from the cache directory if
+        it was compiled before by this engine and saving it there if not.
+
+        Without a directory the problem is always compiled. The directory
+        must be writable only by trusted users, as cached problems are
+        unpickled once their digest is checked."""
+        if directory is None:
+            return cls(initial, modified, target, long_strings, definition)
+        key = cache_key(initial, modified, target, long_strings,
+                        Definition.load(definition, directory).digest)
+        path = os.path.join(directory, key + '.problem')
+        try:
+            with open(path, 'rb') as cache:
+                data = cache.read()
+            digest, data = data[:DIGEST_SIZE], data[DIGEST_SIZE:]
+            if digest == cache_digest(key, data):
+                return cls.from_bytes(data)
+        except (IOError, OSError, EOFError, pickle.UnpicklingError):
+            pass
+        problem = cls(initial, modified, target, long_strings, definition,
+                      directory)
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        temporary = '%s.%d' % (path, os.getpid())
+        data = problem.to_bytes()
+        with open(temporary, 'wb') as cache:
+            cache.write(cache_digest(key, data) + data)
+        os.rename(temporary, path)
+        return problem
+
+def cache_key(initial, modified, target, long_strings=None, digest=None):
+    """Return the cache key of a problem compiled by this engine, with the
+    slipnet definition of the given hash."""
+    text = repr((FORMAT_VERSION, engine_hash(), initial, modified, target,
+                 long_strings, digest))
+    return hashlib.sha256(text.encode()).hexdigest()
+
+def cache_digest(key, data):
+    """Return the digest stored before the data of a problem cached under the
+    given key."""
+    return hashlib.sha256(key.encode() + data).digest()
@@ -17,12 +17,14 @@
 """Run enscapulates all the moving parts for a single copycat run."""
 
 import random
+import time
 
-from copycat.coderack import Coderack
+from copycat.coderack import Coderack, FIZZLE
 from copycat.slipnet import Slipnet
 from copycat.workspace import Workspace
-import copycat.coderack.codelets
+from copycat.workspace import events
 from copycat.coderack.codelets import AnswerBuilder
+from copycat.errors import BudgetExceeded
 
 class Run(object):
     """Run
@@ -31,15 +33,71 @@ class Run(object):
         coderack:
         slipnet:
         workspace:
-        timestep: The number of codelets to run before an update."""
-
-    def __init__(self, initial, modified, target, seed):
-        """Initialize Run."""
-        self.coderack = Coderack()
-        self.slipnet = Slipnet()
-        self.workspace = Workspace(initial, modified, target, self.slipnet)
+        timestep: The number of codelets to run before an update.
+        snag_limit: The number of snags with the same signature after which
+            the run is given up as caught in a loop, or None to never give up.
+        snag_loop: True if the run has been given up as caught in a loop of
+            snags."""
+
+    def __init__(self, initial, modified, target, seed, long_strings=None,
+                 problem=None, scheduler=None, definition=None,
+                 snag_limit=None):
+        """Initialize Run.
+
+        long_strings forces long-string mode on or off; by default the
+        workspace decides from the lengths of the strings. If a compiled
+        problem is given the workspace is started from it.
+
+        The coderack chooses codelets with the given scheduler, or by bin if
+        there is none.
+
+        The slipnet is built from the definition in the file at the given
+        path, or from the compiled problem's, or else from the standard
+        definition.
+
+        If a snag_limit is given, the run is finished once that many snags
+        with the same signature have been hit in building answers."""
+        if problem and definition is None:
+            definition = problem.definition
+        self.slipnet = Slipnet(definition)
+        self.workspace = Workspace(initial, modified, target, self.slipnet,
+                                   long_strings, problem)
+        self.coderack = Coderack(self.workspace.coderack_capacity(), scheduler)
+        self.workspace.subscribe(self.purge_codelets,
+                                 [events.BOND_WITHDRAWN,
+                                  events.GROUP_WITHDRAWN,
+                                  events.CORRESPONDENCE_WITHDRAWN])
         random.seed(seed)
         self.timestep = 15
+        self.snag_limit = snag_limit
+        self.snag_loop = False
+        self.workspace.subscribe(self.check_snag, [events.SNAG])
+
+    @classmethod
+    def from_problem(cls, problem, seed, scheduler=None, snag_limit=None):
+        """Return a new run of a compiled problem."""
+        return cls(problem.initial, problem.modified, problem.target, seed,
+                   problem.long_strings, problem, scheduler,
+                   problem.definition, snag_limit)
+
+    def is_finished(self):
+        """Return True if the run has found an answer or been given up."""
+        return bool(self.workspace.answer_string) or self.snag_loop
+
+    def run(self, steps=None, seconds=None):
+        """Step through the run until it is finished.
+
+        Raise BudgetExceeded if it has not finished after the given number
+        of codelets or seconds."""
+        start = time.time()
+        while not self.is_finished():
+            elapsed = time.time() - start
+            if (steps is not None and self.coderack.time >= steps) or \
+                    (seconds is not None and elapsed >= seconds):
+                raise BudgetExceeded('No answer after %d codelets in %.1f '
+                                     'seconds.' % (self.coderack.time, elapsed),
+                                     self.coderack.time, elapsed)
+            self.step()
 
     def step(self):
         """Make one step through a run."""
@@ -48,12 +106,7 @@ class Run(object):
 
         if self.coderack.is_empty():
             self.slipnet.clamp_initial_nodes()
-            codelets = self.workspace.initial_codelets()
-            for codelet, urgency in codelets:
-                deleted = self.coderack.post(codelet, urgency)
-                if deleted:
-                    for structure in deleted.arguments:
-                        self.workspace.remove_proposed_structure(structure)
+            self.post(self.workspace.initial_codelets())
 
         self.run_codelet(self.coderack.choose())
 
@@ -61,16 +114,29 @@ class Run(object):
             self.run_codelet(AnswerBuilder())
             self.update()
 
+    def check_snag(self, kind, snag_object):
+        """Give up the run if the snag's signature has come up too often."""
+        if self.snag_limit and self.workspace.snag_repeats >= self.snag_limit:
+            self.snag_loop = True
+
     def run_codelet(self, codelet):
         """Run a single codelet, posting any new codelets they create."""
         codelets = codelet.run(self.coderack, self.slipnet, self.workspace)
-        if not codelets:
-            return
-        for codelet, urgency in codelets:
-            deleted = self.coderack.post(codelet, urgency)
-            if deleted:
-                for structure in deleted.agruments:
-                    self.workspace.remove_proposed_structure(structure)
+        if codelets is FIZZLE:
+            self.coderack.telemetry.note_fizzled(codelet)
+        elif codelets:
+            self.post(codelets)
+
+    def post(self, codelets):
+        """Post a list of (codelet, urgency) pairs to the coderack, removing
+        the proposed structures of any codelets removed to make room."""
+        for deleted in self.coderack.post_many(codelets):
+            for structure in deleted.arguments:
+                self.workspace.remove_proposed_structure(structure)
+
+    def purge_codelets(self, kind, structure):
+        """Remove the codelets holding a withdrawn proposed structure."""
+        self.coderack.purge(structure)
 
     def update(self):
         """Update everything."""
@@ -82,40 +148,10 @@ class Run(object):
         self.coderack.update(self.workspace.temperature)
         codelets = self.workspace.bottom_up_codelets()
         top_down_codelet_types = self.slipnet.top_down_codelets()
-        for codelet_name, args, urgency in top_down_codelet_types:
-            codelet = getattr(copycat.coderack.codelets, codelet_name)
+        for codelet, args, urgency in top_down_codelet_types:
             category = codelet.structure_category
             cs = self.workspace.get_codelets(category, codelet, urgency, args)
             codelets.extend(cs)
-        for (codelet, urgency) in codelets:
-            deleted = self.coderack.post(codelet, urgency)
-            if deleted != None:
-                for structure in deleted.arguments:
-                    self.workspace.remove_proposed_structure(structure)
+        self.post(codelets)
 
         self.slipnet.update()
-
-    def deal_with_snag(self):
-        """If there is a snag in building the answer, delete all proposed
-        structures, empty the coderack, raise and clamp the temperature,
-        and activate and clamp activation of all the descriptions of the
-        object causing the snag."""
-        self.workspace.snag_count += 1
-        self.workspace.last_snag_time = self.coderack.time
-        self.workspace.snag_structures = self.workspace.structures()
-        for bond in self.workspace.get_proposed_bonds():
-            bond.string.remove_proposed_bond(bond)
-        for group in self.workspace.get_proposed_groups():
-            group.string.remove_proposed_group(group)
-        for correspondence in self.workspace.get_proposed_correspondences():
-            self.workspace.remove_proposed_correspondence(correspondence)
-        self.workspace.translated_rule = None
-        self.workspace.answer_string = None
-        self.workspace.snag_condition = True
-        self.workspace.temperature = 100
-        self.workspace.clamp_temperature = True
-        for description in self.workspace.snag_object.descriptions:
-            description.descriptor.clamped = True
-        self.workspace.snag_object.clamp_salience = True
-        self.coderack.clear()
-        self.update()
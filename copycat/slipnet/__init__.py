@@ -16,8 +16,11 @@
 
 """Slipnet"""
 
-import string
+from functools import partial
+from operator import attrgetter
 import copycat.toolbox as toolbox
+from copycat.slipnet import testers
+from copycat.slipnet.definition import Definition, LINK_KINDS
 from copycat.slipnet.slipnode import Slipnode
 from copycat.slipnet.sliplink import Sliplink
 
@@ -28,391 +31,85 @@ class Slipnet(object):
     distance between them.
 
     Attributes:
+        definition: The compiled definition the slipnet was built from.
         slipnodes: The nodes in the slipnet.
+        active_nodes: The set of nodes with activation, buffered activation or
+            a clamp. The others are left alone by an update.
+        codelet_nodes: The nodes with codelets attached.
+        slipnet_letters: The letter nodes, in alphabetical order.
+        letter_nodes: A dictionary of character to its letter node.
+        slipnet_numbers: The number nodes, in order.
+        number_nodes: A dictionary of number name to its number node.
         sliplinks: The links between the nodes.
         clamp_time: The amount of steps to clamp activation in the slipnet."""
 
-    def __init__(self):
-        """Initializes Slipnet."""
+    def __init__(self, definition=None, cache=None):
+        """Initializes Slipnet from the definition in the file at the given
+        path, or from the standard definition.
+
+        The compiled definition is cached in the cache directory if one is
+        given."""
+        self.definition = Definition.load(definition, cache)
         self.slipnodes = []
+        self.active_nodes = set()
+        self.codelet_nodes = []
         self.sliplinks = []
-        self.clamp_time = 50
-
-        # Letter nodes
-        self.slipnet_letters = []
-        for letter in string.ascii_lowercase:
-            self.slipnet_letters.append(self.add_node(str(letter), 10))
-
-        # Number nodes
-        self.slipnet_numbers = []
-
-        node = self.add_node("1", 30)
-        node.description_tester = (lambda obj:
-            obj.type_name == 'group' and obj.length() == 1)
-        self.slipnet_numbers.append(node)
-
-        node = self.add_node("2", 30)
-        node.description_tester = (lambda obj:
-            obj.type_name == 'group' and obj.length() == 2)
-        self.slipnet_numbers.append(node)
-
-        node = self.add_node("3", 30)
-        node.description_tester = (lambda obj:
-            obj.type_name == 'group' and obj.length() == 3)
-        self.slipnet_numbers.append(node)
-
-        node = self.add_node("4", 30)
-        node.description_tester = (lambda obj:
-            obj.type_name == 'group' and obj.length() == 4)
-        self.slipnet_numbers.append(node)
-
-        node = self.add_node("5", 30)
-        node.description_tester = (lambda obj:
-            obj.type_name == 'group' and obj.length() == 5)
-        self.slipnet_numbers.append(node)
-
-        # String position nodes.
-        self.plato_leftmost = self.add_node(('leftmost', 'lmost'), 40)
-        self.plato_leftmost.description_tester = (lambda obj:
-            not obj.spans_whole_string() and obj.is_leftmost_in_string())
-        self.plato_rightmost = self.add_node(('rightmost', 'rmost'), 40)
-        self.plato_rightmost.description_tester = (lambda obj:
-            not obj.spans_whole_string() and obj.is_rightmost_in_string())
-        self.plato_middle = self.add_node('middle', 40)
-        self.plato_middle.description_tester = (lambda obj:
-            obj.ungrouped_left_neighbor() and obj.ungrouped_right_neighbor() and
-            obj.ungrouped_left_neighbor().is_leftmost_in_string() and
-            obj.ungrouped_right_neighbor().is_rightmost_in_string())
-        self.plato_single = self.add_node('single', 40)
-        self.plato_single.description_tester = (lambda obj:
-            obj.type_name == 'letter' and obj.spans_whole_string())
-        self.plato_whole = self.add_node('whole', 40)
-        self.plato_whole.description_tester = (lambda obj:
-           obj.type_name == 'group' and obj.spans_whole_string())
-
-        # Alphabetic position nodes
-        self.plato_first = self.add_node('first', 60)
-        self.plato_first.description_tester = (lambda obj:
-            obj.get_descriptor(self.plato_letter_category) == self.slipnet_letters[0])
-        self.plato_last = self.add_node('last', 60)
-        self.plato_last.description_tester = (lambda obj:
-            obj.get_descriptor(self.plato_letter_category) ==
-            self.slipnet_letters[len(self.slipnet_letters) - 1])
-
-        # Direction nodes
-        self.plato_left = self.add_node('left', 40,
-                                        ['BondTopDownDirectionScout',
-                                         'GroupTopDownDirectionScout'])
-        self.plato_right = self.add_node('right', 40,
-                                         ['BondTopDownDirectionScout',
-                                          'GroupTopDownDirectionScout'])
-
-        # Bond nodes
-        self.plato_predecessor = self.add_node(('predecessor', 'pred'), 50,
-                                               ['BondTopDownCategoryScout'],
-                                               60, directed=True)
-        self.plato_successor = self.add_node(('successor', 'succ'), 50,
-                                             ['BondTopDownCategoryScout'],
-                                             60, directed=True)
-        self.plato_sameness = self.add_node(('sameness', 'same'), 80,
-                                            ['BondTopDownCategoryScout'], 0)
-
-        # Group nodes
-        self.plato_predecessor_group = self.add_node(('predecessor group',
-                                                      'predgr'), 50,
-                                                     ['GroupTopDownCategoryScout'],
-                                                     directed=True)
-        self.plato_predecessor_group.iterate_group = (lambda category:
-            self.get_related_node(category, self.plato_predecessor))
-        self.plato_successor_group = self.add_node(('succesor group',
-                                                    'succgr'), 50,
-                                                   ['GroupTopDownCategoryScout'],
-                                                   directed=True)
-        self.plato_successor_group.iterate_group = (lambda category:
-            self.get_related_node(category, self.plato_successor))
-        self.plato_sameness_group = self.add_node(('sameness group', 'samegr'),
-                                                  80, ['GroupTopDownCategoryScout'])
-        self.plato_sameness_group.iterate_group = lambda category: category
-
-        # Other relation nodes
-        self.plato_identity = self.add_node(('identity', 'ident'), 90, [], 0)
-        self.plato_opposite = self.add_node(('opposite', 'oppos'), 90, [], 80)
-
-        # Object nodes
-        self.plato_letter = self.add_node('letter', 20)
-        self.plato_letter.description_tester = (lambda obj:
-            obj.type_name == 'letter')
-        self.plato_group = self.add_node('group', 80)
-        self.plato_group.description_tester = (lambda obj:
-            obj.type_name == 'group')
-
-        # Category nodes
-        self.plato_letter_category = self.add_node(('letter category',
-                                                    'ltr-c'), 30,
-                                                   initially_clamped=True)
-        self.plato_string_position_category = self.add_node(
-            ('string category', 'str-c'), 70, ['DescriptionTopDownScout'],
-            initially_clamped=True)
-        self.plato_alphabetic_position_category = self.add_node(
-            ('alphabetic position category',
-             'alph-c'), 80, ['DescriptionTopDownScout'])
-        self.plato_direction_category = self.add_node(('direction category',
-                                                       'dir-c'), 70)
-        self.plato_bond_category = self.add_node(('bond category', 'bnd-c'), 80)
-        self.plato_group_category = self.add_node(('group cagegory',
-                                                   'grp-c'), 80)
-        self.plato_length = self.add_node('length', 60,
-                                          ['DescriptionTopDownScout'])
-        self.plato_object_category = self.add_node('obj-c', 90)
-        self.plato_bond_facet = self.add_node(('bond facet', 'facet'), 90)
-
-        # Letter links
-        for i in range(25):
-            before = self.slipnet_letters[i]
-            after = self.slipnet_letters[i + 1]
-            self.add_link('nonslip', before, after, self.plato_successor, None)
-            self.add_link('nonslip', after, before, self.plato_predecessor, None)
-
-        # Number links
-        for i in range(4):
-            before = self.slipnet_numbers[i]
-            after = self.slipnet_numbers[i + 1]
-            self.add_link('nonslip', before, after, self.plato_successor, None)
-            self.add_link('nonslip', after, before, self.plato_predecessor, None)
-
-        # Letter category links
-        for i in range(26):
-            letter = self.slipnet_letters[i]
-            fixed_length = (self.plato_letter_category.conceptual_depth -
-                            letter.conceptual_depth)
-            self.add_link('category', letter, self.plato_letter_category,
-                          None, fixed_length)
-            self.add_link('instance', self.plato_letter_category, letter, None, 97)
-        self.add_link('category', self.plato_sameness_group,
-                      self.plato_letter_category, None, 50)
-
-        # Length links
-        for i in range(5):
-            num = self.slipnet_numbers[i]
-            fixed_length = self.plato_length.conceptual_depth - num.conceptual_depth
-            self.add_link('category', num, self.plato_length, None, fixed_length)
-            self.add_link('instance', self.plato_length, num, None, 100)
-        self.add_link('nonslip', self.plato_predecessor_group,
-                      self.plato_length, None, 95)
-        self.add_link('nonslip', self.plato_successor_group,
-                      self.plato_length, None, 95)
-        self.add_link('nonslip', self.plato_sameness_group,
-                      self.plato_length, None, 95)
-
-        # Opposite links
-        self.add_link('slip', self.plato_first, self.plato_last,
-                      self.plato_opposite, None)
-        self.add_link('slip', self.plato_last, self.plato_first,
-                      self.plato_opposite, None)
-        self.add_link('slip', self.plato_leftmost, self.plato_rightmost,
-                      self.plato_opposite, None)
-        self.add_link('slip', self.plato_rightmost, self.plato_leftmost,
-                      self.plato_opposite, None)
-        self.add_link('slip', self.plato_left, self.plato_right,
-                      self.plato_opposite, None)
-        self.add_link('slip', self.plato_right, self.plato_left,
-                      self.plato_opposite, None)
-        self.add_link('slip', self.plato_successor, self.plato_predecessor,
-                      self.plato_opposite, None)
-        self.add_link('slip', self.plato_predecessor, self.plato_successor,
-                      self.plato_opposite, None)
-        self.add_link('slip', self.plato_successor_group,
-                      self.plato_predecessor_group, self.plato_opposite, None)
-        self.add_link('slip', self.plato_predecessor_group,
-                      self.plato_successor_group, self.plato_opposite, None)
-
-        # Has property links
-        self.add_link('property', self.slipnet_letters[0],
-                      self.plato_first, None, 75)
-        self.add_link('property', self.slipnet_letters[25],
-                      self.plato_last, None, 75)
-
-        # Object category links
-        self.add_link('category', self.plato_letter,
-                      self.plato_object_category, None,
-                      (self.plato_object_category.conceptual_depth -
-                       self.plato_letter.conceptual_depth))
-        self.add_link('instance', self.plato_object_category,
-                      self.plato_letter, None, 100)
-        self.add_link('category', self.plato_group,
-                      self.plato_object_category, None,
-                      (self.plato_object_category.conceptual_depth -
-                       self.plato_group.conceptual_depth))
-        self.add_link('instance', self.plato_object_category,
-                      self.plato_group, None, 100)
-
-        # String position links
-        self.add_link('category', self.plato_leftmost,
-                      self.plato_string_position_category, None,
-                      (self.plato_string_position_category.conceptual_depth -
-                       self.plato_leftmost.conceptual_depth))
-        self.add_link('instance', self.plato_string_position_category,
-                      self.plato_leftmost, None, 100)
-        self.add_link('category', self.plato_rightmost,
-                      self.plato_string_position_category, None,
-                      (self.plato_string_position_category.conceptual_depth -
-                       self.plato_rightmost.conceptual_depth))
-        self.add_link('instance', self.plato_string_position_category,
-                      self.plato_rightmost, None, 100)
-        self.add_link('category', self.plato_middle,
-                      self.plato_string_position_category, None,
-                      (self.plato_string_position_category.conceptual_depth -
-                       self.plato_middle.conceptual_depth))
-        self.add_link('instance', self.plato_string_position_category,
-                      self.plato_middle, None, 100)
-        self.add_link('category', self.plato_single,
-                      self.plato_string_position_category, None,
-                      (self.plato_string_position_category.conceptual_depth -
-                       self.plato_single.conceptual_depth))
-        self.add_link('instance', self.plato_string_position_category,
-                      self.plato_single, None, 100)
-        self.add_link('category', self.plato_whole,
-                      self.plato_string_position_category, None,
-                      (self.plato_string_position_category.conceptual_depth -
-                       self.plato_whole.conceptual_depth))
-        self.add_link('instance', self.plato_string_position_category,
-                      self.plato_whole, None, 100)
-
-        # Alphabetic position category links
-        self.add_link('category', self.plato_first,
-                      self.plato_alphabetic_position_category, None,
-                      (self.plato_alphabetic_position_category.conceptual_depth -
-                       self.plato_first.conceptual_depth))
-        self.add_link('instance', self.plato_alphabetic_position_category,
-                      self.plato_first, None, 100)
-        self.add_link('category', self.plato_last,
-                      self.plato_alphabetic_position_category, None,
-                      (self.plato_alphabetic_position_category.conceptual_depth -
-                       self.plato_last.conceptual_depth))
-        self.add_link('instance', self.plato_alphabetic_position_category,
-                      self.plato_last, None, 100)
-
-        # Direction category links
-        self.add_link('category', self.plato_left,
-                      self.plato_direction_category, None,
-                      (self.plato_direction_category.conceptual_depth -
-                       self.plato_left.conceptual_depth))
-        self.add_link('instance', self.plato_direction_category,
-                      self.plato_left, None, 100)
-        self.add_link('category', self.plato_right,
-                      self.plato_direction_category, None,
-                      (self.plato_direction_category.conceptual_depth -
-                       self.plato_right.conceptual_depth))
-        self.add_link('instance', self.plato_direction_category,
-                      self.plato_right, None, 100)
-
-        # Bond category links
-        self.add_link('category', self.plato_predecessor,
-                      self.plato_bond_category, None,
-                      (self.plato_bond_category.conceptual_depth -
-                       self.plato_predecessor.conceptual_depth))
-        self.add_link('instance', self.plato_bond_category,
-                      self.plato_predecessor, None, 100)
-        self.add_link('category', self.plato_successor,
-                      self.plato_bond_category, None,
-                      (self.plato_bond_category.conceptual_depth -
-                       self.plato_successor.conceptual_depth))
-        self.add_link('instance', self.plato_bond_category,
-                      self.plato_successor, None, 100)
-        self.add_link('category', self.plato_sameness,
-                      self.plato_bond_category, None,
-                      (self.plato_bond_category.conceptual_depth -
-                       self.plato_sameness.conceptual_depth))
-        self.add_link('instance', self.plato_bond_category,
-                      self.plato_sameness, None, 100)
-
-        # Group category links
-        self.add_link('category', self.plato_predecessor_group,
-                      self.plato_group_category, None,
-                      (self.plato_group_category.conceptual_depth -
-                       self.plato_predecessor_group.conceptual_depth))
-        self.add_link('instance', self.plato_group_category,
-                      self.plato_predecessor_group, None, 100)
-        self.add_link('category', self.plato_successor_group,
-                      self.plato_group_category, None,
-                      (self.plato_group_category.conceptual_depth -
-                       self.plato_successor_group.conceptual_depth))
-        self.add_link('instance', self.plato_group_category,
-                      self.plato_successor_group, None, 100)
-        self.add_link('category', self.plato_sameness_group,
-                      self.plato_group_category, None,
-                      (self.plato_group_category.conceptual_depth -
-                       self.plato_sameness_group.conceptual_depth))
-        self.add_link('instance', self.plato_group_category,
-                      self.plato_sameness_group, None, 100)
-
-        # Associated group links
-        self.add_link('nonslip', self.plato_sameness, self.plato_sameness_group,
-                      self.plato_group_category, 30)
-        self.add_link('nonslip', self.plato_successor, self.plato_successor_group,
-                      self.plato_group_category, 60)
-        self.add_link('nonslip', self.plato_predecessor,
-                      self.plato_predecessor_group, self.plato_group_category, 60)
-
-        # Associated bond links
-        self.add_link('nonslip', self.plato_sameness_group, self.plato_sameness,
-                      self.plato_bond_category, 90)
-        self.add_link('nonslip', self.plato_successor_group,
-                      self.plato_successor, self.plato_bond_category, 90)
-        self.add_link('nonslip', self.plato_predecessor_group,
-                      self.plato_predecessor, self.plato_bond_category, 90)
-
-        # Bond facet links
-        self.add_link('category', self.plato_letter_category,
-                      self.plato_bond_facet, None,
-                      (self.plato_bond_facet.conceptual_depth -
-                       self.plato_letter_category.conceptual_depth))
-        self.add_link('instance', self.plato_bond_facet,
-                      self.plato_letter_category, None, 100)
-        self.add_link('category', self.plato_length,
-                      self.plato_bond_facet, None,
-                      (self.plato_bond_facet.conceptual_depth -
-                       self.plato_length.conceptual_depth))
-        self.add_link('instance', self.plato_bond_facet,
-                      self.plato_length, None, 100)
-
-        # Letter category links
-        self.add_link('slip', self.plato_letter_category,
-                      self.plato_length, None, 95)
-        self.add_link('slip', self.plato_length,
-                      self.plato_letter_category, None, 95)
-
-        # Letter group links
-        self.add_link('slip', self.plato_letter, self.plato_group, None, 90)
-        self.add_link('slip', self.plato_group, self.plato_letter, None, 90)
-
-        # Direction position, direction neighbor, position neighbor links
-        self.add_link('nonslip', self.plato_left, self.plato_leftmost, None, 90)
-        self.add_link('nonslip', self.plato_leftmost, self.plato_left, None, 90)
-        self.add_link('nonslip', self.plato_right, self.plato_leftmost, None, 100)
-        self.add_link('nonslip', self.plato_leftmost, self.plato_right, None, 100)
-        self.add_link('nonslip', self.plato_right, self.plato_rightmost, None, 90)
-        self.add_link('nonslip', self.plato_rightmost, self.plato_right, None, 90)
-        self.add_link('nonslip', self.plato_left, self.plato_rightmost, None, 100)
-        self.add_link('nonslip', self.plato_rightmost, self.plato_left, None, 100)
-        self.add_link('nonslip', self.plato_leftmost, self.plato_first, None, 100)
-        self.add_link('nonslip', self.plato_first, self.plato_leftmost, None, 100)
-        self.add_link('nonslip', self.plato_rightmost, self.plato_first, None, 100)
-        self.add_link('nonslip', self.plato_first, self.plato_rightmost, None, 100)
-        self.add_link('nonslip', self.plato_leftmost, self.plato_last, None, 100)
-        self.add_link('nonslip', self.plato_last, self.plato_leftmost, None, 100)
-        self.add_link('nonslip', self.plato_rightmost, self.plato_last, None, 100)
-        self.add_link('nonslip', self.plato_last, self.plato_rightmost, None, 100)
-
-        # Other links
-        self.add_link('slip', self.plato_single, self.plato_whole, None, 90)
-        self.add_link('slip', self.plato_whole, self.plato_single, None, 90)
+        self.build(self.definition)
+
+    def build(self, definition):
+        """Add the nodes and links of a compiled definition."""
+        self.clamp_time = definition.clamp_time
+        for i, name in enumerate(definition.names):
+            if definition.short_names[i] != name:
+                name = (name, definition.short_names[i])
+            length = definition.intrinsic_lengths[i]
+            node = self.add_node(name, definition.depths[i],
+                                 list(definition.codelets[i]),
+                                 None if length == -1 else length,
+                                 bool(definition.clamped[i]),
+                                 bool(definition.directed[i]))
+            if definition.testers[i]:
+                node.description_tester = self.bind(*definition.testers[i])
+            if definition.iterators[i]:
+                node.iterate_group = self.bind(definition.iterators[i])
+
+        for attribute, i in definition.attributes.items():
+            setattr(self, attribute, self.slipnodes[i])
+        self.slipnet_letters = [self.slipnodes[i] for i in definition.letters]
+        self.letter_nodes = dict((node.name, node)
+                                 for node in self.slipnet_letters)
+        self.slipnet_numbers = [self.slipnodes[i] for i in definition.numbers]
+        self.number_nodes = dict((node.name, node)
+                                 for node in self.slipnet_numbers)
+
+        for i, kind in enumerate(definition.link_kinds):
+            label = definition.link_labels[i]
+            length = definition.fixed_lengths[i]
+            self.add_link(LINK_KINDS[kind],
+                          self.slipnodes[definition.link_from[i]],
+                          self.slipnodes[definition.link_to[i]],
+                          None if label == -1 else self.slipnodes[label],
+                          None if length == -1 else length)
+
+    def bind(self, name, arguments=()):
+        """Return the named tester or iterator bound to its arguments, and
+        first to the slipnet if it needs it."""
+        tester = testers.TESTERS[name]
+        if name in testers.SLIPNET_TESTERS:
+            arguments = (self,) + tuple(arguments)
+        if arguments:
+            return partial(tester, *arguments)
+        return tester
 
     def add_node(self, name, depth, codelets=[], intrinsic_link_length=None,
                  initially_clamped=False, directed=False):
         slipnode = Slipnode(name, depth, codelets, intrinsic_link_length,
                             initially_clamped, directed)
+        slipnode.index = len(self.slipnodes)
+        slipnode.active_nodes = self.active_nodes
         self.slipnodes.append(slipnode)
+        if codelets:
+            self.codelet_nodes.append(slipnode)
         return slipnode
 
     def add_link(self, kind, from_node, to_node, label, fixed_length):
@@ -462,15 +159,11 @@ class Slipnet(object):
 
     def get_plato_letter(self, character):
         """Given a character, return the corresponding slipnet letter node."""
-        for node in self.slipnet_letters:
-            if node.name == str(character):
-                return node
+        return self.letter_nodes.get(str(character))
 
     def get_plato_number(self, number):
         """Given a numver, return the corresponding slipnet number node."""
-        for node in self.slipnet_numbers:
-            if node.name == str(number):
-                return node
+        return self.number_nodes.get(str(number))
 
     def are_all_opposite_concept_mappings(self, concept_mappings):
         """Return True if all mappings in the list have the label 'opposite'."""
@@ -485,16 +178,20 @@ class Slipnet(object):
             node.category == self.plato_alphabetic_position_category
 
     def update(self):
-        """Update activations and link lenths."""
-        for node in self.slipnodes:
+        """Update activations and link lenths.
+
+        Only the active nodes are visited, in slipnet order; a node without
+        activation, buffered activation or a clamp would be left as it is."""
+        order = attrgetter('index')
+        for node in sorted(self.active_nodes, key=order):
             node.decay()
             if node.is_active():
                 for link in node.outgoing_links():
                     amount_to_spread = round(node.activation * \
                             (link.intrinsic_degree_of_association() / 100.0))
-                    link.to_node.activation_buffer += amount_to_spread
+                    link.to_node.buffer_activation(amount_to_spread)
 
-        for node in self.slipnodes:
+        for node in sorted(self.active_nodes, key=order):
             node.activation = min(100, node.activation + node.activation_buffer)
             if node.clamp:
                 node.activation = 100
@@ -504,30 +201,35 @@ class Slipnet(object):
                     if toolbox.flip_coin(full_activation_probability):
                         node.activation = 100
             node.activation_buffer = 0
+            if not node.activation and not node.clamp:
+                self.active_nodes.discard(node)
 
     def clear(self):
         """Zero out the activations of all slipnodes."""
         for node in self.slipnodes:
             node.activation_buffer = 0
             node.activation = 0
+        self.active_nodes.clear()
+        self.active_nodes.update(node for node in self.slipnodes if node.clamp)
 
     def clamp_initial_nodes(self):
         """Clamp those slipnodes that were marked to be initially clamped."""
         for node in self.slipnodes:
             if node.initially_clamped:
-                node.clamp = True
+                node.set_clamp(True)
 
     def unclamp_initial_nodes(self):
         """Unclamp those slipnodes that were marked to be initially clamped."""
         for node in self.slipnodes:
             if node.initially_clamped:
-                node.clamp = False
+                node.set_clamp(False)
 
     def top_down_codelets(self):
-        """Return a list of codelets attached to active nodes."""
+        """Return a list of codelet classes attached to active nodes, with
+        their arguments and urgencies."""
         codelets = []
-        for node in self.slipnodes:
+        for node in self.codelet_nodes:
             if node.activation >= 50:
-                for codelet in node.codelets:
+                for codelet in node.codelet_types():
                     codelets.append((codelet, [node], node.conceptual_depth / 100.))
         return codelets
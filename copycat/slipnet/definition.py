@@ -0,0 +1,256 @@
+# Copyright (c) 2007-2017 Joseph Hager.
+#
+# Copycat is free software; you can redistribute it and/or modify
+# it under the terms of version 2 of the GNU General Public License,
+# as published by the Free Software Foundation.
+#
+# Copycat is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Copycat; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.
+
+
+"""Slipnet definitions.
+
+A slipnet is defined by a JSON file with its clamp time, a list of nodes and
+a list of links. Each node is an object with:
+
+    name: The node's unique name, which links refer to it by.
+    short_name: An optional shorter name for display.
+    attribute: An optional slipnet attribute naming the node, such as
+        'plato_leftmost'. The program relies on the attributes listed in
+        ATTRIBUTES.
+    list: 'letters' or 'numbers' if the node is one of the slipnet's letters
+        or numbers, which are kept in order.
+    depth: The node's conceptual depth.
+    codelets: An optional list of the names of the codelets posted top down
+        when the node is active.
+    link_length: The intrinsic length of links labeled by the node.
+    initially_clamped: True if the node is clamped at the start of a run.
+    directed: True if the node is directed.
+    tester: The name of a description tester in copycat.slipnet.testers, or
+        a list of its name and the arguments it is bound to.
+    iterate_group: The name of a group iterator in copycat.slipnet.testers.
+
+Each link is a list of its kind ('category', 'instance', 'property', 'slip'
+or 'nonslip'), the names of the nodes it goes from and to, the name of the
+node labeling it or null, and its fixed length or null.
+
+A definition is compiled into arrays indexed by node and link, which can be
+cached on disk under the hash of the file, so a slipnet is built without
+parsing its definition again. Cached definitions are unpickled, so a cache
+directory must be writable only by trusted users; each is stored after a digest
+of its key and data and is compiled again if the digest does not match."""
+
+import hashlib
+import json
+import os
+import pickle
+from array import array
+
+from copycat.slipnet import testers
+
+FORMAT_VERSION = 2
+
+DIGEST_SIZE = 32
+
+DEFINITION = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                          'slipnet.json')
+
+LINK_KINDS = ['category', 'instance', 'property', 'slip', 'nonslip']
+
+ATTRIBUTES = ['plato_leftmost', 'plato_rightmost', 'plato_middle',
+              'plato_single', 'plato_whole', 'plato_first', 'plato_last',
+              'plato_left', 'plato_right', 'plato_predecessor',
+              'plato_successor', 'plato_sameness', 'plato_predecessor_group',
+              'plato_successor_group', 'plato_sameness_group',
+              'plato_identity', 'plato_opposite', 'plato_letter',
+              'plato_group', 'plato_letter_category',
+              'plato_string_position_category',
+              'plato_alphabetic_position_category',
+              'plato_direction_category', 'plato_bond_category',
+              'plato_group_category', 'plato_length', 'plato_object_category',
+              'plato_bond_facet']
+
+_definitions = {}
+
+class Definition(object):
+    """Definition is a compiled slipnet definition.
+
+    Attributes:
+        digest: The sha256 hash of the definition file.
+        clamp_time: The amount of steps to clamp activation in the slipnet.
+        names: The name of each node.
+        short_names: The short name of each node.
+        depths: The conceptual depth of each node.
+        intrinsic_lengths: The intrinsic link length of each node, or -1.
+        clamped: 1 for each node clamped at the start of a run, else 0.
+        directed: 1 for each directed node, else 0.
+        codelets: The codelet names of each node.
+        testers: The (name, arguments) of the description tester of each
+            node, or None.
+        iterators: The name of the group iterator of each node, or None.
+        attributes: A dictionary of slipnet attribute to node index.
+        letters: The indices of the letter nodes.
+        numbers: The indices of the number nodes.
+        link_kinds: The index in LINK_KINDS of the kind of each link.
+        link_from: The index of the node each link goes from.
+        link_to: The index of the node each link goes to.
+        link_labels: The index of the node labeling each link, or -1.
+        fixed_lengths: The fixed length of each link, or -1."""
+
+    def __init__(self, text):
+        """Compile a definition from the text of its JSON file.
+
+        Raise ValueError if the definition refers to a node, link kind,
+        codelet or tester that does not exist, or leaves out a node the
+        program needs."""
+        if not isinstance(text, bytes):
+            text = text.encode('utf-8')
+        self.digest = hashlib.sha256(text).hexdigest()
+        data = json.loads(text.decode('utf-8'))
+        nodes = data['nodes']
+        self.clamp_time = data.get('clamp_time', 50)
+
+        index = {}
+        for i, node in enumerate(nodes):
+            if node['name'] in index:
+                raise ValueError('Duplicate slipnode: %s' % node['name'])
+            index[node['name']] = i
+
+        def find(name):
+            if name not in index:
+                raise ValueError('Unknown slipnode: %s' % name)
+            return index[name]
+
+        self.names = tuple(node['name'] for node in nodes)
+        self.short_names = tuple(node.get('short_name', node['name'])
+                                 for node in nodes)
+        self.depths = array('i', [node['depth'] for node in nodes])
+        self.intrinsic_lengths = array('i', [node.get('link_length', -1)
+                                             for node in nodes])
+        self.clamped = array('b', [bool(node.get('initially_clamped'))
+                                   for node in nodes])
+        self.directed = array('b', [bool(node.get('directed'))
+                                    for node in nodes])
+        self.codelets = tuple(tuple(node.get('codelets', []))
+                              for node in nodes)
+        self.check_codelets(self.codelets)
+        self.testers = tuple(self.compile_tester(node.get('tester'))
+                             for node in nodes)
+        self.iterators = tuple(node.get('iterate_group') for node in nodes)
+        for name in self.iterators:
+            if name is not None and name not in testers.TESTERS:
+                raise ValueError('Unknown group iterator: %s' % name)
+
+        self.attributes = {}
+        for i, node in enumerate(nodes):
+            if 'attribute' in node:
+                self.attributes[node['attribute']] = i
+        missing = [name for name in ATTRIBUTES if name not in self.attributes]
+        if missing:
+            raise ValueError('Slipnet definition is missing nodes for: %s' %
+                             ', '.join(missing))
+        self.letters = array('i', [i for i, node in enumerate(nodes)
+                                   if node.get('list') == 'letters'])
+        self.numbers = array('i', [i for i, node in enumerate(nodes)
+                                   if node.get('list') == 'numbers'])
+
+        links = data['links']
+        for link in links:
+            if link[0] not in LINK_KINDS:
+                raise ValueError('Unknown link kind: %s' % link[0])
+        self.link_kinds = array('b', [LINK_KINDS.index(link[0])
+                                      for link in links])
+        self.link_from = array('i', [find(link[1]) for link in links])
+        self.link_to = array('i', [find(link[2]) for link in links])
+        self.link_labels = array('i', [-1 if link[3] is None else find(link[3])
+                                       for link in links])
+        self.fixed_lengths = array('i', [-1 if link[4] is None else link[4]
+                                         for link in links])
+
+    @staticmethod
+    def check_codelets(codelets):
+        """Raise ValueError if any of the nodes' codelets is not a codelet.
+
+        The codelets are imported here rather than with this module, since
+        they cannot be imported by the slipnet when it is imported."""
+        import copycat.coderack.codelets
+        from copycat.coderack import Codelet
+        for names in codelets:
+            for name in names:
+                codelet = getattr(copycat.coderack.codelets, name, None)
+                if not (isinstance(codelet, type) and
+                        issubclass(codelet, Codelet)):
+                    raise ValueError('Unknown codelet: %s' % name)
+
+    def compile_tester(self, tester):
+        """Return the (name, arguments) of a node's description tester."""
+        if tester is None:
+            return None
+        if isinstance(tester, list):
+            name, arguments = tester[0], tuple(tester[1:])
+        else:
+            name, arguments = tester, ()
+        if name not in testers.TESTERS:
+            raise ValueError('Unknown description tester: %s' % name)
+        return name, arguments
+
+    def to_bytes(self):
+        """Return the compiled definition as bytes."""
+        return pickle.dumps(self, pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Return a compiled definition from bytes made by to_bytes.
+
+        The bytes are unpickled, so they must come from a trusted source."""
+        return pickle.loads(data)
+
+    @classmethod
+    def load(cls, path=None, directory=None):
+        """Return the compiled definition in the file at path, or of the
+        standard slipnet if there is none.
+
+        Definitions are kept once compiled, and if a cache directory is given
+        they are also loaded from it and saved there, under the hash of the
+        file."""
+        with open(path or DEFINITION, 'rb') as source:
+            text = source.read()
+        key = hashlib.sha256(text).hexdigest()
+        if key in _definitions:
+            return _definitions[key]
+        if directory is None:
+            definition = cls(text)
+        else:
+            definition = cls.cached(text, key, directory)
+        _definitions[key] = definition
+        return definition
+
+    @classmethod
+    def cached(cls, text, key, directory):
+        """Return the compiled definition from the cache directory, compiling
+        and saving it there if it is not already."""
+        path = os.path.join(directory, '%s.%d.slipnet' % (key, FORMAT_VERSION))
+        try:
+            with open(path, 'rb') as cache:
+                data = cache.read()
+            digest, data = data[:DIGEST_SIZE], data[DIGEST_SIZE:]
+            if digest == hashlib.sha256(key.encode() + data).digest():
+                return cls.from_bytes(data)
+        except (IOError, OSError, EOFError, pickle.UnpicklingError):
+            pass
+        definition = cls(text)
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        temporary = '%s.%d' % (path, os.getpid())
+        data = definition.to_bytes()
+        with open(temporary, 'wb') as cache:
+            cache.write(hashlib.sha256(key.encode() + data).digest() + data)
+        os.rename(temporary, path)
+        return definition
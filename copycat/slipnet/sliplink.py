@@ -25,6 +25,8 @@ class Sliplink(object):
         label: The node that labels this link.
         fixed_length: A static length of the link has no label."""
 
+    __slots__ = ('from_node', 'to_node', 'label', 'fixed_length')
+
     def __init__(self, from_node, to_node, label, fixed_length):
         """Initializes Sliplink."""
         self.from_node = from_node
@@ -23,15 +23,19 @@ class Slipnode(object):
 
     Attributes:
         name: A unique string name.
+        index: The position of the node in its slipnet.
         conceptual_depth: A built in, given value based on perceived depth.
         initially_clamped: A boolean whether to clamp at the start of a run.
         directed:
         codelets: A list of codelet types attached to this node.
+        codelet_classes: The classes of the codelet types, once looked up.
         clamp: A boolean that when True, activation is clamped to 100.
         intrinsic_link_length: The intrinsic length of links labeled by the node.
         shrunk_link_length: .4 of the intrinsic link length.
         activation: An integer between 0-100.
         activation_buffer: A buffer for storing activation between updates.
+        active_nodes: The set of its slipnet's nodes with activation, buffered
+            activation or a clamp, which the node adds itself to.
         category_links:
         instance_links:
         has_property_links:
@@ -41,6 +45,16 @@ class Slipnode(object):
         description_tester: Function testing for descriptor possibility.
         iterate_group: Function used to iterate group nodes."""
 
+    __slots__ = ('name', 'short_name', 'index', 'conceptual_depth',
+                 'initially_clamped', 'directed', 'codelets',
+                 'codelet_classes', 'clamp',
+                 'intrinsic_link_length', 'shrunk_link_length',
+                 'activation', 'activation_buffer', 'active_nodes',
+                 'category_links',
+                 'instance_links', 'has_property_links',
+                 'lateral_slip_links', 'lateral_nonslip_links',
+                 'incoming_links', 'description_tester', 'iterate_group')
+
     def __init__(self, name, depth, codelets=[], intrinsic_link_length=None,
                  initially_clamped=False, directed=False):
         """Initialize Slipnode."""
@@ -50,10 +64,12 @@ class Slipnode(object):
         else:
             self.name = name
             self.short_name = name
+        self.index = None
         self.conceptual_depth = depth
         self.initially_clamped = initially_clamped
         self.directed = directed
         self.codelets = codelets
+        self.codelet_classes = None
         self.clamp = False
         self.intrinsic_link_length = intrinsic_link_length
         if intrinsic_link_length != None:
@@ -63,6 +79,7 @@ class Slipnode(object):
 
         self.activation = 0
         self.activation_buffer = 0
+        self.active_nodes = None
 
         self.category_links = []
         self.instance_links = []
@@ -74,6 +91,17 @@ class Slipnode(object):
         self.description_tester = None
         self.iterate_group = None
 
+    def codelet_types(self):
+        """Return the classes of the codelet types attached to this node.
+
+        They are looked up by name the first time, since the codelets cannot
+        be imported by the slipnet when it is imported."""
+        if self.codelet_classes is None:
+            import copycat.coderack.codelets
+            self.codelet_classes = [getattr(copycat.coderack.codelets, name)
+                                    for name in self.codelets]
+        return self.codelet_classes
+
     def are_related(self, other_node):
         """Return True if the two nodes are equal or are linked."""
         return self == other_node or self.are_linked(other_node)
@@ -185,6 +213,19 @@ class Slipnode(object):
                 return slippage.descriptor2
         return self
 
+    def buffer_activation(self, amount):
+        """Add an amount of activation to the buffer, to be taken up at the
+        next update."""
+        self.activation_buffer += amount
+        if self.active_nodes is not None:
+            self.active_nodes.add(self)
+
+    def set_clamp(self, clamp):
+        """Clamp or unclamp the node's activation."""
+        self.clamp = clamp
+        if clamp and self.active_nodes is not None:
+            self.active_nodes.add(self)
+
     def decay(self):
         """Remove 100 - conceptual_depth percent of the node's activation."""
         amount = round(((100 - self.conceptual_depth) / 100.0) * self.activation)
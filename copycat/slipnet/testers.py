@@ -0,0 +1,86 @@
+# Copyright (c) 2007-2017 Joseph Hager.
+#
+# Copycat is free software; you can redistribute it and/or modify
+# it under the terms of version 2 of the GNU General Public License,
+# as published by the Free Software Foundation.
+#
+# Copycat is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Copycat; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.
+
+"""Description testers and group iterators for slipnodes.
+
+These are module level functions, bound to their slipnet or length with
+functools.partial, so that a slipnet can be pickled. Slipnet definitions name
+them as they are named in TESTERS; those in SLIPNET_TESTERS are bound to the
+slipnet before any other arguments."""
+
+def has_length(length, obj):
+    """Return True if the object is a group of the given length."""
+    return obj.type_name == 'group' and obj.length() == length
+
+def is_leftmost(obj):
+    """Return True if the object is leftmost but not the whole string."""
+    return not obj.spans_whole_string() and obj.is_leftmost_in_string()
+
+def is_rightmost(obj):
+    """Return True if the object is rightmost but not the whole string."""
+    return not obj.spans_whole_string() and obj.is_rightmost_in_string()
+
+def is_middle(obj):
+    """Return True if the object is between the leftmost and rightmost."""
+    left = obj.ungrouped_left_neighbor()
+    right = obj.ungrouped_right_neighbor()
+    return (left and right and left.is_leftmost_in_string() and
+            right.is_rightmost_in_string())
+
+def is_single(obj):
+    """Return True if the object is a letter spanning the whole string."""
+    return obj.type_name == 'letter' and obj.spans_whole_string()
+
+def is_whole(obj):
+    """Return True if the object is a group spanning the whole string."""
+    return obj.type_name == 'group' and obj.spans_whole_string()
+
+def is_first(slipnet, obj):
+    """Return True if the object's letter category is the first letter."""
+    return (obj.get_descriptor(slipnet.plato_letter_category) ==
+            slipnet.slipnet_letters[0])
+
+def is_last(slipnet, obj):
+    """Return True if the object's letter category is the last letter."""
+    return (obj.get_descriptor(slipnet.plato_letter_category) ==
+            slipnet.slipnet_letters[len(slipnet.slipnet_letters) - 1])
+
+def is_letter(obj):
+    """Return True if the object is a letter."""
+    return obj.type_name == 'letter'
+
+def is_group(obj):
+    """Return True if the object is a group."""
+    return obj.type_name == 'group'
+
+def next_predecessor(slipnet, category):
+    """Return the category before the given one in a predecessor group."""
+    return slipnet.get_related_node(category, slipnet.plato_predecessor)
+
+def next_successor(slipnet, category):
+    """Return the category after the given one in a successor group."""
+    return slipnet.get_related_node(category, slipnet.plato_successor)
+
+def next_same(category):
+    """Return the given category, which repeats in a sameness group."""
+    return category
+
+TESTERS = dict((tester.__name__, tester) for tester in
+               [has_length, is_leftmost, is_rightmost, is_middle, is_single,
+                is_whole, is_first, is_last, is_letter, is_group,
+                next_predecessor, next_successor, next_same])
+
+SLIPNET_TESTERS = ['is_first', 'is_last', 'next_predecessor', 'next_successor']
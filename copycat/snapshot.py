@@ -0,0 +1,627 @@
+# Copyright (c) 2007-2017 Joseph Hager.
+#
+# Copycat is free software; you can redistribute it and/or modify
+# it under the terms of version 2 of the GNU General Public License,
+# as published by the Free Software Foundation.
+#
+# Copycat is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Copycat; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.
+
+"""Compact binary snapshots of the observable state of a run.
+
+A Snapshotter watches a run and encodes its state as a sequence of tagged
+sections. The first snapshot holds the whole state; each later one holds only
+what changed since the previous snapshot, found from the workspace's events
+rather than by walking the workspace. A SnapshotReader applies a sequence of
+snapshots to rebuild the state as plain Python values.
+
+For example:
+
+    snapshotter = Snapshotter(run)
+    reader = SnapshotReader()
+    while not run.workspace.answer_string:
+        run.step()
+        state = reader.read(snapshotter.snapshot())"""
+
+import struct
+
+import copycat.coderack.codelets
+from copycat.workspace import events, Bond, Correspondence, Group, Letter
+
+MAGIC = b'CCS'
+FORMAT_VERSION = 3
+
+FULL = 0
+DELTA = 1
+
+# Section tags.
+TIME = b't'
+TEMPERATURE = b'T'
+NODE_NAMES = b'K'
+CODELET_NAMES = b'Y'
+STRINGS = b'S'
+ACTIVATIONS = b'N'
+CODERACK = b'C'
+OBJECTS = b'O'
+DESCRIPTIONS = b'D'
+BONDS_ADDED = b'B'
+BONDS_REMOVED = b'b'
+GROUPS_ADDED = b'G'
+GROUPS_REMOVED = b'g'
+CORRESPONDENCES_ADDED = b'R'
+CORRESPONDENCES_REMOVED = b'r'
+RULE = b'U'
+TRANSLATED_RULE = b'V'
+END = b'.'
+
+# String codes.
+INITIAL = 0
+MODIFIED = 1
+TARGET = 2
+ANSWER = 3
+
+CODELET_NAMES_LIST = sorted(name for name in dir(copycat.coderack.codelets)
+                            if isinstance(getattr(copycat.coderack.codelets, name),
+                                          type))
+
+# The code of each codelet name, its index in CODELET_NAMES_LIST.
+CODELET_CODES = dict((name, code)
+                     for code, name in enumerate(CODELET_NAMES_LIST))
+
+class Writer(object):
+    """Writer appends encoded values to a byte array.
+
+    Integers are written as unsigned variable length integers, seven bits to a
+    byte. Strings are written as their UTF-8 length and bytes.
+
+    Attributes:
+        data: The bytes written so far."""
+
+    def __init__(self):
+        """Initialize Writer."""
+        self.data = bytearray()
+
+    def tag(self, tag):
+        """Write a section tag."""
+        self.data.extend(tag)
+
+    def integer(self, value):
+        """Write a non-negative integer."""
+        while value > 0x7f:
+            self.data.append((value & 0x7f) | 0x80)
+            value >>= 7
+        self.data.append(value)
+
+    def real(self, value):
+        """Write a real number as a 32 bit float."""
+        self.data.extend(struct.pack('<f', value))
+
+    def text(self, value):
+        """Write a string."""
+        encoded = value.encode('utf-8')
+        self.integer(len(encoded))
+        self.data.extend(encoded)
+
+
+class Reader(object):
+    """Reader reads values written by a Writer.
+
+    Attributes:
+        data: The bytes being read.
+        position: The index of the next byte to read."""
+
+    def __init__(self, data):
+        """Initialize Reader."""
+        self.data = bytes(data)
+        self.position = 0
+
+    def tag(self):
+        """Read a section tag."""
+        tag = self.data[self.position:self.position + 1]
+        self.position += 1
+        return tag
+
+    def integer(self):
+        """Read a non-negative integer."""
+        value = 0
+        shift = 0
+        while True:
+            byte = self.data[self.position]
+            self.position += 1
+            value |= (byte & 0x7f) << shift
+            if byte < 0x80:
+                return value
+            shift += 7
+
+    def real(self):
+        """Read a 32 bit float."""
+        value = struct.unpack_from('<f', self.data, self.position)[0]
+        self.position += 4
+        return value
+
+    def text(self):
+        """Read a string."""
+        length = self.integer()
+        value = self.data[self.position:self.position + length].decode('utf-8')
+        self.position += length
+        return value
+
+
+class Snapshotter(object):
+    """Snapshotter encodes the observable state of a run.
+
+    Workspace objects and structures are given small integer ids the first
+    time they are written, and later snapshots refer to them by id. Built and
+    broken structures and new descriptions are collected from workspace events
+    between snapshots.
+
+    Attributes:
+        run: The run being watched.
+        ids: A dictionary of object id to (object, snapshot id).
+        next_id: The next snapshot id to give out.
+        added: A dictionary of object id to structures built since the last
+            snapshot.
+        removed: A dictionary of object id to structures broken since the
+            last snapshot.
+        descriptions: Descriptions built since the last snapshot.
+        strings: The string names written in the last snapshot.
+        activations: A dictionary of slipnode index to activation for the
+            nodes that had activation at the last snapshot.
+        coderack: A dictionary of codelet type name to the number of that
+            type on the coderack at the last snapshot.
+        rules: The rule texts written in the last snapshot.
+        temperature: The temperature written in the last snapshot.
+        declared: Ids of the objects declared in the snapshot being written,
+            whose descriptions are part of their declarations.
+        started: True once the full snapshot has been written."""
+
+    def __init__(self, run):
+        """Initialize Snapshotter."""
+        self.run = run
+        self.ids = {}
+        self.next_id = 0
+        self.added = {}
+        self.removed = {}
+        self.descriptions = []
+        self.strings = None
+        self.activations = None
+        self.coderack = None
+        self.rules = (None, None)
+        self.temperature = None
+        self.declared = set()
+        self.started = False
+        run.workspace.subscribe(self.on_event, [events.BOND_BUILT,
+                                                events.BOND_BROKEN,
+                                                events.GROUP_BUILT,
+                                                events.GROUP_BROKEN,
+                                                events.CORRESPONDENCE_BUILT,
+                                                events.CORRESPONDENCE_BROKEN,
+                                                events.DESCRIPTION_BUILT])
+
+    def close(self):
+        """Stop watching the run."""
+        self.run.workspace.unsubscribe(self.on_event)
+
+    def on_event(self, kind, subject):
+        """Record a structure that was built or broken, or a new
+        description."""
+        if kind == events.DESCRIPTION_BUILT:
+            self.descriptions.append(subject)
+        elif kind in (events.BOND_BUILT, events.GROUP_BUILT,
+                      events.CORRESPONDENCE_BUILT):
+            if self.removed.pop(id(subject), None) is None:
+                self.added[id(subject)] = subject
+        elif self.added.pop(id(subject), None) is None:
+            self.removed[id(subject)] = subject
+
+    def snapshot(self):
+        """Return the bytes of the next snapshot."""
+        writer = Writer()
+        workspace = self.run.workspace
+        writer.data.extend(MAGIC)
+        writer.integer(FORMAT_VERSION)
+        writer.integer(DELTA if self.started else FULL)
+        writer.tag(TIME)
+        writer.integer(self.run.coderack.time)
+
+        if not self.started:
+            self.write_names(writer)
+            self.added = {}
+            self.removed = {}
+            self.descriptions = []
+            added = workspace.bonds() + workspace.groups() + \
+                    workspace.correspondences()
+            removed = []
+            objects = workspace.objects()
+        else:
+            added = list(self.added.values())
+            removed = list(self.removed.values())
+            objects = []
+            self.added = {}
+            self.removed = {}
+
+        if workspace.temperature != self.temperature:
+            self.temperature = workspace.temperature
+            writer.tag(TEMPERATURE)
+            writer.real(self.temperature)
+        self.write_strings(writer)
+        self.write_activations(writer)
+        self.write_coderack(writer)
+
+        new_objects = Writer()
+        self.declared = set()
+        for obj in objects:
+            self.object_id(obj, new_objects)
+        structures = Writer()
+        self.write_removed(structures, removed)
+        self.write_added(structures, added, new_objects)
+        descriptions = Writer()
+        self.write_descriptions(descriptions, new_objects)
+        if new_objects.data:
+            writer.tag(OBJECTS)
+            writer.integer(len(self.declared))
+            writer.data.extend(new_objects.data)
+        writer.data.extend(descriptions.data)
+        writer.data.extend(structures.data)
+
+        self.write_rules(writer)
+        writer.tag(END)
+        self.started = True
+        return bytes(writer.data)
+
+    def write_names(self, writer):
+        """Write the tables of slipnode and codelet names."""
+        writer.tag(NODE_NAMES)
+        writer.integer(len(self.run.slipnet.slipnodes))
+        for node in self.run.slipnet.slipnodes:
+            writer.text(node.name)
+        writer.tag(CODELET_NAMES)
+        writer.integer(len(CODELET_NAMES_LIST))
+        for name in CODELET_NAMES_LIST:
+            writer.text(name)
+
+    def write_strings(self, writer):
+        """Write the string names if they changed."""
+        workspace = self.run.workspace
+        strings = [workspace.initial_string.name, workspace.modified_string.name,
+                   workspace.target_string.name]
+        if workspace.answer_string:
+            strings.append(workspace.answer_string.name)
+        if strings != self.strings:
+            self.strings = strings
+            writer.tag(STRINGS)
+            writer.integer(len(strings))
+            for name in strings:
+                writer.text(name)
+
+    def write_activations(self, writer):
+        """Write the slipnode activations that changed as (node, activation)
+        pairs.
+
+        The full snapshot writes every node. Activations only change in the
+        slipnet's update of its active nodes, so later snapshots only look at
+        the nodes active now and those that had activation at the last
+        snapshot."""
+        slipnet = self.run.slipnet
+        if self.activations is None:
+            nodes = slipnet.slipnodes
+            previous = None
+        else:
+            nodes = dict((node.index, node) for node in slipnet.active_nodes)
+            for index in self.activations:
+                nodes[index] = slipnet.slipnodes[index]
+            nodes = [nodes[index] for index in sorted(nodes)]
+            previous = self.activations
+        self.activations = activations = {}
+        changed = []
+        for node in nodes:
+            activation = int(node.activation)
+            if previous is None or activation != previous.get(node.index, 0):
+                changed.append((node.index, activation))
+            if activation:
+                activations[node.index] = activation
+        if changed:
+            writer.tag(ACTIVATIONS)
+            writer.integer(len(changed))
+            for index, activation in changed:
+                writer.integer(index)
+                writer.integer(activation)
+
+    def write_coderack(self, writer):
+        """Write the number of codelets of each type on the coderack, as
+        (codelet, count) pairs for the types whose number changed.
+
+        The numbers are those the coderack's telemetry keeps as codelets come
+        and go."""
+        counts = self.run.coderack.telemetry.on_rack
+        previous = self.coderack or {}
+        changed = [(CODELET_CODES[name], counts.get(name, 0))
+                   for name in set(counts) | set(previous)
+                   if counts.get(name, 0) != previous.get(name, 0)]
+        self.coderack = dict((name, count)
+                             for name, count in counts.items() if count)
+        if changed:
+            writer.tag(CODERACK)
+            writer.integer(len(changed))
+            for code, count in sorted(changed):
+                writer.integer(code)
+                writer.integer(count)
+
+    def write_rules(self, writer):
+        """Write the rule and translated rule if they changed."""
+        workspace = self.run.workspace
+        rules = (workspace.rule, workspace.translated_rule)
+        for tag, rule, previous in zip([RULE, TRANSLATED_RULE], rules, self.rules):
+            if rule is not previous:
+                writer.tag(tag)
+                writer.text(rule.to_string() if rule else '')
+        self.rules = rules
+
+    def write_removed(self, writer, structures):
+        """Write the ids of broken structures."""
+        sections = [(BONDS_REMOVED, Bond), (GROUPS_REMOVED, Group),
+                    (CORRESPONDENCES_REMOVED, Correspondence)]
+        for tag, kind in sections:
+            ids = []
+            for structure in structures:
+                if isinstance(structure, kind):
+                    entry = self.ids.pop(id(structure), None)
+                    if entry:
+                        ids.append(entry[1])
+            if ids:
+                writer.tag(tag)
+                writer.integer(len(ids))
+                for structure_id in ids:
+                    writer.integer(structure_id)
+
+    def write_added(self, writer, structures, objects):
+        """Write newly built structures, declaring any objects they refer to
+        in objects."""
+        bonds = [s for s in structures if isinstance(s, Bond)]
+        groups = [s for s in structures if isinstance(s, Group)]
+        correspondences = [s for s in structures
+                           if isinstance(s, Correspondence)]
+        if groups:
+            writer.tag(GROUPS_ADDED)
+            writer.integer(len(groups))
+            for group in groups:
+                writer.integer(self.object_id(group, objects))
+        if bonds:
+            writer.tag(BONDS_ADDED)
+            writer.integer(len(bonds))
+            for bond in bonds:
+                writer.integer(self.new_id(bond))
+                writer.integer(self.object_id(bond.from_object, objects))
+                writer.integer(self.object_id(bond.to_object, objects))
+                writer.integer(self.node_code(bond.bond_category))
+                writer.integer(self.node_code(bond.bond_facet))
+                writer.integer(self.node_code(bond.direction_category))
+        if correspondences:
+            writer.tag(CORRESPONDENCES_ADDED)
+            writer.integer(len(correspondences))
+            for correspondence in correspondences:
+                writer.integer(self.new_id(correspondence))
+                writer.integer(self.object_id(correspondence.object1, objects))
+                writer.integer(self.object_id(correspondence.object2, objects))
+                mappings = correspondence.get_concept_mappings()
+                writer.integer(len(mappings))
+                for mapping in mappings:
+                    writer.integer(self.node_code(mapping.description_type1))
+                    writer.integer(self.node_code(mapping.descriptor1))
+                    writer.integer(self.node_code(mapping.descriptor2))
+
+    def write_descriptions(self, writer, objects):
+        """Write descriptions built since the last snapshot, leaving out
+        those of groups that have been broken since."""
+        descriptions = [d for d in self.descriptions
+                        if not d.is_bond_description() and
+                        id(d.object) in self.ids and
+                        id(d.object) not in self.declared]
+        self.descriptions = []
+        if descriptions:
+            writer.tag(DESCRIPTIONS)
+            writer.integer(len(descriptions))
+            for description in descriptions:
+                writer.integer(self.object_id(description.object, objects))
+                writer.integer(self.node_code(description.description_type))
+                writer.integer(self.node_code(description.descriptor))
+
+    def new_id(self, structure):
+        """Give the structure a snapshot id and return it."""
+        structure_id = self.next_id
+        self.next_id += 1
+        self.ids[id(structure)] = (structure, structure_id)
+        return structure_id
+
+    def object_id(self, obj, writer):
+        """Return the snapshot id of a letter or group, writing its
+        declaration to the given writer if it has not been written before.
+
+        A declaration is the object's id, string code, kind (0 for a letter, 1
+        for a group) and letter positions, followed by the letter's name or by
+        the group's category, direction and members, and then the object's
+        descriptions."""
+        entry = self.ids.get(id(obj))
+        if entry and entry[0] is obj:
+            return entry[1]
+        if isinstance(obj, Group):
+            members = [self.object_id(member, writer) for member in obj.objects]
+        object_id = self.new_id(obj)
+        self.declared.add(id(obj))
+        writer.integer(object_id)
+        writer.integer(self.string_code(obj.string))
+        writer.integer(0 if isinstance(obj, Letter) else 1)
+        writer.integer(obj.left_string_position)
+        writer.integer(obj.right_string_position)
+        if isinstance(obj, Letter):
+            writer.text(obj.name)
+        else:
+            writer.integer(self.node_code(obj.group_category))
+            writer.integer(self.node_code(obj.direction_category))
+            writer.integer(len(members))
+            for member in members:
+                writer.integer(member)
+        writer.integer(len(obj.descriptions))
+        for description in obj.descriptions:
+            writer.integer(self.node_code(description.description_type))
+            writer.integer(self.node_code(description.descriptor))
+        return object_id
+
+    def string_code(self, string):
+        """Return the code of the given workspace string."""
+        workspace = self.run.workspace
+        strings = [workspace.initial_string, workspace.modified_string,
+                   workspace.target_string]
+        for code, other in enumerate(strings):
+            if string is other:
+                return code
+        return ANSWER
+
+    def node_code(self, node):
+        """Return one more than the index of the slipnode, or 0 for None."""
+        if node is None:
+            return 0
+        return node.index + 1
+
+
+class SnapshotReader(object):
+    """SnapshotReader rebuilds the state of a run from its snapshots.
+
+    Attributes:
+        state: A dictionary holding the time, temperature, strings, slipnode
+            activations, coderack composition, objects, bonds, groups,
+            correspondences, rule and translated rule, with slipnodes and
+            codelets given by name.
+        node_names: The slipnode names from the full snapshot.
+        codelet_names: The codelet names from the full snapshot."""
+
+    def __init__(self):
+        """Initialize SnapshotReader."""
+        self.state = None
+        self.node_names = []
+        self.codelet_names = []
+
+    def read(self, data):
+        """Apply a snapshot to the state and return the state."""
+        reader = Reader(data)
+        if reader.data[:3] != MAGIC:
+            raise ValueError('Not a copycat snapshot.')
+        reader.position = 3
+        if reader.integer() != FORMAT_VERSION:
+            raise ValueError('Unsupported snapshot version.')
+        if reader.integer() == FULL:
+            self.state = {'time': 0, 'temperature': 0, 'strings': [],
+                          'activations': {}, 'coderack': {}, 'objects': {},
+                          'bonds': {}, 'groups': set(), 'correspondences': {},
+                          'rule': None, 'translated_rule': None}
+        elif self.state is None:
+            raise ValueError('A full snapshot must be read first.')
+        state = self.state
+
+        while True:
+            tag = reader.tag()
+            if tag == END:
+                return state
+            elif tag == TIME:
+                state['time'] = reader.integer()
+            elif tag == TEMPERATURE:
+                state['temperature'] = reader.real()
+            elif tag == NODE_NAMES:
+                self.node_names = [reader.text() for _ in range(reader.integer())]
+            elif tag == CODELET_NAMES:
+                self.codelet_names = [reader.text()
+                                      for _ in range(reader.integer())]
+            elif tag == STRINGS:
+                state['strings'] = [reader.text() for _ in range(reader.integer())]
+            elif tag == ACTIVATIONS:
+                for _ in range(reader.integer()):
+                    name = self.node_names[reader.integer()]
+                    state['activations'][name] = reader.integer()
+            elif tag == CODERACK:
+                for _ in range(reader.integer()):
+                    name = self.codelet_names[reader.integer()]
+                    count = reader.integer()
+                    if count:
+                        state['coderack'][name] = count
+                    else:
+                        state['coderack'].pop(name, None)
+            elif tag == OBJECTS:
+                self.read_objects(reader)
+            elif tag == DESCRIPTIONS:
+                for _ in range(reader.integer()):
+                    obj = state['objects'][reader.integer()]
+                    obj['descriptions'].append((self.node(reader),
+                                                self.node(reader)))
+            elif tag == GROUPS_ADDED:
+                for _ in range(reader.integer()):
+                    state['groups'].add(reader.integer())
+            elif tag == BONDS_ADDED:
+                for _ in range(reader.integer()):
+                    bond_id = reader.integer()
+                    state['bonds'][bond_id] = {
+                        'from_object': reader.integer(),
+                        'to_object': reader.integer(),
+                        'bond_category': self.node(reader),
+                        'bond_facet': self.node(reader),
+                        'direction_category': self.node(reader)}
+            elif tag == CORRESPONDENCES_ADDED:
+                for _ in range(reader.integer()):
+                    correspondence_id = reader.integer()
+                    object1 = reader.integer()
+                    object2 = reader.integer()
+                    mappings = [(self.node(reader), self.node(reader),
+                                 self.node(reader))
+                                for _ in range(reader.integer())]
+                    state['correspondences'][correspondence_id] = {
+                        'object1': object1, 'object2': object2,
+                        'concept_mappings': mappings}
+            elif tag == BONDS_REMOVED:
+                for _ in range(reader.integer()):
+                    state['bonds'].pop(reader.integer(), None)
+            elif tag == GROUPS_REMOVED:
+                for _ in range(reader.integer()):
+                    group_id = reader.integer()
+                    state['groups'].discard(group_id)
+                    state['objects'].pop(group_id, None)
+            elif tag == CORRESPONDENCES_REMOVED:
+                for _ in range(reader.integer()):
+                    state['correspondences'].pop(reader.integer(), None)
+            elif tag == RULE:
+                state['rule'] = reader.text() or None
+            elif tag == TRANSLATED_RULE:
+                state['translated_rule'] = reader.text() or None
+            else:
+                raise ValueError('Unknown snapshot section %r.' % tag)
+
+    def read_objects(self, reader):
+        """Read the number of object declarations and then each of them."""
+        for _ in range(reader.integer()):
+            object_id = reader.integer()
+            obj = {'string': reader.integer(),
+                   'kind': 'letter' if reader.integer() == 0 else 'group',
+                   'left_string_position': reader.integer(),
+                   'right_string_position': reader.integer()}
+            if obj['kind'] == 'letter':
+                obj['name'] = reader.text()
+            else:
+                obj['group_category'] = self.node(reader)
+                obj['direction_category'] = self.node(reader)
+                obj['objects'] = [reader.integer()
+                                  for _ in range(reader.integer())]
+            obj['descriptions'] = [(self.node(reader), self.node(reader))
+                                   for _ in range(reader.integer())]
+            self.state['objects'][object_id] = obj
+
+    def node(self, reader):
+        """Read a slipnode code and return the node's name, or None."""
+        code = reader.integer()
+        if code == 0:
+            return None
+        return self.node_names[code - 1]
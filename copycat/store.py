@@ -0,0 +1,98 @@
+# Copyright (c) 2007-2017 Joseph Hager.
+#
+# Copycat is free software; you can redistribute it and/or modify
+# it under the terms of version 2 of the GNU General Public License,
+# as published by the Free Software Foundation.
+#
+# Copycat is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Copycat; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.
+
+
+"""An on-disk store of the results of runs.
+
+A run is a pure function of its problem, its seed, the parameters it was run
+with and the engine that ran it, so its result only ever has to be worked
+out once. The store keeps results in an SQLite database under all of those,
+the engine being identified by problem.engine_hash(), so that a change to
+the engine never returns a result it did not make."""
+
+import sqlite3
+
+from copycat.problem import engine_hash
+
+FORMAT_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    initial TEXT NOT NULL,
+    modified TEXT NOT NULL,
+    target TEXT NOT NULL,
+    seed INTEGER NOT NULL,
+    config TEXT NOT NULL,
+    engine TEXT NOT NULL,
+    status TEXT NOT NULL,
+    answer TEXT,
+    temperature NUMERIC,
+    steps INTEGER,
+    snags INTEGER,
+    error TEXT,
+    PRIMARY KEY (initial, modified, target, seed, config, engine)
+)"""
+
+# The result fields kept beside the key of each run.
+VALUES = ['status', 'answer', 'temperature', 'steps', 'snags', 'error']
+
+def config_key(**parameters):
+    """Return a key of the parameters a run was made with."""
+    return repr((FORMAT_VERSION, sorted(parameters.items())))
+
+class Store(object):
+    """Store
+
+    Attributes:
+        path: The path of the SQLite database.
+        connection: The connection to the database.
+        engine: The hash of the engine whose results are looked up and
+            kept."""
+
+    def __init__(self, path, engine=None):
+        """Initialize Store, creating the database if there is none."""
+        self.path = path
+        self.engine = engine or engine_hash()
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(SCHEMA)
+        self.connection.commit()
+
+    def get(self, initial, modified, target, seed, config):
+        """Return a dictionary of the stored VALUES of a run, or None if it
+        has not been stored."""
+        row = self.connection.execute(
+            'SELECT %s FROM results WHERE initial = ? AND modified = ? AND '
+            'target = ? AND seed = ? AND config = ? AND engine = ?' %
+            ', '.join(VALUES),
+            (initial, modified, target, seed, config, self.engine)).fetchone()
+        if row is None:
+            return None
+        return dict(zip(VALUES, row))
+
+    def put_many(self, runs):
+        """Keep a list of (initial, modified, target, seed, config, values)
+        runs, where values is a dictionary of their VALUES."""
+        self.connection.executemany(
+            'INSERT OR REPLACE INTO results VALUES (%s)' %
+            ', '.join(['?'] * (6 + len(VALUES))),
+            [(initial, modified, target, seed, config, self.engine) +
+             tuple(values[name] for name in VALUES)
+             for initial, modified, target, seed, config, values in runs])
+        self.connection.commit()
+
+    def close(self):
+        """Close the database."""
+        self.connection.close()
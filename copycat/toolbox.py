@@ -16,8 +16,10 @@
 
 """Toolbox of utility functions."""
 
+import bisect
 import math
 import random
+from collections.abc import ValuesView
 
 def weighted_average(weights, values):
     """Return the weighted arithmetic mean of arguments."""
@@ -28,6 +30,7 @@ def weighted_average(weights, values):
 def weighted_index(weights):
     """Probabilistically chooses one of the weights by value, returning its
     index."""
+    weights = list(weights)
     total = sum(weights)
     if total <= 0:
         return random.randint(0, len(weights) - 1)
@@ -45,6 +48,34 @@ def weighted_select(weights, items):
     if items:
         return items[weighted_index(weights)]
 
+class WeightedSampler(object):
+    """WeightedSampler chooses items by weight as weighted_select does, with
+    the running totals of the weights worked out once so that each choice is
+    a binary search.
+
+    Attributes:
+        items: The items to choose from.
+        totals: The running totals of the weights of the items.
+        total: The sum of the weights."""
+
+    def __init__(self, weights, items):
+        """Initialize WeightedSampler."""
+        self.items = list(items)
+        self.totals = []
+        self.total = 0
+        for weight in weights:
+            self.total += weight
+            self.totals.append(self.total)
+
+    def choose(self):
+        """Return one of the items probabilistically by weight."""
+        if not self.items:
+            return
+        if self.total <= 0:
+            return self.items[random.randint(0, len(self.items) - 1)]
+        value = random.randint(0, self.total - 1)
+        return self.items[bisect.bisect_right(self.totals, value)]
+
 def select_assoc(assoc_list):
     """Returns one of the items, chosen probabilistically.
 
@@ -67,7 +98,7 @@ def select_assoc(assoc_list):
 
 def flatten(sequence):
     """Flattens a sequence so that it has no nested structure."""
-    if isinstance(sequence, list):
+    if isinstance(sequence, (list, ValuesView)):
         return sum(map(flatten, sequence), [])
     else:
         return [sequence]
@@ -19,7 +19,8 @@
 import math
 import random
 import copycat.toolbox as toolbox
-from copycat.workspace.structure import Structure
+from copycat.errors import UnsupportedProblem
+from copycat.workspace.structure import Structure, STRUCTURE_SLOTS
 from copycat.workspace.wobject import Object
 from copycat.workspace.description import Description
 from copycat.workspace.description import ExtrinsicDescription
@@ -32,8 +33,17 @@ from copycat.workspace.replacement import Replacement
 from copycat.workspace.rule import Rule
 from copycat.workspace.string import String
 from copycat.workspace.distribution import Distribution
+from copycat.workspace.index import CorrespondenceIndex
+from copycat.workspace import events
+from copycat.workspace import metrics
 from copycat.coderack.codelets import *
 
+# Strings at least this long switch the workspace into long-string mode.
+LONG_STRING_LENGTH = 20
+
+# The number of translated rules and snags remembered.
+RULE_CACHE_SIZE = 32
+
 VERY_LOW_DISTRIBUTION = Distribution("very_low")
 for i, v in {10:5, 20:150, 30:5, 40:2, 50:1,
              60:1, 70:1, 80:1, 90:1, 100:1}.items():
@@ -72,11 +82,45 @@ class Workspace(object):
         initial_string:
         modified_string:
         target_string:
-        answer_string:"""
-
-    def __init__(self, initial, modified, target, slipnet):
-        """Initializes Workspace."""
+        answer_string:
+        long_string_mode: True if local support is measured with the strings'
+            support indexes and the coderack is scaled to the strings.
+        subscribers: A dictionary of event kind to the callbacks subscribed
+            to it, with the callbacks subscribed to every event under None.
+        samplers: A dictionary of object value to a sampler choosing objects
+            by that value, rebuilt after each update.
+        translations: A dictionary of (rule key, slippages) to the translated
+            rule, where slippages is a tuple of (descriptor, descriptor)
+            pairs.
+        snags: A dictionary of answer key to the object the answer snagged
+            on.
+        snag_signatures: A dictionary of snag signature to the number of
+            snags with that signature, where a signature is the key of the
+            translated rule and the descriptors of the object snagged on.
+        snag_repeats: The number of snags with the signature of the last
+            one."""
+
+    def __init__(self, initial, modified, target, slipnet, long_strings=None,
+                 problem=None):
+        """Initializes Workspace.
+
+        Long-string mode is used when long_strings is True, or when it is None
+        and any of the strings has at least LONG_STRING_LENGTH letters. If a
+        compiled problem is given, the letters and their initial descriptions
+        are copied from it.
+
+        Raises UnsupportedProblem if a string has a character that is not a
+        lowercase letter."""
         self.slipnet = slipnet
+        for character in initial + modified + target:
+            if slipnet.get_plato_letter(character) is None:
+                raise UnsupportedProblem('%r is not a lowercase letter' %
+                                         character)
+        if long_strings is None:
+            longest = max(len(initial), len(modified), len(target))
+            long_strings = longest >= LONG_STRING_LENGTH
+        self.long_string_mode = long_strings
+        self.samplers = {}
 
         self.initial_string = String(self, initial)
         self.modified_string = String(self, modified)
@@ -91,25 +135,68 @@ class Workspace(object):
         self.replacements = []
         self._correspondences = {}
         self.proposed_correspondences = {}
+        self.correspondence_index = CorrespondenceIndex()
+        self.slippage_cache = None
+        self.mappings = {}
+        self.slippage_version = 0
 
         self.rule = None
         self.translated_rule = None
+        self.translations = {}
+        self.snags = {}
 
         self.snag_object = None
         self.snag_condition = None
         self.snag_count = 0
         self.last_snag_time = 0
         self.snag_structures = []
+        self.snag_signatures = {}
+        self.snag_repeats = 0
+
+        self.subscribers = {}
 
         self.changed_length_group = None
         self.amount_length_changed = None
         self.modified_letters = None
 
         if self.initial_string.length == 1 or self.target_string.length == 1:
-            self.slipnet.plato_object_category.activation_buffer += self.activation
+            self.slipnet.plato_object_category.buffer_activation(self.activation)
 
-        self.make_letters()
-        self.add_descriptions()
+        if problem:
+            self.copy_letters(problem)
+        else:
+            self.make_letters()
+            self.add_descriptions()
+        self.activate_descriptions()
+
+    def subscribe(self, callback, kinds=None):
+        """Call callback(kind, subject) whenever one of the given kinds of event
+        happens, or whenever any event happens if no kinds are given."""
+        for kind in kinds or [None]:
+            self.subscribers.setdefault(kind, []).append(callback)
+
+    def unsubscribe(self, callback):
+        """Stop calling the given callback for any kind of event."""
+        for kind in list(self.subscribers.keys()):
+            callbacks = [c for c in self.subscribers[kind] if c != callback]
+            if callbacks:
+                self.subscribers[kind] = callbacks
+            else:
+                del self.subscribers[kind]
+
+    def notify(self, kind, subject):
+        """Tell the subscribers that an event of the given kind happened.
+
+        Without subscribers to the kind of event or to every event this
+        returns at once."""
+        callbacks = self.subscribers.get(kind)
+        if callbacks:
+            for callback in callbacks:
+                callback(kind, subject)
+        callbacks = self.subscribers.get(None)
+        if callbacks:
+            for callback in callbacks:
+                callback(kind, subject)
 
     def make_letters(self):
         """Make letters for each string."""
@@ -163,17 +250,49 @@ class Workspace(object):
                                           self.slipnet.plato_middle)
                 middle_letter.add_description(description)
 
+    def copy_letters(self, problem):
+        """Make the letters of each string and their initial descriptions from
+        a compiled problem."""
+        nodes = self.slipnet.slipnodes
+        for string, letters in zip([self.initial_string,
+                                    self.modified_string,
+                                    self.target_string], problem.letters):
+            for position, (name, category, descriptions) in enumerate(letters):
+                letter = Letter(self, name, string, nodes[category], position)
+                string.add_letter(letter)
+                for description_type, descriptor in descriptions:
+                    description = Description(self, letter,
+                                              nodes[description_type],
+                                              nodes[descriptor])
+                    letter.add_description(description)
+
+    def activate_descriptions(self):
+        """Activate the descriptors of the initial descriptions."""
         for obj in self.objects():
             for description in obj.descriptions:
-                description.descriptor.activation_buffer += self.activation
+                description.descriptor.buffer_activation(self.activation)
 
     def initial_codelets(self):
         """Return the codelets the program starts out with."""
-        codelets = [(BondBottomUpScout(), 0),
-                    (ReplacementFinder(), 0),
-                    (CorrespondenceBottomUpScout(), 0)]
+        codelet_types = [BondBottomUpScout, ReplacementFinder,
+                         CorrespondenceBottomUpScout]
         number_needed = len(self.objects()) * 2
-        return codelets * number_needed
+        if self.long_string_mode:
+            number_needed = min(number_needed, self.coderack_capacity() // \
+                                (2 * len(codelet_types)))
+        return [(codelet(), 0)
+                for _ in range(number_needed) for codelet in codelet_types]
+
+    def coderack_capacity(self):
+        """Return the number of codelets the coderack should hold.
+
+        In long-string mode the coderack grows with the number of letters in
+        the initial and target strings, so that scouts for every part of the
+        strings can wait on it at once."""
+        if not self.long_string_mode:
+            return 100
+        letters = self.initial_string.length + self.target_string.length
+        return max(100, 4 * letters)
 
     def update(self):
         """Update various values of the structures, objects, and strings in the
@@ -181,8 +300,7 @@ class Workspace(object):
         everything can go back to normal.  Finally, update the temperature."""
         for structure in self.structures():
             structure.update_strengths()
-        for obj in self.objects():
-            obj.update_object_values()
+        metrics.update_object_values(self.objects())
 
         self.initial_string.update_relative_importances()
         self.target_string.update_relative_importances()
@@ -192,6 +310,7 @@ class Workspace(object):
         self.test_snag_condition()
 
         self.update_temperature()
+        self.invalidate_samplers()
 
     def test_snag_condition(self):
         """If the program is dealing with a snag, then see if any new
@@ -214,7 +333,7 @@ class Workspace(object):
                 self.snag_condition = None
                 self.clamp_temperature = False
                 for description in self.snag_object.descriptions:
-                    description.descriptor.clamp = False
+                    description.descriptor.set_clamp(False)
                 self.snag_object.clamp_salience = False
 
     def update_temperature(self):
@@ -395,33 +514,58 @@ class Workspace(object):
 
     def slippages(self):
         """Return a list of slippages in all correspondences."""
-        slippages = []
-        for correspondence in self.correspondences():
-            slippages.extend(correspondence.slippages())
-        return slippages
+        return list(self.cached_slippages()[0])
+
+    def slippage_map(self, last=False):
+        """Return a dictionary of descriptor to slipped descriptor.
+
+        Where several slippages slip the same descriptor the first one wins,
+        as in Slipnode.apply_slippages, unless last is True, in which case the
+        last one wins, as in Description.apply_slippages."""
+        return self.cached_slippages()[2 if last else 1]
+
+    def cached_slippages(self):
+        """Return the (slippages, first map, last map) cache, rebuilding it
+        if a correspondence has changed since it was last built."""
+        if self.slippage_cache is None:
+            slippages = []
+            for correspondence in self.correspondences():
+                slippages.extend(correspondence.slippages())
+            first_map = {}
+            last_map = {}
+            for slippage in slippages:
+                first_map.setdefault(slippage.descriptor1, slippage.descriptor2)
+                last_map[slippage.descriptor1] = slippage.descriptor2
+            self.slippage_cache = (slippages, first_map, last_map)
+        return self.slippage_cache
+
+    def invalidate_slippages(self):
+        """Mark the slippage cache as out of date."""
+        self.slippage_cache = None
+        self.slippage_version += 1
 
     def intra_string_unhappiness(self):
         """Return the weighted average of the intra string unhappiness of
         objects on the workspace, weighted by each object's relative imoprtance
         in the string."""
-        unhappiness = sum([obj.relative_importance * obj.intra_string_unhappiness
-                           for obj in self.objects()])
+        unhappiness = self.initial_string.weighted_intra_string_unhappiness + \
+                self.target_string.weighted_intra_string_unhappiness
         return min(100, unhappiness / 200.0)
 
     def inter_string_unhappiness(self):
         """Return a weighted average of the inter string unhappiness of ojbects
         on the workspace, weighted by each object's relative importnace in the
         string."""
-        unhappiness = sum([obj.relative_importance * obj.inter_string_unhappiness
-                           for obj in self.objects()])
+        unhappiness = self.initial_string.weighted_inter_string_unhappiness + \
+                self.target_string.weighted_inter_string_unhappiness
         return min(100, unhappiness / 200.0)
 
     def total_unhappiness(self):
         """Return a weighted average of the total unhappiness of ojbects on
         the workspace, weighted by each object's relative importnace in the
         string."""
-        unhappiness = sum([obj.relative_importance * obj.total_unhappiness
-                           for obj in self.objects()])
+        unhappiness = self.initial_string.weighted_total_unhappiness + \
+                self.target_string.weighted_total_unhappiness
         return min(100, unhappiness / 200.0)
 
     def is_structure_in_snag_structures(self, structure):
@@ -464,19 +608,46 @@ class Workspace(object):
     def get_concept_mappings(self, object1, object2,
                              descriptions1, descriptions2):
         """Return the list of concept mappings between the given descriptions of
-        these two objects."""
+        these two objects.
+
+        The mapping between two descriptions, or its absence, is remembered in
+        object1's mapping cache, so each is only made once per object pair."""
+        cache = object1.get_mapping_cache(object2)
         concept_mappings = []
         for d1 in descriptions1:
             for d2 in descriptions2:
-                if d1.description_type == d2.description_type and \
-                   (d1.descriptor == d2.descriptor or \
-                    d1.descriptor.are_slip_linked(d2.descriptor)):
-                    cm = Mapping(self, d1.description_type, d2.description_type,
-                                 d1.descriptor, d2.descriptor, object1,
-                                 object2)
-                    concept_mappings.append(cm)
+                entry = cache.get((id(d1), id(d2)))
+                if entry is None or entry[0] is not d1 or entry[1] is not d2:
+                    cm = None
+                    if d1.description_type == d2.description_type and \
+                       (d1.descriptor == d2.descriptor or \
+                        d1.descriptor.are_slip_linked(d2.descriptor)):
+                        cm = Mapping(self, d1.description_type, d2.description_type,
+                                     d1.descriptor, d2.descriptor, object1,
+                                     object2)
+                    entry = (d1, d2, cm)
+                    cache[(id(d1), id(d2))] = entry
+                if entry[2]:
+                    concept_mappings.append(entry[2])
         return concept_mappings
 
+    def get_mapping(self, description_type1, description_type2,
+                    descriptor1, descriptor2, object1=None, object2=None):
+        """Return a concept mapping between the given descriptors.
+
+        Mappings that are not between objects depend only on their description
+        types and descriptors, so they are made once and shared."""
+        if object1 is not None or object2 is not None:
+            return Mapping(self, description_type1, description_type2,
+                           descriptor1, descriptor2, object1, object2)
+        key = (description_type1, description_type2, descriptor1, descriptor2)
+        mapping = self.mappings.get(key)
+        if mapping is None:
+            mapping = Mapping(self, description_type1, description_type2,
+                              descriptor1, descriptor2, None, None)
+            self.mappings[key] = mapping
+        return mapping
+
     def get_leftmost_and_rightmost_incompatible_correspondences(self, group1, group2,
                                                                 direction_category_cm):
         """Return any correspondences between leftmost and rightmost objects in
@@ -557,8 +728,12 @@ class Workspace(object):
                     correspondence.object2.string_number)
         if position in self.proposed_correspondences:
             items = self.proposed_correspondences[position]
-            if correspondence in items:
-                items.remove(correspondence)
+            for index, item in enumerate(items):
+                if item is correspondence:
+                    del items[index]
+                    self.notify(events.CORRESPONDENCE_WITHDRAWN,
+                                correspondence)
+                    break
 
     def get_proposed_correspondences(self):
         """Return a list of proposed correspondences in the workspace."""
@@ -579,12 +754,19 @@ class Workspace(object):
     def add_correspondence(self, correspondence):
         """Add a correspondence to the workspace."""
         index = correspondence.object1.string_number
+        existing_correspondence = self._correspondences.get(index)
+        if existing_correspondence:
+            self.correspondence_index.remove(existing_correspondence)
         self._correspondences[index] = correspondence
+        self.correspondence_index.add(correspondence)
+        self.invalidate_slippages()
 
     def delete_correspondence(self, correspondence):
         """Delete a correspondence from the workpace."""
         index = correspondence.object1.string_number
+        self.correspondence_index.remove(self._correspondences[index])
         del(self._correspondences[index])
+        self.invalidate_slippages()
 
     def is_correspondence_present(self, correspondence):
         """Return True if the given correspondence exists on the workspace."""
@@ -618,9 +800,22 @@ class Workspace(object):
     def choose_object(self, method):
         """Return an object on the workspace chosen probabilistically
         (adjusted for temperature) according to the given method."""
-        values = [getattr(obj, method) for obj in self.objects()]
-        adjusted_values = self.temperature_adjusted_values(values)
-        return toolbox.weighted_select(adjusted_values, self.objects())
+        sampler = self.samplers.get(method)
+        if sampler is None:
+            objects = self.objects()
+            values = [getattr(obj, method) for obj in objects]
+            adjusted_values = self.temperature_adjusted_values(values)
+            sampler = toolbox.WeightedSampler(adjusted_values, objects)
+            self.samplers[method] = sampler
+        return sampler.choose()
+
+    def invalidate_samplers(self):
+        """Forget the object samplers, which have to be rebuilt when the
+        objects, their values or the temperature change."""
+        self.samplers.clear()
+        for string in [self.initial_string, self.modified_string,
+                       self.target_string]:
+            string.samplers.clear()
 
     def has_null_replacement(self):
         """Return True if there is at least one letter in the initial string
@@ -637,7 +832,7 @@ class Workspace(object):
         if not uncorresponding_objects:
             importance = 0
         else:
-            importance = max([o.relative_importance()
+            importance = max([o.relative_importance
                               for o in uncorresponding_objects])
         return self.rough_indication(importance / 10)
 
@@ -648,11 +843,12 @@ class Workspace(object):
         correspondence = Correspondence(self, object1, object2, mappings)
         correspondence.proposal_level = 1
         for maps in correspondence.get_concept_mappings():
-            maps.description_type1.activation_buffer += self.activation
-            maps.descriptor1.activation_buffer += self.activation
-            maps.description_type2.activation_buffer += self.activation
-            maps.descriptor2.activation_buffer += self.activation
+            maps.description_type1.buffer_activation(self.activation)
+            maps.descriptor1.buffer_activation(self.activation)
+            maps.description_type2.buffer_activation(self.activation)
+            maps.descriptor2.buffer_activation(self.activation)
         self.add_proposed_correspondence(correspondence)
+        self.notify(events.CORRESPONDENCE_PROPOSED, correspondence)
         dist_mappings = correspondence.get_distinguishing_mappings()
         return [(CorrespondenceStrengthTester([correspondence, flip_obj2]),
                  toolbox.average(*[cm.strength() for cm in dist_mappings]))]
@@ -675,11 +871,12 @@ class Workspace(object):
                       left_object, right_object, objects, bonds)
         group.proposal_level = 1
 
-        group.bond_category.activation_buffer += self.activation
+        group.bond_category.buffer_activation(self.activation)
         if group.direction_category:
-            group.direction_category.activation_buffer += self.activation
+            group.direction_category.buffer_activation(self.activation)
 
         string.add_proposed_group(group)
+        self.notify(events.GROUP_PROPOSED, group)
         urgency = bond_category.bond_degree_of_association()
 
         return [(GroupStrengthTester([group]), urgency)]
@@ -694,7 +891,8 @@ class Workspace(object):
         for bond in group.bonds:
             bond.group = group
         for description in group.descriptions:
-            description.descriptor.activation_buffer += self.activation
+            description.descriptor.buffer_activation(self.activation)
+        self.notify(events.GROUP_BUILT, group)
 
     def break_group(self, group):
         """Break the given group."""
@@ -711,9 +909,13 @@ class Workspace(object):
             bonds = string.get_proposed_bond(i, group.string_number)
             if bonds:
                 proposed_bonds.extend(bonds)
-        for bond in set(proposed_bonds):
+        for bond in dict.fromkeys(proposed_bonds):
             string.remove_proposed_bond(bond)
 
+        for proposed in string.get_proposed_groups():
+            if any(obj is group for obj in proposed.objects):
+                string.remove_proposed_group(proposed)
+
         for bond in group.incoming_bonds + group.outgoing_bonds:
             self.break_bond(bond)
 
@@ -739,6 +941,7 @@ class Workspace(object):
 
         for bond in group.bonds:
             bond.group = None
+        self.notify(events.GROUP_BROKEN, group)
 
     def build_description(self, description):
         """Build the new description."""
@@ -746,16 +949,18 @@ class Workspace(object):
             description.object.add_bond_description(description)
         else:
             description.object.add_description(description)
-        description.description_type.activation_buffer += self.activation
-        description.descriptor.activation_buffer += self.activation
+        description.description_type.buffer_activation(self.activation)
+        description.descriptor.buffer_activation(self.activation)
+        self.notify(events.DESCRIPTION_BUILT, description)
 
     def propose_description(self, obj, description_type, descriptor):
         """Create a proposed description and post a description strength tester
         codelet with urgency a function of the activation of the description's
         descriptor."""
         description = Description(self, obj, description_type, descriptor)
-        description.descriptor.activation_buffer += self.activation
+        description.descriptor.buffer_activation(self.activation)
         urgency = description_type.activation
+        self.notify(events.DESCRIPTION_PROPOSED, description)
         return [(DescriptionStrengthTester([description]), urgency)]
 
     def build_bond(self, bond):
@@ -771,13 +976,21 @@ class Workspace(object):
 
         bond.left_object.right_bond = bond
         bond.right_object.left_bond = bond
+        bond.string.bond_chains.add(bond)
 
-        bond.bond_category.activation_buffer += self.activation
+        bond.bond_category.buffer_activation(self.activation)
         if bond.direction_category:
-            bond.direction_category.activation_buffer += self.activation
+            bond.direction_category.buffer_activation(self.activation)
+        self.notify(events.BOND_BUILT, bond)
 
     def break_bond(self, bond):
-        """Break a currently built bond."""
+        """Break a currently built bond.
+
+        A bond that is not built, such as a group's bond that has since been
+        replaced by another bond between the same objects, is left alone."""
+        if bond.string.get_bond(bond.from_object, bond.to_object) is not bond:
+            return
+        bond.string.bond_chains.remove(bond)
         bond.string.remove_bond(bond)
         bond.from_object.remove_outgoing_bond(bond)
         bond.to_object.remove_incoming_bond(bond)
@@ -788,6 +1001,7 @@ class Workspace(object):
 
         bond.left_object.right_bond = None
         bond.right_object.left_bond = None
+        self.notify(events.BOND_BROKEN, bond)
 
     def choose_bond_facet(self, obj1, obj2):
         """Return a bond facet that is shared by both objects, probabilistically
@@ -802,7 +1016,8 @@ class Workspace(object):
             if description_type.category() == self.slipnet.plato_bond_facet:
                 obj2_bond_facets.append(description_type)
 
-        items = list(set(obj1_bond_facets).intersection(set(obj2_bond_facets)))
+        items = [facet for facet in dict.fromkeys(obj1_bond_facets)
+                 if facet in obj2_bond_facets]
         support = [f.total_description_type_support(obj1.string) for f in items]
         return toolbox.weighted_select(support, items)
 
@@ -810,14 +1025,15 @@ class Workspace(object):
                      bond_facet, from_descriptor, to_descriptor):
         """Create a proposed bond and posts a bond strength tester codelet
         with urgency a function of the degree of association of the bond."""
-        from_descriptor.activation_buffer += self.activation
-        to_descriptor.activation_buffer += self.activation
-        bond_facet.activation_buffer += self.activation
+        from_descriptor.buffer_activation(self.activation)
+        to_descriptor.buffer_activation(self.activation)
+        bond_facet.buffer_activation(self.activation)
 
         proposed_bond = Bond(self, from_object, to_object, bond_category,
                              bond_facet, from_descriptor, to_descriptor)
         proposed_bond.proposal_level = 1
         from_object.string.add_proposed_bond(proposed_bond)
+        self.notify(events.BOND_PROPOSED, proposed_bond)
 
         urgency = bond_category.bond_degree_of_association()
         return [(BondStrengthTester([proposed_bond]), urgency)]
@@ -835,7 +1051,9 @@ class Workspace(object):
                    correspondence.accessory_concept_mappings
         for mapping in mappings:
             if mapping.is_slippage():
-                correspondence.add_accessory_concept_mapping(mapping.symmetric_version())
+                mapping_sym = mapping.symmetric_version()
+                if mapping_sym:
+                    correspondence.add_accessory_concept_mapping(mapping_sym)
 
         if isinstance(object1, Group) and isinstance(object2, Group):
             for mapping in self.get_concept_mappings(object1, object2,
@@ -844,17 +1062,20 @@ class Workspace(object):
                 correspondence.add_accessory_concept_mapping(mapping)
                 if mapping.is_slippage():
                     mapping_sym = mapping.symmetric_version()
-                    correspondence.add_accessory_concept_mapping(mapping_sym)
+                    if mapping_sym:
+                        correspondence.add_accessory_concept_mapping(mapping_sym)
 
         for mapping in correspondence.concept_mappings:
             if mapping.label:
-                mapping.label.activation_buffer += self.activation
+                mapping.label.buffer_activation(self.activation)
+        self.notify(events.CORRESPONDENCE_BUILT, correspondence)
 
     def break_correspondence(self, correspondence):
         """Break a correspondence in the workspace."""
         correspondence.object1.correspondence = None
         correspondence.object2.correspondence = None
         self.delete_correspondence(correspondence)
+        self.notify(events.CORRESPONDENCE_BROKEN, correspondence)
 
     def possible_group_bonds(self, bond_category, direction_category,
                              bond_facet, bonds):
@@ -862,6 +1083,11 @@ class Workspace(object):
         entire string."""
         new_bonds = []
         opposite = self.slipnet.plato_opposite
+        opposite_category = self.slipnet.get_related_node(bond_category, opposite)
+        opposite_direction = None
+        if direction_category:
+            opposite_direction = self.slipnet.get_related_node(direction_category,
+                                                               opposite)
         for bond in bonds:
             if not bond:
                 new_bonds = []
@@ -869,10 +1095,9 @@ class Workspace(object):
             elif bond.bond_facet != bond_facet:
                 new_bonds = []
                 break
-            elif self.slipnet.get_related_node(bond.bond_category, opposite) == \
-                    bond_category and \
-                    self.slipnet.get_related_node(bond.direction_category, opposite) == \
-                    direction_category:
+            elif opposite_category and \
+                    bond.bond_category == opposite_category and \
+                    bond.direction_category == opposite_direction:
                 new_bonds.append(bond.flipped_version())
             elif bond.bond_category != bond_category or \
                     bond.direction_category != direction_category:
@@ -1125,16 +1350,75 @@ class Workspace(object):
         """Build the new rule."""
         self.rule = rule
         self.activate_from_workspace_rule_descriptions(rule)
+        self.notify(events.RULE_BUILT, rule)
+
+    def get_translation(self, key):
+        """Return the translated rule remembered under the key of a rule and
+        the slippages it was translated with, or None."""
+        return self.translations.get(key)
+
+    def set_translation(self, key, translated_rule):
+        """Remember a translated rule under the key of the rule and the
+        slippages it was translated with."""
+        self.remember(self.translations, key, translated_rule)
+
+    def answer_key(self, translated_rule):
+        """Return a key of everything that building an answer from the
+        translated rule depends on: the rule, the objects of the target string
+        and their descriptions, and the target object the changed object
+        corresponds to."""
+        correspondent = None
+        for obj in self.initial_string.get_objects():
+            if obj.is_changed:
+                if obj.correspondence:
+                    correspondent = obj.correspondence.object2
+                break
+        return (translated_rule.key(), self.target_string.group_version,
+                tuple(obj.description_version
+                      for obj in self.target_string.get_objects()),
+                correspondent)
+
+    def get_snag(self, translated_rule):
+        """Return the object an answer built from the translated rule snagged
+        on, if it was built before from the same workspace, or None."""
+        return self.snags.get(self.answer_key(translated_rule))
+
+    def set_snag(self, translated_rule, snag_object):
+        """Remember the object an answer built from the translated rule
+        snagged on."""
+        self.remember(self.snags, self.answer_key(translated_rule),
+                      snag_object)
+
+    def note_snag(self, translated_rule):
+        """Count a snag on the snag object in building an answer from the
+        translated rule under its signature, and return the number of snags
+        with that signature so far."""
+        signature = (translated_rule.key(),
+                     tuple(description.descriptor
+                           for description in self.snag_object.descriptions))
+        self.snag_repeats = self.snag_signatures.get(signature, 0) + 1
+        self.snag_signatures[signature] = self.snag_repeats
+        return self.snag_repeats
+
+    def remember(self, cache, key, value):
+        """Keep a value in one of the rule caches, making room by dropping
+        the oldest entry if the cache is full."""
+        if key not in cache and len(cache) >= RULE_CACHE_SIZE:
+            del cache[next(iter(cache))]
+        cache[key] = value
 
     def build_translated_rule(self, translated_rule):
         """Build the translated rule."""
         self.translated_rule = translated_rule
+        self.notify(events.RULE_TRANSLATED, translated_rule)
 
     def break_rule(self, _):
         """Break the rule. The only reason this function has an argument is so
         that it matchs the form of the other "break" functions and thus the
         break codelets that call it."""
+        rule = self.rule
         self.rule = None
+        self.notify(events.RULE_BROKEN, rule)
 
     def propose_rule(self, i_object, i_description, m_object, m_description):
         """Create a proposed rule and post a rule strength tester codelet with
@@ -1174,9 +1458,9 @@ class Workspace(object):
     def activate_from_workspace_rule_descriptions(self, rule):
         """Activate the nodes corresponding to the descriptions in the rule."""
         if rule.descriptor1:
-            rule.descriptor1.activation_buffer += self.activation
+            rule.descriptor1.buffer_activation(self.activation)
         if rule.expresses_relation():
-            rule.relation.activation_buffer += self.activation
+            rule.relation.buffer_activation(self.activation)
         else:
             if rule.descriptor2:
-                rule.descriptor2.activation_buffer += self.activation
+                rule.descriptor2.buffer_activation(self.activation)
@@ -19,7 +19,7 @@
 import math
 
 import copycat.toolbox as toolbox
-from copycat.workspace import Structure, Mapping
+from copycat.workspace import Structure, STRUCTURE_SLOTS
 
 class Bond(Structure):
     """Bond
@@ -33,6 +33,15 @@ class Bond(Structure):
         from_object_descriptor:
         to_object_descriptor:"""
 
+    __slots__ = STRUCTURE_SLOTS + ('workspace', 'slipnet', 'from_object',
+                                   'to_object', 'left_object',
+                                   'right_object', 'left_string_position',
+                                   'right_string_position',
+                                   'bond_category', 'bond_facet',
+                                   'direction_category',
+                                   'from_object_descriptor',
+                                   'to_object_descriptor')
+
     def __init__(self, workspace, from_object, to_object, bond_category,
                  bond_facet, from_object_descriptor, to_object_descriptor):
         """Initialize Bond."""
@@ -161,8 +170,10 @@ class Bond(Structure):
 
     def incompatible_bonds(self):
         """Return the bonds that are incompatible with the bond."""
-        return list(set([self.left_object.right_bond,
-                         self.right_object.left_bond]) - set([None]))
+        bonds = dict.fromkeys([self.left_object.right_bond,
+                               self.right_object.left_bond])
+        bonds.pop(None, None)
+        return list(bonds)
 
     def incompatible_correspondences(self):
         """Return the correspondences that are incompatible with this bond. This
@@ -209,12 +220,10 @@ class Bond(Structure):
         if other_bond.direction_category is None:
             return []
 
-        mapping = Mapping(self.workspace,
-                          self.slipnet.plato_direction_category,
-                          self.slipnet.plato_direction_category,
-                          self.direction_category,
-                          other_bond.direction_category,
-                          None, None)
+        mapping = self.workspace.get_mapping(self.slipnet.plato_direction_category,
+                                             self.slipnet.plato_direction_category,
+                                             self.direction_category,
+                                             other_bond.direction_category)
         if mapping.is_incompatible_concept_mapping(string_position_category_mapping):
             incompatible_correspondences.append(correspondence)
 
@@ -258,10 +267,34 @@ class Bond(Structure):
         groups."""
         return self.from_object.letter_span() + self.to_object.letter_span()
 
+    def chain_key(self):
+        """Return the key shared by this bond and its flipped version, used to
+        collect runs of compatible bonds in the string's bond chains."""
+        key = (self.bond_facet, self.bond_category, self.direction_category)
+        opposite = self.slipnet.plato_opposite
+        category = self.slipnet.get_related_node(self.bond_category, opposite)
+        if category is None or self.direction_category is None:
+            return key
+        direction = self.slipnet.get_related_node(self.direction_category,
+                                                  opposite)
+        flipped_key = (self.bond_facet, category, direction)
+        if (category.name, direction.name) < (self.bond_category.name,
+                                              self.direction_category.name):
+            return flipped_key
+        return key
+
+    def support_key(self):
+        """Return the key under which the bond is kept in its string's
+        support index."""
+        return (self.bond_category, self.direction_category)
+
     def local_density(self):
         """Return a rough measure of the density in the string of bonds of the
         same bond category and direction category as the given bond. This method
         is used in calculating the external strength of a bond."""
+        if self.workspace.long_string_mode:
+            return self.indexed_local_density()
+
         def calc(direction):
             """Inner calculation."""
             slot_sum = 0
@@ -288,6 +321,20 @@ class Bond(Structure):
             return 100
         return round(100 * (support_sum / float(slot_sum)))
 
+    def indexed_local_density(self):
+        """Return the local density of the bond using the string's support
+        index. Every pair of adjacent letters outside the bond is a slot, and
+        a slot is supported if a bond with the same key is built across it."""
+        key = self.support_key()
+        index = self.string.bond_index
+        slot_sum = self.left_string_position + \
+                (self.string.length - 1 - self.right_string_position)
+        if slot_sum == 0:
+            return 100
+        support_sum = index.count_before(key, self.left_string_position + 1) + \
+                index.count_after(key, self.right_string_position - 1)
+        return round(100 * (min(support_sum, slot_sum) / float(slot_sum)))
+
     def local_support(self):
         """Return this bond's local support in the string."""
         number = self.number_of_local_supporting_bonds()
@@ -303,6 +350,11 @@ class Bond(Structure):
         Looks at all the other bonds in the string, counting bonds of the same
         bond category and direction category.  Does not take distance into
         account; all qualifying bonds in the string are counted the same."""
+        if self.workspace.long_string_mode:
+            key = self.support_key()
+            index = self.string.bond_index
+            return index.count_before(key, self.left_string_position + 1) + \
+                    index.count_after(key, self.right_string_position - 1)
         number_of_supporting_bonds = 0
         letter_distance = self.workspace.letter_distance
         bonds = self.string.get_bonds()
@@ -17,7 +17,7 @@
 """Correspondence."""
 
 import copycat.toolbox as toolbox
-from copycat.workspace import Structure, Letter, Group, Mapping
+from copycat.workspace import Structure, STRUCTURE_SLOTS, Letter, Group
 
 class Correspondence(Structure):
     """Correspondence
@@ -29,6 +29,10 @@ class Correspondence(Structure):
         accessory_concept_mappings:
         structure_category:"""
 
+    __slots__ = STRUCTURE_SLOTS + ('workspace', 'slipnet', 'object1',
+                                   'object2', 'concept_mappings',
+                                   'accessory_concept_mappings')
+
     def __init__(self, workspace, object1, object2, concept_mappings):
         """Initialize Correspondence."""
         super(Correspondence, self).__init__()
@@ -83,10 +87,11 @@ class Correspondence(Structure):
             return 100
         else:
             support_sum = 0
-            other_correspondences = self.workspace.correspondences()
-            if self in other_correspondences:
-                other_correspondences.remove(self)
-            for correspondence in other_correspondences:
+            index = self.workspace.correspondence_index
+            mappings = self.get_distinguishing_mappings()
+            for correspondence in index.candidates(self, mappings):
+                if correspondence is self:
+                    continue
                 if self.is_supporting_correspondence(correspondence):
                     support_sum += correspondence.total_strength
             return min(100, support_sum)
@@ -149,6 +154,7 @@ class Correspondence(Structure):
     def add_accessory_concept_mapping(self, mapping):
         """Add an accessory concept mapping."""
         self.accessory_concept_mappings.append(mapping)
+        self.workspace.invalidate_slippages()
 
     def is_concept_mapping_present(self, mapping):
         """Return True if the correspondence contains the given mapping."""
@@ -163,7 +169,9 @@ class Correspondence(Structure):
         self.concept_mappings.extend(new_mappings)
         for mapping in new_mappings:
             if mapping.label:
-                mapping.label.activation_buffer += self.workspace.activation
+                mapping.label.buffer_activation(self.workspace.activation)
+        self.workspace.correspondence_index.update(self)
+        self.workspace.invalidate_slippages()
 
     def slippages(self):
         """Return the list of slippages in this correspondence."""
@@ -187,8 +195,10 @@ class Correspondence(Structure):
         """Return a list of all the already existing correspondences that are
         incompatible with the correspondence"""
         incomp = []
-        for correspondence in self.workspace.correspondences():
-            if correspondence and self.is_incompatible_correspondence(correspondence):
+        index = self.workspace.correspondence_index
+        mappings = self.get_concept_mappings()
+        for correspondence in index.candidates(self, mappings):
+            if self.is_incompatible_correspondence(correspondence):
                 incomp.append(correspondence)
 
         if isinstance(self.object1, Group):
@@ -230,7 +240,7 @@ class Correspondence(Structure):
            direction_category_cm:
             incomp.extend(self.workspace.get_leftmost_and_rightmost_incompatible_correspondences(self.object1, self.object2, direction_category_cm))
 
-        return list(set(incomp))
+        return list(dict.fromkeys(incomp))
 
     def incompatible_bond(self):
         """Return the bond that is incompatible with this correspondence."""
@@ -246,12 +256,10 @@ class Correspondence(Structure):
 
         if bond1 and bond2 and \
            bond1.direction_category and bond2.direction_category:
-            bond_concept_mappings = [Mapping(self.workspace,
-                                             self.slipnet.plato_direction_category,
-                                             self.slipnet.plato_direction_category,
-                                             bond1.direction_category,
-                                             bond2.direction_category,
-                                             None, None)]
+            direction = self.slipnet.plato_direction_category
+            bond_concept_mappings = [self.workspace.get_mapping(direction, direction,
+                                                                bond1.direction_category,
+                                                                bond2.direction_category)]
             for mapping1 in bond_concept_mappings:
                 for mapping2 in self.get_concept_mappings():
                     if mapping1.is_incompatible_concept_mapping(mapping2):
@@ -266,10 +274,10 @@ class Correspondence(Structure):
             return False
         descriptor1 = rule.descriptor1
         descriptors = [cm.descriptor1 for cm in self.get_concept_mappings()]
-        slippages = self.workspace.slippages()
+        slippage_map = self.workspace.slippage_map()
         descriptions = self.object2.relevant_descriptions()
         relevant_descriptors = [d.descriptor for d in descriptions]
-        slipped = [d.apply_slippages(slippages) for d in relevant_descriptors]
+        slipped = [slippage_map.get(d, d) for d in relevant_descriptors]
         return self.object1.is_changed and \
                 descriptor1 not in descriptors and \
                 descriptor1 not in slipped
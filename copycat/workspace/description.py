@@ -16,7 +16,7 @@
 
 """Description"""
 
-from copycat.workspace import Structure
+from copycat.workspace import Structure, STRUCTURE_SLOTS
 import copycat.toolbox as toolbox
 
 class Description(Structure):
@@ -29,6 +29,10 @@ class Description(Structure):
         descriptor: the descriptor applying to the facet.
         description_number: A unique identifier within an object."""
 
+    __slots__ = STRUCTURE_SLOTS + ('workspace', 'slipnet', 'object',
+                                   'description_type', 'descriptor',
+                                   'description_number')
+
     def __init__(self, workspace, obj, description_type, descriptor):
         """Initialize Description."""
         super(Description, self).__init__()
@@ -102,6 +106,14 @@ class Description(Structure):
 
         return Description(self.workspace, obj, new_description_type, new_descriptor)
 
+    def apply_slippage_map(self, obj, slippage_map):
+        """Return a new description with the slippages in the given map of
+        descriptor to slipped descriptor applied."""
+        new_description_type = slippage_map.get(self.description_type,
+                                                self.description_type)
+        new_descriptor = slippage_map.get(self.descriptor, self.descriptor)
+        return Description(self.workspace, obj, new_description_type, new_descriptor)
+
 class ExtrinsicDescription(object):
     """ExtrinsicDescription is a description with respect to another object
     on the workspace.
@@ -0,0 +1,51 @@
+# Copyright (c) 2007-2017 Joseph Hager.
+#
+# Copycat is free software; you can redistribute it and/or modify
+# it under the terms of version 2 of the GNU General Public License,
+# as published by the Free Software Foundation.
+#
+# Copycat is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Copycat; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.
+
+"""Workspace events.
+
+Subscribers registered with Workspace.subscribe are called with the kind of
+event and its subject whenever one of these happens in the workspace. The
+subject of each kind of event is given beside it. A proposed structure is
+withdrawn when it is taken off the workspace's proposals, whether it is
+about to be built or has been given up."""
+
+BOND_PROPOSED = 'bond_proposed'                     # Bond
+BOND_BUILT = 'bond_built'                           # Bond
+BOND_BROKEN = 'bond_broken'                         # Bond
+BOND_WITHDRAWN = 'bond_withdrawn'                   # Bond
+GROUP_PROPOSED = 'group_proposed'                   # Group
+GROUP_BUILT = 'group_built'                         # Group
+GROUP_BROKEN = 'group_broken'                       # Group
+GROUP_WITHDRAWN = 'group_withdrawn'                 # Group
+CORRESPONDENCE_PROPOSED = 'correspondence_proposed' # Correspondence
+CORRESPONDENCE_BUILT = 'correspondence_built'       # Correspondence
+CORRESPONDENCE_BROKEN = 'correspondence_broken'     # Correspondence
+CORRESPONDENCE_WITHDRAWN = 'correspondence_withdrawn' # Correspondence
+DESCRIPTION_PROPOSED = 'description_proposed'       # Description
+DESCRIPTION_BUILT = 'description_built'             # Description
+RULE_BUILT = 'rule_built'                           # Rule
+RULE_BROKEN = 'rule_broken'                         # Rule
+RULE_TRANSLATED = 'rule_translated'                 # Rule
+SNAG = 'snag'                                       # Object causing the snag
+ANSWER = 'answer'                                   # String
+
+EVENTS = [BOND_PROPOSED, BOND_BUILT, BOND_BROKEN, BOND_WITHDRAWN,
+          GROUP_PROPOSED, GROUP_BUILT, GROUP_BROKEN, GROUP_WITHDRAWN,
+          CORRESPONDENCE_PROPOSED, CORRESPONDENCE_BUILT, CORRESPONDENCE_BROKEN,
+          CORRESPONDENCE_WITHDRAWN,
+          DESCRIPTION_PROPOSED, DESCRIPTION_BUILT,
+          RULE_BUILT, RULE_BROKEN, RULE_TRANSLATED,
+          SNAG, ANSWER]
@@ -19,7 +19,7 @@
 import math
 
 import copycat.toolbox as toolbox
-from copycat.workspace import Object, Structure, Description, Mapping
+from copycat.workspace import Object, Structure, Description
 
 class Group(Object, Structure):
     """Group
@@ -29,8 +29,23 @@ class Group(Object, Structure):
         bond_facet: the description type upon which the group's bonds are based.
         bonds: A list of bonds in the group.
         objects: A list of objects in the group.
+        object_set: The objects in the group as a frozenset.
         bond_category: The category associated with the group category.
-        bond_descriptions: Descriptions involving the bonds in the group."""
+        bond_descriptions: Descriptions involving the bonds in the group.
+        cached_support: The support index version and number of supporting
+            groups from the last time they were counted.
+        cached_density: The support index version and local density from the
+            last time it was measured."""
+
+    # Object already has slots for string and group.
+    __slots__ = ('structure_category', 'internal_strength',
+                 'external_strength', 'total_strength',
+                 'proposal_level', 'group_category',
+                 'direction_category', 'left_object', 'right_object',
+                 'object_set', 'bonds', 'cached_support',
+                 'cached_density', 'middle_object',
+                 'left_object_position', 'right_object_position',
+                 'bond_category', 'bond_facet', 'bond_descriptions')
 
     def __init__(self, workspace, string, group_category, direction_category,
                  left_object, right_object, objects, bonds):
@@ -46,8 +61,11 @@ class Group(Object, Structure):
         self.left_object = left_object
         self.right_object = right_object
         self.objects = objects
+        self.object_set = frozenset(objects)
         self.bonds = bonds
         self.proposal_level = None
+        self.cached_support = None
+        self.cached_density = None
 
         self.middle_object = None
         for obj in objects:
@@ -138,6 +156,11 @@ class Group(Object, Structure):
         return hash((self.left_object_position, self.right_object_position,
                      self.direction_category, self.group_category))
 
+    def support_key(self):
+        """Return the key under which the group is kept in its string's
+        support index."""
+        return (self.group_category, self.direction_category)
+
     def calculate_internal_strength(self):
         """For now, groups based on letter category are stronger than groups
         based on other facets. This should be fixed; a more general mechanism is
@@ -170,18 +193,30 @@ class Group(Object, Structure):
         Looks at all the other groups in the string, counting groups of the
         same group category and direction category.  Does not take distance
         into acount; all qualifying groups in the string are counted the
-        same."""
-        number_of_supporting_groups = 0
-        groups = self.string.get_groups()
-        if self in groups:
-            groups.remove(self)
-        for other_group in groups:
-            if (not (self.is_subgroup_of(other_group) or \
-                         other_group.is_subgroup_of(self) or \
-                         self.overlaps(other_group))) and \
-                         other_group.group_category == self.group_category and \
-                         other_group.direction_category == self.direction_category:
-                number_of_supporting_groups += 1
+        same.
+
+        Only the groups with the same key in the string's group index are
+        looked at, and the count is kept until a group with that key is
+        built or broken."""
+        key = self.support_key()
+        index = self.string.group_index
+        version = index.version(key)
+        if self.cached_support and self.cached_support[0] == version:
+            return self.cached_support[1]
+        if self.workspace.long_string_mode:
+            number_of_supporting_groups = \
+                    index.count_before(key, self.left_string_position) + \
+                    index.count_after(key, self.right_string_position)
+        else:
+            number_of_supporting_groups = 0
+            for other_group in index.get_groups(key):
+                if other_group is self:
+                    continue
+                if not (self.is_subgroup_of(other_group) or \
+                        other_group.is_subgroup_of(self) or \
+                        self.overlaps(other_group)):
+                    number_of_supporting_groups += 1
+        self.cached_support = (version, number_of_supporting_groups)
         return number_of_supporting_groups
 
     def local_density(self):
@@ -190,6 +225,8 @@ class Group(Object, Structure):
         method is used in calculating the external strength of a group."""
         if self.is_string_spanning_group():
             return 100
+        if self.workspace.long_string_mode:
+            return self.indexed_local_density()
 
         slot_sum = 0
         support_sum = 0
@@ -229,6 +266,51 @@ class Group(Object, Structure):
         else:
             return round(100 * (support_sum / float(slot_sum)))
 
+    def indexed_local_density(self):
+        """Return the local density of the group using the string's group
+        index, without walking the string.
+
+        Each supporting group on either side counts as one slot, and every
+        other letter outside the group counts as a slot of its own. A group
+        nested in another supporting group is not counted again. The density
+        is kept until a group with the same key is built or broken."""
+        key = self.support_key()
+        index = self.string.group_index
+        version = index.version(key)
+        if self.cached_density and self.cached_density[0] == version:
+            return self.cached_density[1]
+
+        left = self.left_string_position
+        right = self.right_string_position
+        supporting = self.outermost_groups(
+            [group for group in index.get_groups(key)
+             if group.right_string_position < left or
+             group.left_string_position > right])
+        support_sum = len(supporting)
+        letters_outside = left + (self.string.length - 1 - right)
+        spanned = sum(group.right_string_position -
+                      group.left_string_position + 1 for group in supporting)
+        slot_sum = letters_outside - spanned + support_sum
+        if slot_sum <= 0:
+            density = 100
+        else:
+            density = min(100, round(100 * (support_sum / float(slot_sum))))
+        self.cached_density = (version, density)
+        return density
+
+    @staticmethod
+    def outermost_groups(groups):
+        """Return the groups that are not nested in another of the groups.
+        Of groups spanning the same letters only the first is kept."""
+        outermost = []
+        rightmost = -1
+        for group in sorted(groups, key=lambda group: (
+                group.left_string_position, -group.right_string_position)):
+            if group.right_string_position > rightmost:
+                outermost.append(group)
+                rightmost = group.right_string_position
+        return outermost
+
     def local_support(self):
         """Return the local support of the group in the string."""
         number = self.number_of_local_supporting_groups()
@@ -250,12 +332,13 @@ class Group(Object, Structure):
 
     def overlaps(self, other):
         """Return True if the two groups overlap."""
-        return set(self.objects).issubset(set(other.objects))
+        return self.object_set <= other.object_set
 
     def get_incompatible_groups(self):
         """Return a list of the groups that are incompatible with the group."""
-        groups = set([obj.group for obj in self.objects])
-        groups.difference_update([self, None])
+        groups = dict.fromkeys(obj.group for obj in self.objects)
+        groups.pop(self, None)
+        groups.pop(None, None)
         return list(groups)
 
     def get_incompatible_correspondences(self):
@@ -288,10 +371,9 @@ class Group(Object, Structure):
             if other_bond.direction_category != None and \
                     self.direction_category != None:
                 direction = self.slipnet.plato_direction_category
-                group_mapping = Mapping(self.workspace, direction, direction,
-                                        self.direction_category,
-                                        other_bond.direction_category,
-                                        None, None)
+                group_mapping = self.workspace.get_mapping(direction, direction,
+                                                           self.direction_category,
+                                                           other_bond.direction_category)
                 if group_mapping.is_incompatible_concept_mapping(concept_mapping):
                     return True
 
@@ -343,6 +425,7 @@ class Group(Object, Structure):
     def add_bond_description(self, description):
         """Add a bond description to the group's list of bond descriptions."""
         self.bond_descriptions.append(description)
+        self.description_version += 1
 
     def length(self):
         """Return the number of objects in the group."""
@@ -395,7 +478,7 @@ class Group(Object, Structure):
     def length_description_probability(self):
         """Return the probability to be used in deciding to add a length
         description."""
-        if self.length() > 5:
+        if self.length() > len(self.slipnet.slipnet_numbers):
             return 0
         value = self.length() ** 3
         percent = (100 - self.slipnet.plato_length.activation) / 100.
@@ -0,0 +1,294 @@
+# Copyright (c) 2007-2017 Joseph Hager.
+#
+# Copycat is free software; you can redistribute it and/or modify
+# it under the terms of version 2 of the GNU General Public License,
+# as published by the Free Software Foundation.
+#
+# Copycat is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Copycat; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.
+
+"""Indexes over the structures built in a string."""
+
+class RangeCounter(object):
+    """RangeCounter sums values stored at letter positions in a string.
+
+    It is a binary indexed tree, so adding a value and summing a range of
+    positions both take time logarithmic in the length of the string.
+
+    Attributes:
+        size: The number of positions that can be counted.
+        tree: The partial sums making up the binary indexed tree."""
+
+    def __init__(self, size):
+        """Initialize RangeCounter."""
+        self.size = size
+        self.tree = [0] * (size + 1)
+
+    def add(self, position, amount=1):
+        """Add amount to the value at the given position."""
+        index = position + 1
+        while index <= self.size:
+            self.tree[index] += amount
+            index += index & -index
+
+    def prefix(self, position):
+        """Return the sum of the values at positions up to and including the
+        given position."""
+        index = min(position, self.size - 1) + 1
+        total = 0
+        while index > 0:
+            total += self.tree[index]
+            index -= index & -index
+        return total
+
+    def range(self, first, last):
+        """Return the sum of the values from first to last inclusive."""
+        if last < first:
+            return 0
+        return self.prefix(last) - self.prefix(first - 1)
+
+
+class SupportIndex(object):
+    """SupportIndex counts built structures of a string by category.
+
+    Structures are keyed by a (category, direction category) pair and
+    indexed by both their leftmost and rightmost letter positions, so that
+    the number of same-key structures entirely to the left or entirely to
+    the right of a position can be found without walking the string.
+
+    Attributes:
+        size: The length of the indexed string.
+        counters: A dictionary of key to (starts, ends) range counters."""
+
+    def __init__(self, size):
+        """Initialize SupportIndex."""
+        self.size = size
+        self.counters = {}
+
+    def get_counters(self, key):
+        """Return the range counters for the given key, creating them if
+        needed."""
+        counters = self.counters.get(key)
+        if counters is None:
+            counters = tuple(RangeCounter(self.size) for _ in range(2))
+            self.counters[key] = counters
+        return counters
+
+    def add(self, key, left_position, right_position, amount=1):
+        """Index a structure spanning the given letter positions."""
+        starts, ends = self.get_counters(key)
+        starts.add(left_position, amount)
+        ends.add(right_position, amount)
+
+    def remove(self, key, left_position, right_position):
+        """Remove a structure spanning the given letter positions."""
+        self.add(key, left_position, right_position, -1)
+
+    def count_before(self, key, position):
+        """Return the number of structures ending before the given position."""
+        if key not in self.counters or position <= 0:
+            return 0
+        return self.counters[key][1].prefix(position - 1)
+
+    def count_after(self, key, position):
+        """Return the number of structures starting after the given position."""
+        if key not in self.counters:
+            return 0
+        return self.counters[key][0].range(position + 1, self.size - 1)
+
+
+class GroupIndex(SupportIndex):
+    """GroupIndex keeps the built groups of a string by category.
+
+    Besides the range counts of a SupportIndex, it keeps the list of groups
+    under each (group category, direction category) key and a version number
+    for each key that changes whenever a group with that key is built or
+    broken, so that values computed from a key's groups can be cached.
+
+    Attributes:
+        groups: A dictionary of key to the list of groups with that key.
+        versions: A dictionary of key to the key's version number."""
+
+    def __init__(self, size):
+        """Initialize GroupIndex."""
+        super(GroupIndex, self).__init__(size)
+        self.groups = {}
+        self.versions = {}
+
+    def add_group(self, group):
+        """Index a built group."""
+        key = group.support_key()
+        self.add(key, group.left_string_position, group.right_string_position)
+        self.groups.setdefault(key, []).append(group)
+        self.versions[key] = self.versions.get(key, 0) + 1
+
+    def remove_group(self, group):
+        """Remove a broken group from the index."""
+        key = group.support_key()
+        groups = self.groups.get(key, [])
+        for index, member in enumerate(groups):
+            if member is group:
+                del groups[index]
+                self.remove(key, group.left_string_position,
+                            group.right_string_position)
+                self.versions[key] += 1
+                break
+
+    def get_groups(self, key):
+        """Return the groups with the given key."""
+        return self.groups.get(key, [])
+
+    def version(self, key):
+        """Return the version number of the given key."""
+        return self.versions.get(key, 0)
+
+
+class BondChains(object):
+    """BondChains keeps the maximal runs of compatible built bonds in a string.
+
+    Two bonds are compatible if they share a bond facet and either have the
+    same bond category and direction category, or one is the flipped version
+    of the other. A run is a list of compatible bonds ordered from left to
+    right in which each bond's right object is the next bond's left object.
+
+    Attributes:
+        chains: A dictionary of bond id to the run containing that bond."""
+
+    def __init__(self):
+        """Initialize BondChains."""
+        self.chains = {}
+
+    def add(self, bond):
+        """Add a newly built bond, joining it to the runs of its neighbors."""
+        self.remove(bond)
+        key = bond.chain_key()
+        left = self.split(bond.left_object.left_bond, key, after=True)
+        right = self.split(bond.right_object.right_bond, key, after=False)
+        self.register(left + [bond] + right)
+
+    def remove(self, bond):
+        """Remove a broken bond, splitting its run in two."""
+        chain = self.chains.pop(id(bond), None)
+        if chain is None:
+            return
+        index = self.position(chain, bond)
+        self.register(chain[:index])
+        self.register(chain[index + 1:])
+
+    def chain(self, bond):
+        """Return the run containing the given bond."""
+        return self.chains.get(id(bond), [bond])
+
+    def split(self, neighbor, key, after):
+        """Return the part of the neighbor's run that a new bond with the
+        given key can join, leaving the rest of the run as a run of its own.
+
+        If after is True the new bond follows the neighbor, so the part up to
+        and including the neighbor is returned; otherwise the part starting at
+        the neighbor is returned."""
+        chain = self.chains.get(id(neighbor))
+        if chain is None or chain[0].chain_key() != key:
+            return []
+        index = self.position(chain, neighbor)
+        if after:
+            joined, rest = chain[:index + 1], chain[index + 1:]
+        else:
+            joined, rest = chain[index:], chain[:index]
+        self.register(rest)
+        return joined
+
+    def register(self, chain):
+        """Point each bond in the run at the run."""
+        for bond in chain:
+            self.chains[id(bond)] = chain
+
+    @staticmethod
+    def position(chain, bond):
+        """Return the index of the given bond in the run."""
+        for index, member in enumerate(chain):
+            if member is bond:
+                return index
+
+
+class CorrespondenceIndex(object):
+    """CorrespondenceIndex keeps the built correspondences of the workspace by
+    the objects and concept mapping descriptors they involve.
+
+    Two correspondences can only be incompatible with or support each other
+    if they share an object or have concept mappings whose descriptors are
+    related, so only the correspondences found under those keys need to be
+    compared.
+
+    Attributes:
+        by_object1: A dictionary of initial string object to correspondences.
+        by_object2: A dictionary of target string object to correspondences.
+        by_descriptor1: A dictionary of descriptor to the correspondences with
+            a concept mapping from that descriptor.
+        by_descriptor2: A dictionary of descriptor to the correspondences with
+            a concept mapping to that descriptor.
+        entries: A dictionary of correspondence id to the (table, key) pairs
+            the correspondence is indexed under."""
+
+    def __init__(self):
+        """Initialize CorrespondenceIndex."""
+        self.by_object1 = {}
+        self.by_object2 = {}
+        self.by_descriptor1 = {}
+        self.by_descriptor2 = {}
+        self.entries = {}
+
+    def add(self, correspondence):
+        """Index a built correspondence."""
+        entries = [(self.by_object1, correspondence.object1),
+                   (self.by_object2, correspondence.object2)]
+        for mapping in correspondence.get_concept_mappings():
+            entries.append((self.by_descriptor1, mapping.descriptor1))
+            entries.append((self.by_descriptor2, mapping.descriptor2))
+        for table, key in entries:
+            correspondences = table.setdefault(key, [])
+            if not any(member is correspondence for member in correspondences):
+                correspondences.append(correspondence)
+        self.entries[id(correspondence)] = entries
+
+    def remove(self, correspondence):
+        """Remove a broken correspondence from the index."""
+        for table, key in self.entries.pop(id(correspondence), []):
+            correspondences = table.get(key, [])
+            for index, member in enumerate(correspondences):
+                if member is correspondence:
+                    del correspondences[index]
+                    break
+            if not correspondences:
+                table.pop(key, None)
+
+    def update(self, correspondence):
+        """Reindex a built correspondence whose concept mappings changed."""
+        if id(correspondence) in self.entries:
+            self.remove(correspondence)
+            self.add(correspondence)
+
+    def candidates(self, correspondence, mappings):
+        """Return the built correspondences that share an object with the
+        given correspondence or have a concept mapping with descriptors
+        related to those of the given mappings."""
+        candidates = {}
+        for table, obj in [(self.by_object1, correspondence.object1),
+                           (self.by_object2, correspondence.object2)]:
+            for other in table.get(obj, []):
+                candidates[id(other)] = other
+        for mapping in mappings:
+            for table, descriptor in [(self.by_descriptor1, mapping.descriptor1),
+                                      (self.by_descriptor2, mapping.descriptor2)]:
+                nodes = [descriptor] + \
+                        [link.to_node for link in descriptor.outgoing_links()]
+                for node in nodes:
+                    for other in table.get(node, []):
+                        candidates[id(other)] = other
+        return list(candidates.values())
@@ -28,6 +28,8 @@ class Letter(Object):
         left_string_position: Position in the string.
         right_string_position: Position in the string."""
 
+    __slots__ = ('name', 'category')
+
     def __init__(self, workspace, name, string, category, string_position):
         """Initialize Letter."""
         super(Letter, self).__init__(workspace)
@@ -28,7 +28,13 @@ class Mapping(object):
         descritpor2:
         object1:
         object2:
-        label:"""
+        label:
+        symmetric_mapping: The symmetric version of the mapping, or False if
+            it has not been made yet."""
+
+    __slots__ = ('workspace', 'slipnet', 'description_type1',
+                 'description_type2', 'descriptor1', 'descriptor2',
+                 'label', 'object1', 'object2', 'symmetric_mapping')
 
     def __init__(self, workspace, description_type1, description_type2,
                  descriptor1, descriptor2, object1, object2):
@@ -42,6 +48,7 @@ class Mapping(object):
         self.label = self.slipnet.get_label_node(descriptor1, descriptor2)
         self.object1 = object1
         self.object2 = object2
+        self.symmetric_mapping = False
 
     def slippability(self):
         """Return a value representing the ease with which this slippage can be
@@ -133,17 +140,24 @@ class Mapping(object):
         """Return a symmetric version of this mapping.
 
         For example, if the concept mapping is 'rightmost -> leftmost', return
-        'leftmost -> rightmost'."""
+        'leftmost -> rightmost'. Return None if there is no symmetric
+        version."""
+        if self.symmetric_mapping is False:
+            self.symmetric_mapping = self.calculate_symmetric_version()
+        return self.symmetric_mapping
+
+    def calculate_symmetric_version(self):
+        """Make the symmetric version of this mapping."""
         if self.label == self.slipnet.plato_identity:
             return self
         elif self.slipnet.get_label_node(self.descriptor2, self.descriptor1) !=\
                 self.label:
             return None
         else:
-            return Mapping(self.workspace,
-                           self.description_type2, self.description_type1,
-                           self.descriptor2, self.descriptor1,
-                           self.object1, self.object2)
+            return self.workspace.get_mapping(self.description_type2,
+                                              self.description_type1,
+                                              self.descriptor2, self.descriptor1,
+                                              self.object1, self.object2)
 
     def are_contradictory_concept_mappings(self, other):
         """Return True if the two concept mappings contradict each other."""
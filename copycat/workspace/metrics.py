@@ -0,0 +1,142 @@
+# Copyright (c) 2007-2017 Joseph Hager.
+#
+# Copycat is free software; you can redistribute it and/or modify
+# it under the terms of version 2 of the GNU General Public License,
+# as published by the Free Software Foundation.
+#
+# Copycat is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Copycat; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.
+
+
+"""Object values computed over arrays.
+
+Once the strengths of the structures have been updated, the ten values of
+each object depend only on its own descriptions and structures. They are
+worked out for all the objects at once by gathering those inputs into NumPy
+arrays, one entry per object, and computing each value with a vectorized
+expression that matches Object.update_object_values exactly.
+
+NumPy is optional. It is imported the first time there are enough objects to
+make it worthwhile, and without it the objects update themselves one by one."""
+
+VECTORIZE_MINIMUM = 32
+
+_numpy = None
+
+def get_numpy():
+    """Return the numpy module, or None if it is not installed."""
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = False
+    return _numpy or None
+
+def update_object_values(objects):
+    """Update the values of all the objects, in arrays if there are enough of
+    them and NumPy is installed."""
+    numpy = None
+    if len(objects) >= VECTORIZE_MINIMUM:
+        numpy = get_numpy()
+    if numpy is None:
+        for obj in objects:
+            obj.update_object_values()
+        return
+    values = calculate_object_values(numpy, gather_object_inputs(objects))
+    store_object_values(objects, values)
+
+INPUTS = ['activation', 'changed', 'grouped', 'whole', 'group', 'bonded',
+          'edge', 'first_bond', 'bond_sum', 'correspondence', 'clamped',
+          'relative_importance']
+
+VALUES = ['raw_importance', 'intra_string_happiness',
+          'intra_string_unhappiness', 'inter_string_happiness',
+          'inter_string_unhappiness', 'total_happiness', 'total_unhappiness',
+          'intra_string_salience', 'inter_string_salience', 'total_salience']
+
+def gather_object_inputs(objects):
+    """Return a list with a tuple of the inputs named in INPUTS for each
+    object."""
+    rows = []
+    for obj in objects:
+        bonds = obj.incoming_bonds + obj.outgoing_bonds
+        group = obj.group
+        correspondence = obj.correspondence
+        rows.append((
+            sum([d.descriptor.activation for d in obj.descriptions
+                 if d.description_type.activation == 100]),
+            obj.is_changed,
+            group is not None,
+            obj.spans_whole_string(),
+            group.total_strength if group else 0,
+            bool(bonds),
+            obj.left_string_position == 0 or
+            obj.right_string_position == obj.string.length - 1,
+            bonds[0].total_strength if bonds else 0,
+            sum([bond.total_strength for bond in bonds]),
+            correspondence.total_strength if correspondence else 0,
+            obj.clamp_salience,
+            obj.relative_importance))
+    return rows
+
+def calculate_object_values(numpy, rows):
+    """Return a list with a tuple of the values named in VALUES for each
+    object, worked out from the gathered inputs."""
+    (activation, changed, grouped, whole, group, bonded, edge, first_bond,
+     bond_sum, correspondence, clamped, importance) = \
+        numpy.array(rows, dtype=float).T
+    changed = changed > 0
+    grouped = grouped > 0
+    clamped = clamped > 0
+
+    raw_importance = numpy.minimum(300, activation)
+    raw_importance = numpy.where(changed, raw_importance * 2, raw_importance)
+    raw_importance = numpy.where(grouped, raw_importance * (2/3.0),
+                                 raw_importance)
+
+    intra_happiness = numpy.select(
+        [whole > 0, grouped, bonded == 0, edge > 0],
+        [100, group, 0, numpy.rint(first_bond / 3.0)],
+        numpy.rint(bond_sum / 6.0))
+    intra_unhappiness = 100 - intra_happiness
+    inter_happiness = correspondence
+    inter_unhappiness = 100 - inter_happiness
+    total_happiness = numpy.rint((intra_happiness + inter_happiness) / 2.0)
+    total_unhappiness = 100 - total_happiness
+
+    intra_salience = numpy.where(clamped, 100, numpy.trunc(
+        (2 * importance + 8 * intra_unhappiness) / 10.0))
+    inter_salience = numpy.where(clamped, 100, numpy.trunc(
+        (8 * importance + 2 * inter_unhappiness) / 10.0))
+    total_salience = numpy.rint((intra_salience + inter_salience) / 2.0)
+
+    values = numpy.array([intra_happiness, intra_unhappiness,
+                          inter_happiness, inter_unhappiness,
+                          total_happiness, total_unhappiness,
+                          intra_salience, inter_salience, total_salience])
+    return list(zip(raw_importance.tolist(),
+                    *values.astype(int).tolist()))
+
+def store_object_values(objects, values):
+    """Set the values of each object, keeping its string's running totals up
+    to date as Object.update_object_values does."""
+    for obj, row in zip(objects, values):
+        counted = obj.counted_in_string
+        if counted:
+            obj.string.remove_object_values(obj)
+        (obj.raw_importance, obj.intra_string_happiness,
+         obj.intra_string_unhappiness, obj.inter_string_happiness,
+         obj.inter_string_unhappiness, obj.total_happiness,
+         obj.total_unhappiness, obj.intra_string_salience,
+         obj.inter_string_salience, obj.total_salience) = row
+        if counted:
+            obj.string.add_object_values(obj)
@@ -16,7 +16,7 @@
 
 """Replacement"""
 
-from copycat.workspace import Structure
+from copycat.workspace import Structure, STRUCTURE_SLOTS
 
 class Replacement(Structure):
     """Replacement
@@ -25,6 +25,8 @@ class Replacement(Structure):
         object1: The object to replace.
         object2: The object replaced with."""
 
+    __slots__ = STRUCTURE_SLOTS + ('object1', 'object2')
+
     def __init__(self, object1, object2):
         """Initialize Replacement."""
         super(Replacement, self).__init__()
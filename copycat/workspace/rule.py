@@ -16,7 +16,7 @@
 
 """Rule"""
 
-from copycat.workspace import Structure
+from copycat.workspace import Structure, STRUCTURE_SLOTS
 import copycat.toolbox as toolbox
 
 class Rule(Structure):
@@ -32,6 +32,12 @@ class Rule(Structure):
         relation:
         structure_category:"""
 
+    __slots__ = STRUCTURE_SLOTS + ('workspace', 'slipnet',
+                                   'object_category1', 'descriptor1_facet',
+                                   'descriptor1', 'object_category2',
+                                   'replaced_description_type',
+                                   'descriptor2', 'relation')
+
     def __init__(self, workspace, object_category1, descriptor1_facet,
                  descriptor1, object_category2, replaced_description_type,
                  descriptor2):
@@ -59,6 +65,13 @@ class Rule(Structure):
                     self.replaced_description_type == \
                         other.replaced_description_type])
 
+    def key(self):
+        """Return a tuple of the nodes making up the rule, which is the same
+        for equal rules."""
+        return (self.object_category1, self.descriptor1_facet, self.descriptor1,
+                self.object_category2, self.descriptor2, self.relation,
+                self.replaced_description_type)
+
     def to_string(self):
         """Convert the rule to a human readable sentence."""
         if self.has_no_change():
@@ -67,7 +80,7 @@ class Rule(Structure):
         if self.slipnet.is_adjective(self.descriptor1):
             part1 = "%s of %s %s" % (self.replaced_description_type.name,
                                      self.descriptor1.name,
-                                     self.object_cateogry1.name)
+                                     self.object_category1.name)
         else:
             if not self.object_category1:
                 part1 = self.descriptor1.name
@@ -124,9 +137,10 @@ class Rule(Structure):
             shared_descriptor_term = 0
         else:
             slipped_descriptors = []
+            slippage_map = self.workspace.slippage_map(last=True)
             for description in i_object_corresponding_object.relevant_descriptions():
-                slips = description.apply_slippages(i_object_corresponding_object,
-                                                    self.workspace.slippages())
+                slips = description.apply_slippage_map(i_object_corresponding_object,
+                                                       slippage_map)
                 slipped_descriptors.append(slips.descriptor)
             if self.descriptor1 in slipped_descriptors:
                 shared_descriptor_term = 100
@@ -19,13 +19,32 @@
 import random
 
 import copycat.toolbox as toolbox
+from copycat.workspace.index import BondChains, GroupIndex, SupportIndex
+from copycat.workspace import events
 
 class String(object):
     """String is a letter string in the workspace.
 
     This could be the initial string, modified string or target string.
     Each object in a string has a unique string number that identifies
-    it from other objects in the string."""
+    it from other objects in the string.
+
+    Built bonds and groups are also kept in support indexes keyed by their
+    category and direction category, which are used to measure local support
+    without walking the string, and built bonds are kept in runs of
+    compatible bonds so group scouts can look runs up directly.
+
+    The string keeps running totals of the raw importance and unhappiness of
+    its letters and built groups, adjusted whenever one of those values
+    changes, so that averages over the string can be read without summing
+    over its objects.
+
+    Objects chosen by salience or importance are sampled from weighted
+    samplers built once per update, or when the string's objects change.
+
+    The string's group version counts the letters and groups added to and
+    removed from it, so that what objects cache about their surroundings can
+    be checked against it."""
 
     def __init__(self, workspace, string):
         self.workspace = workspace
@@ -40,8 +59,19 @@ class String(object):
         self.left_right_bonds = {}
         self.from_to_bonds = {}
         self.proposed_bonds = {}
+        self.sorted_letters = None
+        self.bond_index = SupportIndex(self.length)
+        self.group_index = GroupIndex(self.length)
+        self.bond_chains = BondChains()
         self.intra_string_unhappiness = 0
+        self.raw_importance_total = 0
+        self.intra_string_unhappiness_total = 0
+        self.weighted_intra_string_unhappiness = 0
+        self.weighted_inter_string_unhappiness = 0
+        self.weighted_total_unhappiness = 0
         self.bonds_to_scan_distribution = range(self.length)
+        self.samplers = {}
+        self.group_version = 0
 
     def add_to_object_positions(self, obj, position):
         """Add an object to the object positions."""
@@ -62,10 +92,17 @@ class String(object):
         position = letter.left_string_position
         self.letters[position] = letter
         self.add_to_object_positions(letter, position)
+        self.add_object_values(letter)
+        self.sorted_letters = None
+        self.group_version += 1
+        self.invalidate_samplers()
 
     def get_letters(self):
         """Return a list of letters in the string."""
-        return [self.letters[index] for index in sorted(self.letters.keys())]
+        if self.sorted_letters is None:
+            self.sorted_letters = [self.letters[index]
+                                   for index in sorted(self.letters.keys())]
+        return list(self.sorted_letters)
 
     def get_letter(self, position):
         """Return the letter at the given position in the string."""
@@ -87,16 +124,30 @@ class String(object):
         """Add a group to the string."""
         self.highest_string_number += 1
         group.string_number = self.highest_string_number
+        existing_group = self.groups.get(group.left_object.string_number)
+        if existing_group:
+            self.group_index.remove_group(existing_group)
+            self.remove_object_values(existing_group)
         self.groups[group.left_object.string_number] = group
+        self.group_index.add_group(group)
+        self.add_object_values(group)
         self.add_to_object_positions(group, group.left_string_position)
         self.add_to_object_positions(group, group.right_string_position)
+        self.group_version += 1
+        self.invalidate_samplers()
+        if existing_group and existing_group is not group:
+            self.workspace.notify(events.GROUP_BROKEN, existing_group)
 
     def remove_group(self, group):
         """Remove a group from the string."""
-        if group.left_object.string_number in self.groups:
+        if self.groups.get(group.left_object.string_number) is group:
             del self.groups[group.left_object.string_number]
+            self.group_index.remove_group(group)
+            self.remove_object_values(group)
         self.remove_from_object_positions(group, group.left_string_position)
         self.remove_from_object_positions(group, group.right_string_position)
+        self.group_version += 1
+        self.invalidate_samplers()
 
     def get_groups(self):
         """Return a list of groups in the string."""
@@ -114,7 +165,7 @@ class String(object):
         the given group."""
         existing_group = self.groups.get(group.left_object.string_number)
         if existing_group:
-            if existing_group.length == group.length and \
+            if existing_group.length() == group.length() and \
                  existing_group.group_category == group.group_category and \
                  existing_group.direction_category == group.direction_category:
                 return existing_group
@@ -133,12 +184,16 @@ class String(object):
         position = (group.left_object.string_number,
                     group.right_object.string_number)
         items = self.proposed_groups.get(position, [])
-        if group in items:
-            self.proposed_groups[position].remove(group)
+        for index, item in enumerate(items):
+            if item is group:
+                del items[index]
+                self.workspace.notify(events.GROUP_WITHDRAWN, group)
+                break
 
     def get_proposed_groups(self):
         """Return a list of the proposed groups in the string."""
-        return list(set(toolbox.flatten(self.proposed_groups.values())))
+        return list(dict.fromkeys(
+            toolbox.flatten(self.proposed_groups.values())))
 
     def get_proposed_group(self, first, second):
         """Return the proposed group at first, second position."""
@@ -148,6 +203,13 @@ class String(object):
         """Add a bond to the string, sameness bonds in both directions."""
         left_number = bond.left_object.string_number
         right_number = bond.right_object.string_number
+        existing_bond = self.left_right_bonds.get((left_number, right_number))
+        if existing_bond:
+            self.bond_index.remove(existing_bond.support_key(),
+                                   existing_bond.left_string_position,
+                                   existing_bond.right_string_position)
+        self.bond_index.add(bond.support_key(), bond.left_string_position,
+                            bond.right_string_position)
         self.left_right_bonds[(left_number, right_number)] = bond
 
         from_number = bond.from_object.string_number
@@ -158,27 +220,56 @@ class String(object):
             self.left_right_bonds[(right_number, left_number)] = bond
             self.from_to_bonds[(to_number, from_number)] = bond
 
+        if existing_bond and existing_bond is not bond:
+            self.workspace.notify(events.BOND_BROKEN, existing_bond)
+
     def remove_bond(self, bond):
-        """Remove a built bond from the string."""
+        """Remove a built bond from the string, leaving any other bond
+        between the same objects in place."""
         left_number = bond.left_object.string_number
         right_number = bond.right_object.string_number
-        if (left_number, right_number) in self.left_right_bonds:
+        if self.left_right_bonds.get((left_number, right_number)) is bond:
             del self.left_right_bonds[(left_number, right_number)]
+            self.bond_index.remove(bond.support_key(),
+                                   bond.left_string_position,
+                                   bond.right_string_position)
 
         from_number = bond.from_object.string_number
         to_number = bond.to_object.string_number
-        if (from_number, to_number) in self.from_to_bonds:
+        if self.from_to_bonds.get((from_number, to_number)) is bond:
             del self.from_to_bonds[(from_number, to_number)]
 
         if bond.bond_category == self.slipnet.plato_sameness:
-            if (right_number, left_number) in self.left_right_bonds:
+            if self.left_right_bonds.get((right_number, left_number)) is bond:
                 del self.left_right_bonds[(right_number, left_number)]
-            if (to_number, from_number) in self.from_to_bonds:
+            if self.from_to_bonds.get((to_number, from_number)) is bond:
                 del self.from_to_bonds[(to_number, from_number)]
 
     def get_bonds(self):
         """Return a list of the built bonds in the string."""
-        return list(set(self.from_to_bonds.values()))
+        return list(dict.fromkeys(self.from_to_bonds.values()))
+
+    def get_bond_run(self, bond, direction, number):
+        """Return up to number bonds following the given built bond in the
+        given direction, nearest first, that could join it in a group.
+
+        Bonds that are the flipped version of the given bond are returned
+        flipped, so every returned bond matches its bond category and
+        direction category."""
+        chain = self.bond_chains.chain(bond)
+        index = BondChains.position(chain, bond)
+        if direction == self.slipnet.plato_left:
+            following = chain[max(0, index - number):index][::-1]
+        else:
+            following = chain[index + 1:index + 1 + number]
+        run = []
+        for next_bond in following:
+            if next_bond.bond_category == bond.bond_category and \
+               next_bond.direction_category == bond.direction_category:
+                run.append(next_bond)
+            else:
+                run.append(next_bond.flipped_version())
+        return run
 
     def get_bond(self, from_object, to_object):
         """Return the bond between the two objects, if any."""
@@ -209,12 +300,16 @@ class String(object):
                     bond.to_object.string_number)
         if position in self.proposed_bonds:
             items = self.proposed_bonds[position]
-            if bond in items:
-                self.proposed_bonds[position].remove(bond)
+            for index, item in enumerate(items):
+                if item is bond:
+                    del items[index]
+                    self.workspace.notify(events.BOND_WITHDRAWN, bond)
+                    break
 
     def get_proposed_bonds(self):
         """Return a list of proposed bonds in the string."""
-        return list(set(toolbox.flatten(self.proposed_bonds.values())))
+        return list(dict.fromkeys(
+            toolbox.flatten(self.proposed_bonds.values())))
 
     def get_proposed_bond(self, first, second):
         """Return a proposed bonds at first, second in the string."""
@@ -235,14 +330,24 @@ class String(object):
         return [o for o in self.get_objects() if not o.spans_whole_string()]
 
     def get_random_object(self, method=None):
-        """Return a random object from the string."""
+        """Return a random object from the string, chosen probabilistically
+        (adjusted for temperature) by the given method if there is one."""
         if method:
-            objects = self.get_objects()
-            values = [getattr(obj, method) for obj in objects]
-            values = self.workspace.temperature_adjusted_values(values)
-            return objects[toolbox.weighted_index(values)]
+            sampler = self.samplers.get(method)
+            if sampler is None:
+                objects = self.get_objects()
+                values = [getattr(obj, method) for obj in objects]
+                values = self.workspace.temperature_adjusted_values(values)
+                sampler = toolbox.WeightedSampler(values, objects)
+                self.samplers[method] = sampler
+            return sampler.choose()
         return random.choice(self.get_objects())
 
+    def invalidate_samplers(self):
+        """Forget the object samplers of the string and the workspace."""
+        self.samplers.clear()
+        self.workspace.samplers.clear()
+
     def get_random_leftmost_object(self):
         """Return a random leftmost object from the string."""
         leftmost_objects = []
@@ -257,20 +362,42 @@ class String(object):
     def update_relative_importances(self):
         """Update the relative, normalized importances of all the objects in
         the string."""
-        raw_importance = sum([o.raw_importance for o in self.get_objects()])
+        raw_importance = self.raw_importance_total
         for obj in self.get_objects():
             if raw_importance == 0:
                 importance = 0
             else:
                 quot = obj.raw_importance / float(raw_importance)
                 importance = round(100 * quot)
+            self.remove_object_values(obj)
             obj.relative_importance = importance
+            self.add_object_values(obj)
 
     def update_intra_string_unhappiness(self):
         """Calculate the average of the intra-string unhappiness of all the
         objects in the string."""
-        unhappiness = [o.intra_string_unhappiness for o in self.get_objects()]
-        self.intra_string_unhappiness = round(toolbox.average(*unhappiness))
+        count = len(self.letters) + len(self.groups)
+        unhappiness = self.intra_string_unhappiness_total / float(count)
+        self.intra_string_unhappiness = round(unhappiness)
+
+    def add_object_values(self, obj, sign=1):
+        """Add the object's importance and unhappiness to the string's
+        running totals, or remove them if sign is -1."""
+        importance = obj.relative_importance
+        self.raw_importance_total += sign * obj.raw_importance
+        self.intra_string_unhappiness_total += sign * obj.intra_string_unhappiness
+        self.weighted_intra_string_unhappiness += \
+                sign * importance * obj.intra_string_unhappiness
+        self.weighted_inter_string_unhappiness += \
+                sign * importance * obj.inter_string_unhappiness
+        self.weighted_total_unhappiness += sign * importance * obj.total_unhappiness
+        obj.counted_in_string = sign > 0
+
+    def remove_object_values(self, obj):
+        """Remove the object's importance and unhappiness from the string's
+        running totals."""
+        if obj.counted_in_string:
+            self.add_object_values(obj, -1)
 
     def local_bond_category_relevance(self, bond_category):
         """A function of how many bonds in the string have the given bond
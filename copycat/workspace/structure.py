@@ -18,6 +18,12 @@
 
 import copycat.toolbox as toolbox
 
+# The attributes set by Structure.__init__. Structure itself has no slots so
+# that Group can inherit from both Object and Structure; subclasses add these
+# to their own __slots__ instead.
+STRUCTURE_SLOTS = ('string', 'structure_category', 'group', 'internal_strength',
+                   'external_strength', 'total_strength', 'proposal_level')
+
 class Structure(object):
     """Structure
 
@@ -29,6 +35,8 @@ class Structure(object):
         external_strength:
         total_strength:"""
 
+    __slots__ = ()
+
     def __init__(self):
         """Initialize Structure."""
         self.string = None
@@ -19,6 +19,9 @@
 import random
 import copycat.toolbox as toolbox
 
+# The number of other objects whose concept mappings an object remembers.
+MAPPING_CACHE_SIZE = 16
+
 class Object(object):
     """Object is either a letter or group in the workspace.
 
@@ -49,7 +52,33 @@ class Object(object):
         correspondence:
         is_change: True if the letter is the initial_string letter that changed.
         is_new_answer_letter: True if this is the new letter for the answer.
-        clamp_salience: True if the salience of the object is to be clamped."""
+        clamp_salience: True if the salience of the object is to be clamped.
+        counted_in_string: True if the object's values are included in the
+            running totals of its string.
+        description_version: Incremented whenever the object gains a
+            description.
+        mapping_cache: A dictionary of other object id to (other object,
+            description versions, mappings) for the concept mappings made
+            between the two objects' descriptions.
+        descriptor_cache: A dictionary of description type to (versions,
+            descriptors) for the possible descriptors of the object, where
+            versions are the string's group version and the object's
+            description version they were found at."""
+
+    __slots__ = ('workspace', 'slipnet', 'type_name', 'string',
+                 'string_number', 'left_string_position',
+                 'right_string_position', 'raw_importance',
+                 'relative_importance', 'intra_string_happiness',
+                 'intra_string_unhappiness', 'inter_string_happiness',
+                 'inter_string_unhappiness', 'total_happiness',
+                 'total_unhappiness', 'intra_string_salience',
+                 'inter_string_salience', 'total_salience',
+                 'descriptions', 'extrinsic_descriptions',
+                 'outgoing_bonds', 'incoming_bonds', 'left_bond',
+                 'right_bond', 'group', 'replacement', 'correspondence',
+                 'is_changed', 'is_new_answer_letter', 'clamp_salience',
+                 'counted_in_string', 'description_version',
+                 'mapping_cache', 'descriptor_cache', 'objects')
 
     def __init__(self, workspace):
         """Initializes Object."""
@@ -83,6 +112,10 @@ class Object(object):
         self.is_changed = False
         self.is_new_answer_letter = False
         self.clamp_salience = False
+        self.counted_in_string = False
+        self.description_version = 0
+        self.mapping_cache = {}
+        self.descriptor_cache = {}
         self.objects = []
 
     def flipped_version(self):
@@ -179,6 +212,9 @@ class Object(object):
 
     def update_object_values(self):
         """Update all the values for the object."""
+        counted = self.counted_in_string
+        if counted:
+            self.string.remove_object_values(self)
         self.raw_importance = self.calculate_raw_importance()
         self.intra_string_happiness = self.calculate_intra_string_happiness()
         self.intra_string_unhappiness = self.calculate_intra_string_unhappiness()
@@ -189,6 +225,8 @@ class Object(object):
         self.intra_string_salience = self.calculate_intra_string_salience()
         self.inter_string_salience = self.calculate_inter_string_salience()
         self.total_salience = self.calculate_total_salience()
+        if counted:
+            self.string.add_object_values(self)
 
     def letter_span(self):
         """Return the number of letters spanned by the object."""
@@ -211,8 +249,7 @@ class Object(object):
 
     def is_rightmost_in_string(self):
         """Return True if object is rightmost in its string."""
-        right_position = len(self.string.get_letters()) - 1
-        return self.right_string_position == right_position
+        return self.right_string_position == self.string.length - 1
 
     def is_middle_in_string(self):
         """Return True if object is in the middle of its string."""
@@ -318,8 +355,38 @@ class Object(object):
 
     def add_description(self, description):
         """Add the given description to the object's description list."""
-        description.descriptor_number = len(self.descriptions)
+        description.description_number = len(self.descriptions)
         self.descriptions.append(description)
+        self.description_version += 1
+
+    def get_mapping_cache(self, other):
+        """Return the dictionary of (description, description) ids to
+        (description, description, concept mapping) for mappings between this
+        object's descriptions and the other object's.
+
+        The dictionary is discarded when either object gains a description."""
+        versions = (self.description_version, other.description_version)
+        entry = self.mapping_cache.get(id(other))
+        if entry is None or entry[0] is not other or entry[1] != versions:
+            if entry is None and len(self.mapping_cache) >= MAPPING_CACHE_SIZE:
+                del self.mapping_cache[next(iter(self.mapping_cache))]
+            entry = (other, versions, {})
+            self.mapping_cache[id(other)] = entry
+        return entry[2]
+
+    def get_possible_descriptors(self, description_type):
+        """Return a list of the instances of the description type that could
+        be used as descriptors for the object.
+
+        The list is kept until a letter or group is added to or removed from
+        the object's string, or the object gains a description, since the
+        description testers only look at those."""
+        versions = (self.string.group_version, self.description_version)
+        entry = self.descriptor_cache.get(description_type)
+        if entry is None or entry[0] != versions:
+            entry = (versions, description_type.get_possible_descriptors(self))
+            self.descriptor_cache[description_type] = entry
+        return entry[1]
 
     def add_extrinsic_description(self, description):
         """Add the given extrinsic description to the object's extrinsic
@@ -0,0 +1,134 @@
+# Copyright (c) 2007-2017 Joseph Hager.
+#
+# Copycat is free software; you can redistribute it and/or modify
+# it under the terms of version 2 of the GNU General Public License,
+# as published by the Free Software Foundation.
+#
+# Copycat is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Copycat; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.
+
+
+"""Tests for compiling slipnet definitions."""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from copycat.slipnet import Slipnet
+from copycat.slipnet.definition import Definition, DEFINITION, LINK_KINDS
+
+def standard():
+    """Return the data of the standard slipnet definition."""
+    with open(DEFINITION) as source:
+        return json.load(source)
+
+def compile_data(data):
+    """Return the definition compiled from the given data."""
+    return Definition(json.dumps(data))
+
+class CompileTest(unittest.TestCase):
+    """The standard definition compiles into the slipnet it describes."""
+
+    def test_standard_definition(self):
+        data = standard()
+        definition = compile_data(data)
+        self.assertEqual(len(definition.names), len(data['nodes']))
+        self.assertEqual(len(definition.link_kinds), len(data['links']))
+        self.assertEqual(len(definition.letters), 26)
+        for link, kind, start, end in zip(data['links'], definition.link_kinds,
+                                          definition.link_from,
+                                          definition.link_to):
+            self.assertEqual(LINK_KINDS[kind], link[0])
+            self.assertEqual(definition.names[start], link[1])
+            self.assertEqual(definition.names[end], link[2])
+
+    def test_slipnet_is_built_from_definition(self):
+        slipnet = Slipnet()
+        definition = Definition.load()
+        self.assertEqual([node.name for node in slipnet.slipnodes],
+                         list(definition.names))
+        self.assertEqual(slipnet.get_plato_letter('q').name, 'q')
+
+    def test_cached_definition_is_loaded(self):
+        directory = tempfile.mkdtemp()
+        try:
+            with open(DEFINITION, 'rb') as source:
+                text = source.read()
+            key = Definition(text).digest
+            compiled = Definition.cached(text, key, directory)
+            loaded = Definition.cached(text, key, directory)
+            self.assertIsNot(loaded, compiled)
+            self.assertEqual(loaded.names, compiled.names)
+            self.assertEqual(loaded.link_to, compiled.link_to)
+            for name in os.listdir(directory):
+                with open(os.path.join(directory, name), 'wb') as cache:
+                    cache.write(b'not a definition')
+            self.assertEqual(Definition.cached(text, key, directory).names,
+                             compiled.names)
+        finally:
+            shutil.rmtree(directory)
+
+class RejectTest(unittest.TestCase):
+    """Definitions that refer to things that do not exist are rejected."""
+
+    def assertRejected(self, data, message):
+        with self.assertRaises(ValueError) as context:
+            compile_data(data)
+        self.assertIn(message, str(context.exception))
+
+    def test_duplicate_slipnode(self):
+        data = standard()
+        data['nodes'].append(dict(data['nodes'][0]))
+        self.assertRejected(data, 'Duplicate slipnode')
+
+    def test_unknown_slipnode(self):
+        data = standard()
+        data['links'].append(['slip', 'a', 'nowhere', None, None])
+        self.assertRejected(data, 'Unknown slipnode: nowhere')
+
+    def test_unknown_link_kind(self):
+        data = standard()
+        data['links'].append(['sideways', 'a', 'b', None, None])
+        self.assertRejected(data, 'Unknown link kind: sideways')
+
+    def test_missing_node(self):
+        data = standard()
+        for node in data['nodes']:
+            if node.get('attribute') == 'plato_opposite':
+                del node['attribute']
+        self.assertRejected(data, 'missing nodes for: plato_opposite')
+
+    def test_unknown_codelet(self):
+        data = standard()
+        for node in data['nodes']:
+            if node.get('codelets'):
+                node['codelets'] = node['codelets'] + ['BondBottomUpScuot']
+                break
+        self.assertRejected(data, 'Unknown codelet: BondBottomUpScuot')
+
+    def test_codelet_module_is_not_a_codelet(self):
+        data = standard()
+        data['nodes'][0]['codelets'] = ['bond']
+        self.assertRejected(data, 'Unknown codelet: bond')
+
+    def test_unknown_tester(self):
+        data = standard()
+        data['nodes'][0]['tester'] = 'no_such_tester'
+        self.assertRejected(data, 'Unknown description tester')
+
+    def test_unknown_group_iterator(self):
+        data = standard()
+        data['nodes'][0]['iterate_group'] = 'no_such_iterator'
+        self.assertRejected(data, 'Unknown group iterator')
+
+if __name__ == '__main__':
+    unittest.main()
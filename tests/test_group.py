@@ -0,0 +1,87 @@
+# Copyright (c) 2007-2017 Joseph Hager.
+#
+# Copycat is free software; you can redistribute it and/or modify
+# it under the terms of version 2 of the GNU General Public License,
+# as published by the Free Software Foundation.
+#
+# Copycat is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Copycat; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.
+
+
+"""Tests for group support and density."""
+
+import unittest
+
+from copycat.run import Run
+from copycat.workspace.group import Group
+
+class IndexedLocalDensityTest(unittest.TestCase):
+    """Group.local_density in long-string mode counts each stretch of
+    supporting groups once."""
+
+    def setUp(self):
+        self.run = Run('abc', 'abd', 'aaxyzbb', 0, long_strings=True)
+        self.workspace = self.run.workspace
+        self.string = self.workspace.target_string
+        self.category = self.run.slipnet.plato_sameness_group
+
+    def group(self, objects):
+        return Group(self.workspace, self.string, self.category, None,
+                     objects[0], objects[-1], objects, [])
+
+    def test_nested_groups_are_counted_once(self):
+        letters = self.string.get_letters()
+        inner = self.group(letters[0:2])
+        outer = self.group([inner])
+        self.string.group_index.add_group(inner)
+        self.string.group_index.add_group(outer)
+        group = self.group(letters[5:7])
+        # Five letters lie outside the group; the nested groups make one
+        # supporting slot of two letters, leaving three letters of their own.
+        self.assertEqual(group.local_density(), 25)
+
+    def test_density_is_at_most_100(self):
+        letters = self.string.get_letters()
+        inner = self.group(letters[0:2])
+        outer = self.group([inner])
+        self.string.group_index.add_group(inner)
+        self.string.group_index.add_group(outer)
+        group = self.group(letters[3:7])
+        # Counting both nested groups used to make two slots of support out
+        # of a single one, for a density of 200.
+        self.assertEqual(group.local_density(), 50)
+
+class LocalDensityTest(unittest.TestCase):
+    """Group.local_density walks the string unless it is in long-string
+    mode."""
+
+    def setUp(self):
+        self.run = Run('abc', 'abd', 'xaabby', 0)
+        self.workspace = self.run.workspace
+        self.string = self.workspace.target_string
+        self.category = self.run.slipnet.plato_sameness_group
+
+    def group(self, objects):
+        return Group(self.workspace, self.string, self.category, None,
+                     objects[0], objects[-1], objects, [])
+
+    def test_walk_matches_index(self):
+        letters = self.string.get_letters()
+        self.workspace.build_group(self.group(letters[1:3]))
+        group = self.group(letters[3:5])
+        self.assertFalse(self.workspace.long_string_mode)
+        # The x, the supporting aa and the y are three slots, one of them
+        # supported, whichever way the walk goes.
+        self.assertEqual(group.local_density(), 33)
+        self.workspace.long_string_mode = True
+        self.assertEqual(group.local_density(), 33)
+
+if __name__ == '__main__':
+    unittest.main()
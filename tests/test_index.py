@@ -0,0 +1,117 @@
+# Copyright (c) 2007-2017 Joseph Hager.
+#
+# Copycat is free software; you can redistribute it and/or modify
+# it under the terms of version 2 of the GNU General Public License,
+# as published by the Free Software Foundation.
+#
+# Copycat is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Copycat; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.
+
+
+"""Tests for the indexes over a string's structures."""
+
+import unittest
+
+from copycat.workspace.index import GroupIndex, RangeCounter, SupportIndex
+
+class RangeCounterTest(unittest.TestCase):
+    """RangeCounter sums ranges of positions like a plain list would."""
+
+    def test_ranges(self):
+        values = [3, 0, 1, 4, 1, 5, 9, 2]
+        counter = RangeCounter(len(values))
+        for position, value in enumerate(values):
+            counter.add(position, value)
+        for first in range(len(values)):
+            for last in range(len(values)):
+                self.assertEqual(counter.range(first, last),
+                                 sum(values[first:last + 1]))
+
+    def test_prefix_past_the_end(self):
+        counter = RangeCounter(4)
+        counter.add(3, 2)
+        self.assertEqual(counter.prefix(10), 2)
+
+class SupportIndexTest(unittest.TestCase):
+    """SupportIndex counts same-key structures on either side of a
+    position."""
+
+    def setUp(self):
+        self.index = SupportIndex(10)
+        self.spans = [(0, 1), (2, 4), (3, 3), (6, 9)]
+        for left, right in self.spans:
+            self.index.add('key', left, right)
+        self.index.add('other', 0, 9)
+
+    def count_before(self, position):
+        return len([span for span in self.spans if span[1] < position])
+
+    def count_after(self, position):
+        return len([span for span in self.spans if span[0] > position])
+
+    def test_counts(self):
+        for position in range(10):
+            self.assertEqual(self.index.count_before('key', position),
+                             self.count_before(position))
+            self.assertEqual(self.index.count_after('key', position),
+                             self.count_after(position))
+
+    def test_remove(self):
+        self.index.remove('key', 2, 4)
+        self.spans.remove((2, 4))
+        self.test_counts()
+
+    def test_unknown_key(self):
+        self.assertEqual(self.index.count_before('missing', 5), 0)
+        self.assertEqual(self.index.count_after('missing', 5), 0)
+
+class Span(object):
+    """A stand-in for a group, with a support key and a span."""
+
+    def __init__(self, key, left, right):
+        self.key = key
+        self.left_string_position = left
+        self.right_string_position = right
+
+    def support_key(self):
+        return self.key
+
+    def __eq__(self, other):
+        return self.key == other.key
+
+class GroupIndexTest(unittest.TestCase):
+    """GroupIndex keeps groups by key and versions each key."""
+
+    def test_add_and_remove(self):
+        index = GroupIndex(8)
+        first = Span('key', 0, 2)
+        second = Span('key', 4, 6)
+        index.add_group(first)
+        index.add_group(second)
+        self.assertEqual(index.get_groups('key'), [first, second])
+        self.assertEqual(index.count_before('key', 3), 1)
+        self.assertEqual(index.version('key'), 2)
+
+        index.remove_group(second)
+        self.assertEqual(len(index.get_groups('key')), 1)
+        self.assertIs(index.get_groups('key')[0], first)
+        self.assertEqual(index.count_after('key', 3), 0)
+        self.assertEqual(index.version('key'), 3)
+
+    def test_remove_missing_group(self):
+        index = GroupIndex(8)
+        index.add_group(Span('key', 0, 2))
+        index.remove_group(Span('key', 0, 2))
+        self.assertEqual(len(index.get_groups('key')), 1)
+        self.assertEqual(index.count_before('key', 3), 1)
+        self.assertEqual(index.version('key'), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+# Copyright (c) 2007-2017 Joseph Hager.
+#
+# Copycat is free software; you can redistribute it and/or modify
+# it under the terms of version 2 of the GNU General Public License,
+# as published by the Free Software Foundation.
+#
+# Copycat is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Copycat; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.
+
+
+"""Tests for compiled problems and their cache."""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from copycat.errors import UnsupportedProblem
+from copycat.problem import Problem
+from copycat.run import Run
+
+class ProblemCacheTest(unittest.TestCase):
+    """Problem.cached only loads problems saved under their own key."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def cached(self):
+        return Problem.cached('abc', 'abd', 'ijk', directory=self.directory)
+
+    def cache_file(self):
+        names = [name for name in os.listdir(self.directory)
+                 if name.endswith('.problem')]
+        self.assertEqual(len(names), 1)
+        return os.path.join(self.directory, names[0])
+
+    def test_cached_problem_is_loaded(self):
+        problem = self.cached()
+        loaded = self.cached()
+        self.assertIsNot(loaded, problem)
+        self.assertEqual(loaded.letters, problem.letters)
+
+    def test_tampered_problem_is_compiled_again(self):
+        problem = self.cached()
+        path = self.cache_file()
+        other = Problem('xyz', 'xya', 'mno').to_bytes()
+        with open(path, 'rb') as cache:
+            digest = cache.read()[:32]
+        with open(path, 'wb') as cache:
+            cache.write(digest + other)
+        self.assertEqual(self.cached().letters, problem.letters)
+
+    def test_cached_run_matches_plain_run(self):
+        cached = Run.from_problem(self.cached(), 3)
+        cached.run()
+        plain = Run('abc', 'abd', 'ijk', 3)
+        plain.run()
+        self.assertEqual(cached.workspace.answer_string.name,
+                         plain.workspace.answer_string.name)
+        self.assertEqual(cached.coderack.time, plain.coderack.time)
+
+    def test_unsupported_characters_are_rejected(self):
+        self.assertRaises(UnsupportedProblem, Run, 'abc', 'abd', 'ij1', 0)
+        self.assertRaises(UnsupportedProblem, Problem, 'abc', 'abd', 'ij1')
+
+if __name__ == '__main__':
+    unittest.main()
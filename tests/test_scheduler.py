@@ -0,0 +1,90 @@
+# Copyright (c) 2007-2017 Joseph Hager.
+#
+# Copycat is free software; you can redistribute it and/or modify
+# it under the terms of version 2 of the GNU General Public License,
+# as published by the Free Software Foundation.
+#
+# Copycat is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Copycat; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.
+
+
+"""Tests for the coderack schedulers."""
+
+import unittest
+
+from copycat.coderack import Codelet, Coderack
+from copycat.coderack.scheduler import BinScheduler, SCHEDULERS
+from copycat.coderack.scheduler import UrgencyScheduler
+from copycat.errors import BudgetExceeded
+from copycat.run import Run
+
+class SchedulerTest(unittest.TestCase):
+    """Every scheduler chooses codelets that are on the coderack."""
+
+    def run_with(self, name):
+        scheduler = SCHEDULERS[name]
+        chosen = []
+
+        def choose(self, coderack):
+            codelet = scheduler.choose(self, coderack)
+            chosen.append(any(codelet is c for c in coderack.codelets()))
+            return codelet
+
+        checked = type('Checked', (scheduler,), {'choose': choose})
+        run = Run('abc', 'abd', 'ijk', 0, scheduler=checked())
+        try:
+            run.run(steps=500)
+        except BudgetExceeded:
+            pass
+        self.assertTrue(chosen)
+        self.assertTrue(all(chosen))
+
+    def test_schedulers_share_the_bin_scheduler_base(self):
+        for scheduler in SCHEDULERS.values():
+            self.assertTrue(issubclass(scheduler, BinScheduler))
+
+    def test_bins(self):
+        self.run_with('bins')
+
+    def test_urgency(self):
+        self.run_with('urgency')
+
+    def test_heap(self):
+        self.run_with('heap')
+
+class UrgencySchedulerTest(unittest.TestCase):
+    """UrgencyScheduler weighs codelets on the scale of the bins."""
+
+    def test_urgency_matches_bin(self):
+        coderack = Coderack()
+        scheduler = UrgencyScheduler()
+        bins = len(coderack.bins)
+        for urgency in [0, 100, 150]:
+            codelet = Codelet()
+            codelet.urgency = urgency
+            for temperature in [0, 35, 70, 100]:
+                self.assertEqual(
+                    scheduler.urgency(codelet, temperature, bins),
+                    coderack.get_bin(urgency).urgency(temperature))
+
+    def test_urgency_is_within_bins(self):
+        coderack = Coderack()
+        scheduler = UrgencyScheduler()
+        bins = len(coderack.bins)
+        top = coderack.bins[-1].urgency(0)
+        for urgency in range(0, 101):
+            codelet = Codelet()
+            codelet.urgency = urgency
+            self.assertLessEqual(scheduler.urgency(codelet, 0, bins), top)
+            self.assertGreaterEqual(scheduler.urgency(codelet, 0, bins),
+                                    coderack.get_bin(urgency).urgency(0))
+
+if __name__ == '__main__':
+    unittest.main()
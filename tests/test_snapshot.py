@@ -0,0 +1,133 @@
+# Copyright (c) 2007-2017 Joseph Hager.
+#
+# Copycat is free software; you can redistribute it and/or modify
+# it under the terms of version 2 of the GNU General Public License,
+# as published by the Free Software Foundation.
+#
+# Copycat is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Copycat; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.
+
+
+"""Tests for run snapshots."""
+
+import unittest
+
+from copycat.run import Run
+from copycat.snapshot import Snapshotter, SnapshotReader, Writer
+from copycat.snapshot import DELTA, END, FORMAT_VERSION, MAGIC, TIME
+
+PROBLEMS = [('abc', 'abd', 'iijjkk'), ('abc', 'abd', 'mrrjjj'),
+            ('abc', 'abd', 'kji'), ('abc', 'abd', 'xyz')]
+SEEDS = range(4)
+STEPS = 3000
+INTERVAL = 50
+
+def span(obj):
+    """Return the letter positions spanned by a workspace object or an
+    object read from a snapshot."""
+    if isinstance(obj, dict):
+        return (obj['left_string_position'], obj['right_string_position'])
+    return (obj.left_string_position, obj.right_string_position)
+
+def workspace_structures(workspace):
+    """Return the bonds, groups and correspondences of the workspace."""
+    bonds = sorted((span(bond.from_object), span(bond.to_object),
+                    bond.bond_category.name) for bond in workspace.bonds())
+    groups = sorted((span(group), group.group_category.name)
+                    for group in workspace.groups())
+    correspondences = sorted((span(c.object1), span(c.object2))
+                             for c in workspace.correspondences())
+    return bonds, groups, correspondences
+
+def snapshot_structures(state):
+    """Return the bonds, groups and correspondences of a snapshot state."""
+    objects = state['objects']
+    bonds = sorted((span(objects[bond['from_object']]),
+                    span(objects[bond['to_object']]), bond['bond_category'])
+                   for bond in state['bonds'].values())
+    groups = sorted((span(objects[group]), objects[group]['group_category'])
+                    for group in state['groups'])
+    correspondences = sorted((span(objects[c['object1']]),
+                              span(objects[c['object2']]))
+                             for c in state['correspondences'].values())
+    return bonds, groups, correspondences
+
+def coderack_counts(coderack):
+    """Return the number of codelets of each type on the coderack."""
+    counts = {}
+    for codelet in coderack.codelets():
+        name = type(codelet).__name__
+        counts[name] = counts.get(name, 0) + 1
+    return counts
+
+class RoundTripTest(unittest.TestCase):
+    """Reading the snapshots of a run gives back the run's state."""
+
+    def test_round_trip(self):
+        for problem in PROBLEMS:
+            for seed in SEEDS:
+                run = Run(*problem, seed=seed)
+                snapshotter = Snapshotter(run)
+                reader = SnapshotReader()
+                while run.coderack.time < STEPS and \
+                        not run.workspace.answer_string:
+                    run.step()
+                    if run.coderack.time % INTERVAL:
+                        continue
+                    state = reader.read(snapshotter.snapshot())
+                    self.assertEqual(state['time'], run.coderack.time)
+                    self.assertEqual(snapshot_structures(state),
+                                     workspace_structures(run.workspace),
+                                     (problem, seed, run.coderack.time))
+                    self.assertEqual(
+                        state['activations'],
+                        dict((node.name, int(node.activation))
+                             for node in run.slipnet.slipnodes))
+                    self.assertEqual(state['coderack'],
+                                     coderack_counts(run.coderack))
+
+    def test_broken_groups_are_forgotten(self):
+        for problem in PROBLEMS:
+            for seed in SEEDS:
+                run = Run(*problem, seed=seed)
+                snapshotter = Snapshotter(run)
+                reader = SnapshotReader()
+                state = reader.read(snapshotter.snapshot())
+                while run.coderack.time < STEPS and \
+                        not run.workspace.answer_string:
+                    run.step()
+                    built = set(state['groups'])
+                    state = reader.read(snapshotter.snapshot())
+                    broken = built - set(state['groups'])
+                    self.assertFalse(broken & set(state['objects']))
+
+class DeltaTest(unittest.TestCase):
+    """Later snapshots only hold what changed."""
+
+    def test_unchanged_run_gives_empty_delta(self):
+        run = Run('abc', 'abd', 'ijk', 0)
+        snapshotter = Snapshotter(run)
+        reader = SnapshotReader()
+        for _ in range(100):
+            run.step()
+        reader.read(snapshotter.snapshot())
+        delta = snapshotter.snapshot()
+        reader.read(delta)
+        writer = Writer()
+        writer.data.extend(MAGIC)
+        writer.integer(FORMAT_VERSION)
+        writer.integer(DELTA)
+        writer.tag(TIME)
+        writer.integer(run.coderack.time)
+        writer.tag(END)
+        self.assertEqual(delta, bytes(writer.data))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+# Copyright (c) 2007-2017 Joseph Hager.
+#
+# Copycat is free software; you can redistribute it and/or modify
+# it under the terms of version 2 of the GNU General Public License,
+# as published by the Free Software Foundation.
+#
+# Copycat is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Copycat; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.
+
+
+"""Tests for the store of run results."""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from copycat.batch import ANSWERED, run_batch
+from copycat.store import Store, VALUES, config_key
+
+def values(**changes):
+    """Return stored values of an answered run, with the given changes."""
+    result = dict(status=ANSWERED, answer='ijl', temperature=20, steps=300,
+                  snags=0, error=None)
+    result.update(changes)
+    return result
+
+class StoreTest(unittest.TestCase):
+    """A Store returns a run only for its problem, seed, config and engine."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'results.db')
+        self.store = Store(self.path, 'engine')
+        self.config = config_key(steps=1000, snag_limit=None)
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.directory)
+
+    def test_put_and_get(self):
+        self.assertIsNone(self.store.get('abc', 'abd', 'ijk', 0, self.config))
+        self.store.put_many([('abc', 'abd', 'ijk', 0, self.config, values())])
+        self.assertEqual(self.store.get('abc', 'abd', 'ijk', 0, self.config),
+                         values())
+        self.assertEqual(sorted(values()), sorted(VALUES))
+
+    def test_put_replaces(self):
+        self.store.put_many([('abc', 'abd', 'ijk', 0, self.config, values())])
+        self.store.put_many([('abc', 'abd', 'ijk', 0, self.config,
+                              values(answer='ijd'))])
+        self.assertEqual(self.store.get('abc', 'abd', 'ijk', 0,
+                                        self.config)['answer'], 'ijd')
+
+    def test_keyed_by_seed_and_config(self):
+        self.store.put_many([('abc', 'abd', 'ijk', 0, self.config, values())])
+        self.assertIsNone(self.store.get('abc', 'abd', 'ijk', 1, self.config))
+        other = config_key(steps=2000, snag_limit=None)
+        self.assertIsNone(self.store.get('abc', 'abd', 'ijk', 0, other))
+
+    def test_keyed_by_engine(self):
+        self.store.put_many([('abc', 'abd', 'ijk', 0, self.config, values())])
+        self.store.close()
+        self.store = Store(self.path, 'other engine')
+        self.assertIsNone(self.store.get('abc', 'abd', 'ijk', 0, self.config))
+        self.store.close()
+        self.store = Store(self.path, 'engine')
+        self.assertEqual(self.store.get('abc', 'abd', 'ijk', 0, self.config),
+                         values())
+
+    def test_config_key_ignores_order(self):
+        self.assertEqual(config_key(steps=1, snag_limit=2),
+                         config_key(snag_limit=2, steps=1))
+
+    def test_batch_results_are_reused(self):
+        self.store.close()
+        self.store = Store(self.path)
+        first = run_batch([('abc', 'abd', 'ijk')], [0, 1], steps=2000,
+                          store=self.store)
+        again = run_batch([('abc', 'abd', 'ijk')], [0, 1], steps=2000,
+                          store=self.store)
+        for result, stored in zip(first, again):
+            for name in VALUES:
+                self.assertEqual(getattr(stored, name), getattr(result, name))
+
+if __name__ == '__main__':
+    unittest.main()